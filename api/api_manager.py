@@ -2,23 +2,40 @@ import requests
 from dataclasses import dataclass
 import json
 import os
+import threading
+from concurrent.futures import Future, wait
 from datetime import datetime, timedelta
 
+class LoadCancelled(Exception):
+    """El jugador cerró la ventana mientras se descargaban los datos iniciales"""
+
+
 class APIManager:
     """Clase para interactuar con la API de TigerDS con soporte offline."""
     
     BASE_URL = "https://tigerds-api.kindflower-ccaf48b6.eastus.azurecontainerapps.io"
     CACHE_DIR = "api_cache"
     CACHE_EXPIRY_HOURS = 24  # Los datos en caché expiran después de 24 horas
+
+    # Datos iniciales del juego: clave -> (endpoint, archivo de caché)
+    GAME_DATA_ENDPOINTS = {
+        "map_data": ("/city/map", "map_data.json"),
+        "jobs_data": ("/city/jobs", "jobs_data.json"),
+        "weather_data": ("/city/weather", "weather_data.json")
+    }
     
     def __init__(self):
         self.base_url = self.BASE_URL
         
         os.makedirs(self.CACHE_DIR, exist_ok=True)
     
-    def _make_api_call(self, endpoint, cache_filename):
-        """Realiza una llamada a la API con soporte mejorado para caché offline"""
-        if not self.is_online():
+    def _make_api_call(self, endpoint, cache_filename, check_online=True):
+        """Realiza una llamada a la API con soporte mejorado para caché offline.
+
+        Con check_online=False no se consulta is_online antes: si la API falla
+        se usa el caché (aunque esté expirado, ya que no hubo respuesta).
+        """
+        if check_online and not self.is_online():
             print(f"Modo offline - Cargando desde caché: {cache_filename}")
             cached_data = self._load_from_cache(cache_filename)
             
@@ -39,7 +56,7 @@ class APIManager:
             return data
             
         except (requests.RequestException, requests.Timeout) as e:
-            cached_data = self._load_from_cache(cache_filename)
+            cached_data = self._load_from_cache(cache_filename, allow_expired=not check_online)
             
             if cached_data:
                 return cached_data
@@ -57,7 +74,7 @@ class APIManager:
         with open(cache_path, 'w', encoding='utf-8') as f:
             json.dump(cache_data, f, indent=2, ensure_ascii=False)
     
-    def _load_from_cache(self, filename):
+    def _load_from_cache(self, filename, allow_expired=False):
         """Carga datos desde el caché local - VERSIÓN MEJORADA para modo offline"""
         cache_path = os.path.join(self.CACHE_DIR, filename)
         
@@ -72,7 +89,7 @@ class APIManager:
             is_expired = datetime.now() - cache_time > timedelta(hours=self.CACHE_EXPIRY_HOURS)
             
             if is_expired:
-                if self.is_online():
+                if not allow_expired and self.is_online():
                     print(f"Los datos en caché para {filename} han expirado y hay conexión - intentando actualizar")
                     return None  
                 else:
@@ -85,6 +102,70 @@ class APIManager:
             print(f"Error al cargar caché {filename}: {e}")
             return None
     
+    def get_cached_game_data(self):
+        """Carga mapa, pedidos y clima solo desde el caché local, sin red (simulaciones)"""
+        game_data = {}
+        for key, (_, filename) in self.GAME_DATA_ENDPOINTS.items():
+            cache_path = os.path.join(self.CACHE_DIR, filename)
+            if not os.path.exists(cache_path):
+                raise Exception(f"No hay datos en caché para {filename}")
+
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                game_data[key] = json.load(f)["data"]
+        return game_data
+
+    def start_game_data_fetch(self):
+        """Inicia en paralelo la descarga de mapa, pedidos y clima; retorna {clave: Future}.
+
+        Cada endpoint va directo a la API (sin el chequeo previo de is_online)
+        y si falla usa su propio caché, así que el tiempo total es el de la
+        llamada más lenta y no la suma.
+        """
+        return {key: self._run_in_thread(self._make_api_call, endpoint, filename, False)
+                for key, (endpoint, filename) in self.GAME_DATA_ENDPOINTS.items()}
+
+    @staticmethod
+    def _run_in_thread(function, *args):
+        """Ejecuta function en un hilo daemon: si se cancela la carga no retrasa el cierre"""
+        future = Future()
+
+        def worker():
+            try:
+                future.set_result(function(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=worker, daemon=True).start()
+        return future
+
+    def fetch_game_data(self, on_progress=None, poll_interval=0.05):
+        """Descarga en paralelo los datos iniciales y espera a que terminen.
+
+        on_progress(terminados, total) se llama en este hilo cada poll_interval
+        segundos mientras se espera (pantalla de carga); si retorna False la
+        carga se abandona con LoadCancelled. Lanza Exception si algún endpoint
+        no tiene ni API ni caché.
+        """
+        futures = self.start_game_data_fetch()
+        pending = set(futures.values())
+        while pending:
+            if on_progress and on_progress(len(futures) - len(pending), len(futures)) is False:
+                raise LoadCancelled("Carga de datos cancelada")
+            _, pending = wait(pending, timeout=poll_interval)
+        if on_progress:
+            on_progress(len(futures), len(futures))
+
+        game_data = {}
+        errors = []
+        for key, future in futures.items():
+            try:
+                game_data[key] = future.result()
+            except Exception as e:
+                errors.append(str(e))
+        if errors:
+            raise Exception("; ".join(errors))
+        return game_data
+
     def get_map_data(self):
         """Obtiene los datos del mapa desde la API o caché."""
         return self._make_api_call("/city/map", "map_data.json")
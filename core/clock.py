@@ -0,0 +1,55 @@
+import pygame
+
+
+class RealTimeClock:
+    """Reloj real basado en pygame.time.get_ticks() (modo normal con ventana)"""
+
+    def now(self):
+        """Segundos reales desde que se inició pygame"""
+        return pygame.time.get_ticks() / 1000.0
+
+
+class VirtualClock:
+    """Reloj virtual que solo avanza cuando se le pide, a paso fijo.
+
+    El tiempo no depende del reloj de la máquina, así que una simulación con la
+    misma semilla y la misma entrada se reproduce exactamente y puede correr
+    tan rápido como lo permita el procesador.
+    """
+
+    def __init__(self, step=0.1, start=0.0):
+        self.step = step
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, dt=None):
+        """Avanza el reloj un paso (o dt segundos) y retorna el tiempo avanzado"""
+        if dt is None:
+            dt = self.step
+        self.time += dt
+        return dt
+
+
+class ScaledClock:
+    """Reloj que corre a una escala de otro reloj (por defecto, el real).
+
+    Con scale=4.0 cada segundo real cuenta como cuatro: sirve para adelantar
+    una partida con ventana. Cambiar la escala no produce saltos en el tiempo.
+    """
+
+    def __init__(self, scale=1.0, base_clock=None):
+        self.base_clock = base_clock or RealTimeClock()
+        self.scale = scale
+        self.base_origin = self.base_clock.now()
+        self.origin = self.base_origin
+
+    def now(self):
+        return self.origin + (self.base_clock.now() - self.base_origin) * self.scale
+
+    def set_scale(self, scale):
+        """Cambia la escala a partir del instante actual"""
+        self.origin = self.now()
+        self.base_origin = self.base_clock.now()
+        self.scale = scale
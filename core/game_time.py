@@ -1,18 +1,24 @@
-import pygame
+from core.clock import RealTimeClock
+from entities.order import to_game_seconds
 from datetime import datetime, timedelta
 
 class GameTime:
     #Todos los métodos O(1)
-    def __init__(self, total_duration_min=15, game_start_time=None, time_scale=3.0):
+    def __init__(self, total_duration_min=15, game_start_time=None, time_scale=3.0, clock=None):
         self.real_duration = total_duration_min * 60  
         self.time_scale = time_scale
         
+        # Reloj del que sale el tiempo real (segundos); por defecto el de pygame
+        self.clock = clock or RealTimeClock()
+        
         if game_start_time is None:
             self.game_start_time = datetime.now()
         else:
             self.game_start_time = game_start_time
+        # Hora de inicio en segundos del día del juego (misma escala que Order.deadline_s)
+        self.game_start_seconds = to_game_seconds(self.game_start_time)
         
-        self.pygame_start_time = pygame.time.get_ticks() / 1000.0
+        self.pygame_start_time = self.clock.now()
         self.start_real_time = None
         
         self.paused = False
@@ -22,7 +28,7 @@ class GameTime:
     def start(self):
         """Inicia el temporizador del juego"""
         if self.start_real_time is None:
-            current_pygame_time = pygame.time.get_ticks() / 1000.0
+            current_pygame_time = self.clock.now()
             self.start_real_time = current_pygame_time - self.pygame_start_time
         
         self.paused = False
@@ -32,12 +38,12 @@ class GameTime:
     def pause(self):
         if not self.paused and self.start_real_time is not None:
             self.paused = True
-            self.pause_start = pygame.time.get_ticks() / 1000.0
+            self.pause_start = self.clock.now()
     
     def resume(self):
         if self.paused and self.pause_start is not None:
             self.paused = False
-            pause_end = pygame.time.get_ticks() / 1000.0
+            pause_end = self.clock.now()
             self.pause_duration += pause_end - self.pause_start
             self.pause_start = None
     
@@ -46,7 +52,7 @@ class GameTime:
         if self.start_real_time is None:
             return 0
         
-        current_pygame_time = pygame.time.get_ticks() / 1000.0
+        current_pygame_time = self.clock.now()
         current_relative_time = current_pygame_time - self.pygame_start_time
         
         if self.paused:
@@ -77,6 +83,10 @@ class GameTime:
         current_game_time = self.game_start_time + timedelta(seconds=elapsed_game_seconds)
         return current_game_time
     
+    def get_current_game_seconds(self):
+        """Hora ACTUAL del juego en segundos desde la medianoche del día del juego - O(1), sin datetime"""
+        return self.game_start_seconds + self.get_elapsed_game_time()
+    
     def get_elapsed_game_time(self):
         """Retorna tiempo de juego transcurrido en segundos (escala de juego)"""
         elapsed_real = self.get_elapsed_real_time()
@@ -0,0 +1,113 @@
+import time
+import numpy as np
+import pygame
+
+
+# Acciones que entiende GameEngine.apply_action
+MOVE_ACTIONS = {
+    "left": (-1, 0),
+    "right": (1, 0),
+    "up": (0, -1),
+    "down": (0, 1)
+}
+ACTIONS = set(MOVE_ACTIONS) | {"interact", "accept", "reject", "sort_priority", "sort_deadline",
+                               "suggest_route"}
+
+
+class KeyboardInput:
+    """Entrada del jugador desde el teclado (modo normal con ventana)"""
+
+    def get_movement(self, game_engine):
+        """Dirección de movimiento según las teclas presionadas"""
+        keys = pygame.key.get_pressed()
+
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            return -1, 0
+        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            return 1, 0
+        elif keys[pygame.K_UP] or keys[pygame.K_w]:
+            return 0, -1
+        elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            return 0, 1
+        return 0, 0
+
+    def get_actions(self, game_engine):
+        """Las acciones de teclado llegan como eventos de pygame"""
+        return []
+
+
+class ScriptedInput:
+    """Entrada programada para simulaciones sin ventana.
+
+    Acepta una lista de (segundo_de_juego, acción) que se ejecutan al llegar su
+    tiempo, y/o una política policy(game_engine) -> lista de acciones que se
+    consulta en cada paso. Los movimientos quedan en espera hasta que el
+    jugador pueda moverse.
+
+    Todo lo que se entrega queda en log como (segundo_de_juego, acción); usar
+    ese log como script (con la misma semilla) repite la partida exactamente.
+    Cada consulta a la política (una decisión) guarda su latencia en
+    decision_times (segundos), resumida por get_latency_stats.
+    """
+
+    def __init__(self, script=None, policy=None):
+        self.script = sorted(script or [], key=lambda entry: entry[0])
+        self.policy = policy
+        self.next_index = 0
+        self.pending_move = None
+        self.pending_move_action = None
+        self.poll_time = 0
+        self.log = []
+        self.decision_times = []
+
+    def get_actions(self, game_engine):
+        """Retorna las acciones de este paso (sin los movimientos, que se guardan aparte)"""
+        actions = []
+        elapsed = game_engine.game_time.get_elapsed_real_time()
+        self.poll_time = elapsed
+        while self.next_index < len(self.script) and self.script[self.next_index][0] <= elapsed:
+            actions.append(self.script[self.next_index][1])
+            self.next_index += 1
+
+        if self.policy:
+            start = time.perf_counter()
+            policy_actions = self.policy(game_engine) or []
+            self.decision_times.append(time.perf_counter() - start)
+            actions.extend(policy_actions)
+
+        other_actions = []
+        for action in actions:
+            if action in MOVE_ACTIONS:
+                self.pending_move = MOVE_ACTIONS[action]
+                self.pending_move_action = action
+            else:
+                other_actions.append(action)
+                self.log.append((elapsed, action))
+        return other_actions
+
+    def get_latency_stats(self):
+        """Cantidad de decisiones y latencia media, p50, p95 y máxima en microsegundos"""
+        if not self.decision_times:
+            return {"decisions": 0, "decision_mean_us": 0.0, "decision_p50_us": 0.0,
+                    "decision_p95_us": 0.0, "decision_max_us": 0.0}
+        times_us = np.array(self.decision_times) * 1e6
+        p50, p95 = np.percentile(times_us, [50, 95])
+        return {
+            "decisions": len(times_us),
+            "decision_mean_us": float(times_us.mean()),
+            "decision_p50_us": float(p50),
+            "decision_p95_us": float(p95),
+            "decision_max_us": float(times_us.max())
+        }
+
+    def get_movement(self, game_engine):
+        """Entrega (una sola vez) el último movimiento pedido"""
+        if self.pending_move is None:
+            return 0, 0
+
+        # Se registra con el tiempo del paso en que se pidió, que es cuando se vuelve a entregar
+        self.log.append((self.poll_time, self.pending_move_action))
+        movement = self.pending_move
+        self.pending_move = None
+        self.pending_move_action = None
+        return movement
@@ -0,0 +1,111 @@
+import heapq
+import itertools
+from collections import deque
+
+
+class ExpirationScheduler:
+    """Montículo (min-heap) de pedidos ordenado por deadline.
+
+    Cada pedido se programa una vez con su deadline en segundos del juego
+    (Order.deadline_s); en cada frame solo se sacan los que ya vencieron - O(k log n) en
+    lugar de revisar todos los pedidos. Los pedidos recogidos, entregados o
+    cancelados no se sacan del montículo: quien consume pop_expired decide si
+    el pedido sigue vigente (borrado perezoso).
+    """
+
+    def __init__(self):
+        self._heap = []  # (deadline en segundos del juego, secuencia, pedido)
+        self._scheduled = {}  # ID -> secuencia de su entrada vigente
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._scheduled)
+
+    def __contains__(self, order_id):
+        return order_id in self._scheduled
+
+    def schedule(self, order):
+        """Programa la expiración de un pedido (una sola vez por ID) - O(log n)"""
+        if order.id in self._scheduled:
+            return
+        sequence = next(self._counter)
+        heapq.heappush(self._heap, (order.deadline_s, sequence, order))
+        self._scheduled[order.id] = sequence
+
+    def discard(self, order_id):
+        """Olvida un pedido; su entrada en el montículo se ignora al salir - O(1)"""
+        self._scheduled.pop(order_id, None)
+
+    def next_deadline(self):
+        """Deadline más cercano todavía programado (None si no hay)"""
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, current_seconds):
+        """Saca y retorna los pedidos cuyo deadline ya pasó - O(k log n)"""
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= current_seconds:
+            entry = heapq.heappop(heap)
+            if self._is_current(entry):
+                order = entry[2]
+                del self._scheduled[order.id]
+                expired.append(order)
+        return expired
+
+    def _is_current(self, entry):
+        _, sequence, order = entry
+        return self._scheduled.get(order.id) == sequence
+
+    def clear(self):
+        self._heap.clear()
+        self._scheduled.clear()
+
+
+class ReleaseScheduler:
+    """Montículo de pedidos pendientes ordenado por release_time.
+
+    Los pedidos cuyo release_time ya llegó pasan a una cola FIFO de espera,
+    de donde se toman uno por uno cuando no hay otro popup abierto. Un frame
+    sin liberaciones solo compara con la cima del montículo - O(1) y sin
+    crear objetos.
+    """
+
+    def __init__(self):
+        self._heap = []  # (release_time, secuencia, pedido)
+        self._counter = itertools.count()
+        self.waiting = deque()  # Pedidos liberados esperando su popup
+
+    def __len__(self):
+        return len(self._heap) + len(self.waiting)
+
+    def schedule(self, order):
+        """Programa la liberación de un pedido - O(log n)"""
+        heapq.heappush(self._heap, (order.release_time, next(self._counter), order))
+
+    def next_release_in(self, elapsed_game_time):
+        """Segundos de juego hasta la próxima liberación (0 si hay pedidos esperando, None si no queda ninguno)"""
+        if self.waiting:
+            return 0
+        if not self._heap:
+            return None
+        return max(0, self._heap[0][0] - elapsed_game_time)
+
+    def release_due(self, elapsed_game_time):
+        """Pasa a la cola de espera los pedidos ya liberados y los retorna - O(k log n)"""
+        released = []
+        heap = self._heap
+        while heap and heap[0][0] <= elapsed_game_time:
+            order = heapq.heappop(heap)[2]
+            self.waiting.append(order)
+            released.append(order)
+        return released
+
+    def pop_waiting(self):
+        """Saca el siguiente pedido liberado (FIFO)"""
+        return self.waiting.popleft()
+
+    def clear(self):
+        self._heap.clear()
+        self.waiting.clear()
@@ -0,0 +1,299 @@
+import heapq
+import itertools
+from collections import OrderedDict
+from core.speed_movement import Speed_Movement
+
+
+# Movimientos en 4 direcciones (los mismos que puede hacer el jugador)
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+class PathFinder:
+    """Servicio de rutas y tiempos de viaje sobre la cuadrícula del mapa.
+
+    Entrar a una casilla cuesta los segundos que da
+    Speed_Movement.calcular_tiempo_recorrido para su superficie (sin clima ni
+    estado del jugador); las casillas bloqueadas del mapa no se pueden
+    pisar. Los costos salen de las cuadrículas precompiladas del Map
+    (surface_ids / blocked), un cálculo por tipo de superficie.
+
+    - find_path: A* ponderado. Sobre las casillas de costo base (calles)
+      salta en línea recta con Jump Point Search de 4 direcciones; las
+      casillas de otro costo (parques) se expanden una por una.
+    - distance_field: Dijkstra inverso desde un objetivo hacia todo el mapa.
+      Los campos se guardan en un caché LRU, así que travel_time y next_step
+      son una búsqueda O(1) en diccionario después del primer uso.
+
+    Si el mapa cambia (Map.tiles_version) los costos se recalculan y el
+    caché se vacía.
+    """
+
+    def __init__(self, game_map, speed_system=None, cache_size=64):
+        self.game_map = game_map
+        if speed_system is None:
+            speed_system = Speed_Movement()
+            speed_system.cambiar_estado_resistencia("normal")
+        self.speed_system = speed_system
+        self.cache_size = cache_size
+        self._fields = OrderedDict()  # (objetivo, radio) -> {casilla: segundos}
+        self._tiles_version = None
+        self._refresh()
+
+    def _refresh(self):
+        """Calcula el costo de cada casilla y las marcas usadas por los saltos - O(filas * columnas)"""
+        game_map = self.game_map
+        self.rows = game_map.rows
+        self.cols = game_map.cols
+
+        # Un costo por tipo de superficie, aplicado sobre la cuadrícula de ids del mapa
+        cost_by_id = []
+        for name, blocked in zip(game_map.surface_names, game_map.surface_blocked):
+            cost = None
+            if not blocked:
+                cost = self.speed_system.calcular_tiempo_recorrido(1, name)
+            cost_by_id.append(cost if cost != float('inf') else None)
+        street_cost = self.speed_system.calcular_tiempo_recorrido(1, "calle")
+
+        ids = game_map.surface_ids
+        self.costs = [[cost_by_id[surface_id] for surface_id in ids[y * self.cols:(y + 1) * self.cols]]
+                      for y in range(self.rows)]
+        walkable_costs = [cost for row in self.costs for cost in row if cost is not None]
+        self.base_cost = street_cost
+        self.min_cost = min(walkable_costs, default=street_cost)
+
+        # Casillas "planas" (costo base) por donde se puede saltar, y las que tienen
+        # un vecino transitable de otro costo (ahí el salto tiene que detenerse)
+        self.plain = [[cost == street_cost for cost in row] for row in self.costs]
+        self.near_irregular = [[False] * self.cols for _ in range(self.rows)]
+        for y in range(self.rows):
+            for x in range(self.cols):
+                cost = self.costs[y][x]
+                if cost is None or cost == street_cost:
+                    continue
+                for dx, dy in DIRECTIONS:
+                    if self.is_plain(x + dx, y + dy):
+                        self.near_irregular[y + dy][x + dx] = True
+
+        self._fields.clear()
+        self._tiles_version = self.game_map.tiles_version
+
+    def check_map(self):
+        """Recalcula los costos si el mapa cambió desde la última consulta"""
+        if self.game_map.tiles_version != self._tiles_version:
+            self._refresh()
+
+    def cost(self, x, y):
+        """Segundos para entrar a la casilla (None si está bloqueada o fuera del mapa)"""
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return self.costs[y][x]
+        return None
+
+    def is_plain(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.plain[y][x]
+
+    def goal_cells(self, target, radius=0):
+        """Casillas transitables a distancia de Chebyshev <= radius del objetivo.
+
+        Si el objetivo es un edificio y radius es 0 se usan sus casillas
+        vecinas (se entrega "desde afuera").
+        """
+        tx, ty = target
+        cells = [(x, y)
+                 for y in range(ty - radius, ty + radius + 1)
+                 for x in range(tx - radius, tx + radius + 1)
+                 if self.cost(x, y) is not None]
+        if not cells and radius == 0:
+            return self.goal_cells(target, 1)
+        return cells
+
+    # Campos de distancia (Dijkstra)
+
+    def distance_field(self, target, radius=0):
+        """Segundos desde cada casilla hasta el objetivo; se reutiliza del caché LRU"""
+        self.check_map()
+        key = ((target[0], target[1]), radius)
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            return field
+
+        field = self._dijkstra(self.goal_cells(target, radius))
+        self._fields[key] = field
+        if len(self._fields) > self.cache_size:
+            self._fields.popitem(last=False)
+        return field
+
+    def _dijkstra(self, sources): # O(V log V)
+        """Dijkstra inverso: ir de un vecino a (x, y) cuesta entrar a (x, y)"""
+        field = {}
+        heap = [(0.0, cell) for cell in sources]
+        heapq.heapify(heap)
+        while heap:
+            distance, (x, y) = heapq.heappop(heap)
+            if (x, y) in field:
+                continue
+            field[(x, y)] = distance
+            next_distance = distance + self.costs[y][x]
+            for dx, dy in DIRECTIONS:
+                neighbor = (x + dx, y + dy)
+                if neighbor not in field and self.cost(*neighbor) is not None:
+                    heapq.heappush(heap, (next_distance, neighbor))
+        return field
+
+    def travel_time(self, start, target, radius=0, speed_system=None):
+        """Segundos de viaje por la mejor ruta (inf si no hay camino) - O(1) con el campo en caché.
+
+        Con speed_system se escala por sus multiplicadores actuales (peso,
+        reputación, resistencia), que afectan por igual a todas las superficies.
+        """
+        seconds = self.distance_field(target, radius).get((start[0], start[1]))
+        if seconds is None:
+            return float('inf')
+        if speed_system is not None:
+            speed = speed_system.calcular_velocidad_final("calle")
+            if speed <= 0:
+                return float('inf')
+            seconds *= self.speed_system.calcular_velocidad_final("calle") / speed
+        return seconds
+
+    def next_step(self, start, target, radius=0):
+        """Dirección (dx, dy) del siguiente paso de la mejor ruta (None si ya llegó o no hay camino)"""
+        field = self.distance_field(target, radius)
+        x, y = start
+        best = None
+        current = field.get((x, y))
+        if current == 0:
+            return None
+        for dx, dy in DIRECTIONS:
+            distance = field.get((x + dx, y + dy))
+            if distance is None:
+                continue
+            # Lo que queda desde el vecino más lo que cuesta entrar a él
+            total = distance + self.costs[y + dy][x + dx]
+            if best is None or total < best[0]:
+                best = (total, (dx, dy))
+        return best[1] if best else None
+
+    # A* con Jump Point Search
+
+    def find_path(self, start, target, radius=0, jump=True):
+        """Ruta más rápida como lista de casillas desde start hasta una casilla objetivo (None si no hay)"""
+        self.check_map()
+        start = (start[0], start[1])
+        if self.cost(*start) is None:
+            return None
+        goal_list = self.goal_cells(target, radius)
+        if not goal_list:
+            return None
+        goals = set(goal_list)
+        if start in goals:
+            return [start]
+
+        # Heurística: distancia Manhattan al rectángulo de objetivos por el costo mínimo
+        min_x = min(x for x, _ in goal_list)
+        max_x = max(x for x, _ in goal_list)
+        min_y = min(y for _, y in goal_list)
+        max_y = max(y for _, y in goal_list)
+
+        def heuristic(x, y):
+            return self.min_cost * (max(0, min_x - x, x - max_x) + max(0, min_y - y, y - max_y))
+
+        counter = itertools.count()
+        best_cost = {start: 0.0}
+        came_from = {start: None}
+        heap = [(heuristic(*start), next(counter), 0.0, start, None)]
+        while heap:
+            _, _, cost, cell, direction = heapq.heappop(heap)
+            if cost > best_cost[cell]:
+                continue
+            if cell in goals:
+                return self._build_path(came_from, cell)
+            for neighbor, step_cost, neighbor_direction in self._successors(cell, direction, goals, jump):
+                new_cost = cost + step_cost
+                if new_cost < best_cost.get(neighbor, float('inf')):
+                    best_cost[neighbor] = new_cost
+                    came_from[neighbor] = cell
+                    heapq.heappush(heap, (new_cost + heuristic(*neighbor), next(counter), new_cost,
+                                          neighbor, neighbor_direction))
+        return None
+
+    def path_cost(self, path):
+        """Segundos para recorrer una ruta de casillas contiguas"""
+        return sum(self.costs[y][x] for x, y in path[1:])
+
+    def _successors(self, cell, direction, goals, jump):
+        """Vecinos a explorar desde cell: (casilla, costo, dirección de llegada)"""
+        x, y = cell
+        plain = jump and self.plain[y][x]
+        if plain and direction is not None:
+            directions = self._pruned_directions(x, y, direction)
+        else:
+            directions = DIRECTIONS
+
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            cost = self.cost(nx, ny)
+            if cost is None:
+                continue
+            if plain and self.plain[ny][nx]:
+                if (dx, dy) not in directions:
+                    continue
+                point = self._jump(nx, ny, dx, dy, goals)
+                if point is not None:
+                    yield point[0], point[1] * self.base_cost, (dx, dy)
+            else:
+                # Paso simple (sin saltos, o entrando/saliendo de una casilla de otro costo):
+                # la casilla siguiente se expande en las 4 direcciones
+                yield (nx, ny), cost, None
+
+    def _pruned_directions(self, x, y, direction):
+        """Direcciones naturales y forzadas según la dirección de llegada (orden canónico: vertical antes que horizontal)"""
+        dx, dy = direction
+        if dx == 0:
+            return ((0, dy), (1, 0), (-1, 0))
+        directions = [(dx, 0)]
+        for sy in (1, -1):
+            if self.is_plain(x, y + sy) and not self.is_plain(x - dx, y + sy):
+                directions.append((0, sy))
+        return directions
+
+    def _is_stop(self, x, y, goals):
+        return (x, y) in goals or self.near_irregular[y][x]
+
+    def _jump(self, x, y, dx, dy, goals):
+        """Avanza en línea recta desde (x, y) hasta el próximo punto de salto: (casilla, pasos) o None"""
+        steps = 1
+        while self.is_plain(x, y):
+            if self._is_stop(x, y, goals):
+                return (x, y), steps
+            if dy == 0:
+                for sy in (1, -1):
+                    if self.is_plain(x, y + sy) and not self.is_plain(x - dx, y + sy):
+                        return (x, y), steps
+            elif (self._jump(x + 1, y, 1, 0, goals) is not None or
+                  self._jump(x - 1, y, -1, 0, goals) is not None):
+                # En movimiento vertical se busca a los lados en cada casilla
+                return (x, y), steps
+            x += dx
+            y += dy
+            steps += 1
+        return None
+
+    def _build_path(self, came_from, cell):
+        """Reconstruye la ruta completa rellenando los tramos rectos entre puntos de salto"""
+        points = []
+        while cell is not None:
+            points.append(cell)
+            cell = came_from[cell]
+        points.reverse()
+
+        path = [points[0]]
+        for x, y in points[1:]:
+            px, py = path[-1]
+            step_x = (x > px) - (x < px)
+            step_y = (y > py) - (y < py)
+            while (px, py) != (x, y):
+                px += step_x
+                py += step_y
+                path.append((px, py))
+        return path
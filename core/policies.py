@@ -0,0 +1,182 @@
+import random
+from core.input_controller import MOVE_ACTIONS
+
+
+# Acción de movimiento para cada paso (dx, dy)
+STEP_ACTIONS = {step: action for action, step in MOVE_ACTIONS.items()}
+
+
+class IdlePolicy:
+    """No hace nada: sirve como línea base (todos los pedidos expiran)"""
+
+    def __call__(self, game_engine):
+        return []
+
+
+class RandomPolicy:
+    """Repartidor al azar: camina sin rumbo e interactúa de vez en cuando"""
+
+    def __init__(self, rng=None, accept_probability=0.7, interact_probability=0.2):
+        self.rng = rng or random.Random()
+        self.accept_probability = accept_probability
+        self.interact_probability = interact_probability
+        self.moves = sorted(MOVE_ACTIONS)
+
+    def __call__(self, game_engine):
+        actions = []
+        if game_engine.popup_manager.popup_active:
+            actions.append("accept" if self.rng.random() < self.accept_probability else "reject")
+        if self.rng.random() < self.interact_probability:
+            actions.append("interact")
+        actions.append(self.rng.choice(self.moves))
+        return actions
+
+
+class CourierPolicy:
+    """Base de los repartidores autónomos: decide el popup y sigue rutas reales.
+
+    Con inventario va a entregar; si no, va a recoger. Cada subclase elige
+    qué pedido atender (choose_delivery / choose_pickup; por defecto el más
+    antiguo del inventario y la recogida más cercana) y si acepta un
+    pedido nuevo (should_accept). El movimiento baja por el campo de
+    distancias del PathFinder del motor (edificios y parques incluidos) y
+    los tiempos de viaje salen de su TravelMatrix.
+    """
+
+    def __call__(self, game_engine):
+        actions = []
+        popup = game_engine.popup_manager
+        if popup.popup_active and popup.pending_order is not None:
+            actions.append("accept" if self.should_accept(game_engine, popup.pending_order) else "reject")
+
+        player = game_engine.player
+        target = self.choose_target(game_engine)
+        if target is None:
+            return actions
+
+        radius = game_engine.interaction_manager.interaction_radius
+        if player.is_near_location(target, include_exact=True, radius=radius):
+            actions.append("interact")
+            return actions
+
+        step = game_engine.pathfinder.next_step((player.grid_x, player.grid_y), target, radius)
+        if step:
+            actions.append(STEP_ACTIONS[step])
+        return actions
+
+    def should_accept(self, game_engine, order):
+        return True
+
+    def choose_target(self, game_engine):
+        player = game_engine.player
+        if len(player.inventory):
+            order = self.choose_delivery(game_engine, list(player.inventory))
+            return tuple(order.dropoff)
+
+        candidates = [order for order in game_engine.active_orders
+                      if not (order.is_expired or order.is_completed or order.is_in_inventory)
+                      and player.can_pickup_order(order)]
+        if not candidates:
+            return None
+        return tuple(self.choose_pickup(game_engine, candidates).pickup)
+
+    def choose_delivery(self, game_engine, inventory):
+        """Por defecto entrega primero el pedido más antiguo del inventario"""
+        return inventory[0]
+
+    def choose_pickup(self, game_engine, candidates):
+        """Por defecto recoge el pedido con la ruta más corta"""
+        return min(candidates, key=lambda order: self.time_to(game_engine, order.pickup))
+
+    # Tiempos de ruta (segundos de viaje, TravelMatrix)
+
+    def time_to(self, game_engine, point):
+        player = game_engine.player
+        game_engine.travel_matrix.add_points((point,))
+        return game_engine.travel_matrix.time_from((player.grid_x, player.grid_y), point)
+
+    def delivery_time(self, game_engine, order):
+        """Segundos desde el jugador hasta la recogida más los de la recogida a la entrega"""
+        game_engine.travel_matrix.add_order(order)
+        return (self.time_to(game_engine, order.pickup) +
+                game_engine.travel_matrix.time_between(order.pickup, order.dropoff))
+
+
+class GreedyPolicy(CourierPolicy):
+    """Repartidor codicioso: acepta todo y recoge el pedido con la ruta más corta"""
+
+
+class DeadlinePolicy(CourierPolicy):
+    """Earliest-deadline-first: acepta todo y atiende siempre el deadline más cercano"""
+
+    def choose_delivery(self, game_engine, inventory):
+        return min(inventory, key=lambda order: order.deadline_s)
+
+    def choose_pickup(self, game_engine, candidates):
+        return min(candidates, key=lambda order: order.deadline_s)
+
+
+class PayoutRatePolicy(CourierPolicy):
+    """Pago por segundo: elige el pedido con más payout por segundo de ruta
+    (ir a recoger + llevarlo) y rechaza los que no alcanza a entregar a tiempo"""
+
+    def should_accept(self, game_engine, order):
+        game_time = game_engine.game_time
+        # Los segundos de viaje son reales; el reloj del juego avanza time_scale veces más rápido
+        arrival = game_time.get_current_game_seconds() + self.delivery_time(game_engine, order) * game_time.time_scale
+        return arrival <= order.deadline_s
+
+    def choose_delivery(self, game_engine, inventory):
+        return max(inventory, key=lambda order: self.rate(order.payout, self.time_to(game_engine, order.dropoff)))
+
+    def choose_pickup(self, game_engine, candidates):
+        return max(candidates, key=lambda order: self.rate(order.payout, self.delivery_time(game_engine, order)))
+
+    @staticmethod
+    def rate(payout, seconds):
+        return payout / max(seconds, 0.1)
+
+
+class RoutePolicy(CourierPolicy):
+    """Sigue la ruta del RoutePlanner (varias recogidas antes de entregar).
+
+    La ruta se recalcula solo cuando cambian el inventario o los pedidos
+    activos (generaciones de OrderList); acepta un pedido nuevo si el
+    planificador logra meterlo en la ruta sin atrasar las entregas.
+    """
+
+    def __init__(self):
+        self.plan = None
+        self.plan_key = None
+
+    def should_accept(self, game_engine, order):
+        return order in game_engine.plan_route(extra_orders=[order]).new_orders
+
+    def choose_target(self, game_engine):
+        key = (game_engine.player.inventory.generation, game_engine.active_orders.generation)
+        if self.plan is None or key != self.plan_key:
+            self.plan = game_engine.plan_route()
+            self.plan_key = key
+        if self.plan.stops:
+            return self.plan.stops[0].point
+        # Ningún pedido cabe a tiempo en la ruta: se recoge el más cercano igual
+        return super().choose_target(game_engine)
+
+
+POLICIES = {
+    "idle": IdlePolicy,
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy,
+    "edf": DeadlinePolicy,
+    "payout_rate": PayoutRatePolicy,
+    "route": RoutePolicy
+}
+
+
+def create_policy(name, rng=None):
+    """Crea una política por nombre ('idle', 'random', 'greedy', 'edf', 'payout_rate' o 'route')"""
+    if name not in POLICIES:
+        raise ValueError(f"Política desconocida: {name}")
+    if name == "random":
+        return RandomPolicy(rng=rng)
+    return POLICIES[name]()
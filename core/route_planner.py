@@ -0,0 +1,240 @@
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+
+PICKUP = "pickup"
+DROPOFF = "dropoff"
+
+# Cada segundo de atraso en una entrega pesa como esta cantidad de segundos de ruta
+LATE_PENALTY = 10.0
+
+
+@dataclass(frozen=True)
+class Stop:
+    """Parada de una ruta: recoger o entregar un pedido"""
+    kind: str
+    order: object
+
+    @property
+    def point(self):
+        location = self.order.pickup if self.kind == PICKUP else self.order.dropoff
+        return (location[0], location[1])
+
+
+@dataclass
+class RoutePlan:
+    """Resultado del planificador (tiempos en segundos del juego)"""
+    stops: List[Stop] = field(default_factory=list)
+    total_time: float = 0.0
+    lateness: float = 0.0
+    new_orders: list = field(default_factory=list)  # Candidatos que entraron en la ruta
+    planning_time: float = 0.0  # Segundos reales usados al planificar
+
+    def describe(self, limit=4):
+        """Texto corto con las próximas paradas"""
+        names = [f"{'Recoger' if stop.kind == PICKUP else 'Entregar'} {stop.order.id}"
+                 for stop in self.stops[:limit]]
+        if len(self.stops) > limit:
+            names.append("...")
+        return " → ".join(names)
+
+
+class RoutePlanner:
+    """Planificador de rutas con varias paradas (pickup and delivery con capacidad y deadlines).
+
+    Los pedidos del inventario solo necesitan su entrega; los candidatos
+    (pedidos aceptados sin recoger) necesitan recogida antes de la entrega.
+    1. Inserción: se insertan las entregas pendientes y luego cada candidato
+       (mayor payout primero) en las posiciones más baratas que respeten la
+       capacidad y no agreguen atraso.
+    2. Mejora local con 2-opt (invertir tramos) y Or-opt (mover tramos de 1
+       a 3 paradas) mientras reduzcan el costo.
+    Todo queda limitado por un presupuesto por llamada; al agotarse se
+    retorna la mejor ruta encontrada hasta ese momento. Con max_iterations
+    el límite es la cantidad de rutas evaluadas (determinista: la misma
+    entrada da la misma ruta en cualquier máquina); si no, son segundos
+    reales (budget).
+    Los tiempos de viaje salen de la TravelMatrix (segundos reales de
+    recorrido), convertidos a segundos del juego con time_scale.
+    """
+
+    def __init__(self, travel_matrix, time_scale=1.0, budget=0.005, max_iterations=None):
+        self.travel_matrix = travel_matrix
+        self.time_scale = time_scale
+        self.budget = budget
+        self.max_iterations = max_iterations
+
+    def plan(self, start, now_seconds, inventory, candidates=(), load=0, capacity=5, budget=None,
+             max_iterations=None):
+        """Ruta desde start para entregar el inventario y los candidatos que quepan.
+
+        now_seconds: hora actual en segundos del juego; load/capacity: peso
+        cargado y máximo; max_iterations: rutas a evaluar como máximo (por
+        defecto self.max_iterations); budget: segundos reales de búsqueda,
+        solo si no hay max_iterations (por defecto self.budget).
+        """
+        started = time.perf_counter()
+        inventory = list(inventory)
+        inventory_ids = {order.id for order in inventory}
+        candidates = [order for order in candidates if order.id not in inventory_ids]
+        # Normalmente ya están en la matriz; si no, sus filas se calculan fuera del presupuesto
+        self.travel_matrix.add_orders(inventory + candidates)
+        if max_iterations is None:
+            max_iterations = self.max_iterations
+        if max_iterations is not None:
+            limit = _SearchLimit(max_evaluations=max_iterations)
+        else:
+            limit = _SearchLimit(time_limit=time.perf_counter() + (self.budget if budget is None else budget))
+
+        context = _RouteContext(self, (start[0], start[1]), now_seconds, load, capacity, limit)
+
+        # Entregas del inventario (ya comprometidas, aunque vayan tarde)
+        route = []
+        for order in sorted(inventory, key=lambda order: order.deadline_s):
+            route = context.best_insertion(route, [Stop(DROPOFF, order)])[1] or route + [Stop(DROPOFF, order)]
+
+        # Candidatos: solo entran si caben y no agregan atraso
+        new_orders = []
+        for order in sorted(candidates, key=lambda order: -order.payout):
+            if limit.exhausted():
+                break
+            current_lateness = context.evaluate(route)[1]
+            inserted = context.best_insertion(route, [Stop(PICKUP, order), Stop(DROPOFF, order)])[1]
+            if inserted is not None and context.evaluate(inserted)[1] <= current_lateness + 1e-9:
+                route = inserted
+                new_orders.append(order)
+
+        route = context.improve(route)
+        total_time, lateness = context.evaluate(route)
+        return RoutePlan(stops=route, total_time=total_time, lateness=lateness,
+                         new_orders=new_orders, planning_time=time.perf_counter() - started)
+
+
+class _SearchLimit:
+    """Presupuesto de una llamada a plan: rutas evaluadas (determinista) o un instante de tiempo real"""
+
+    def __init__(self, max_evaluations=None, time_limit=None):
+        self.max_evaluations = max_evaluations
+        self.time_limit = time_limit
+        self.evaluations = 0
+
+    def exhausted(self):
+        if self.max_evaluations is not None:
+            return self.evaluations >= self.max_evaluations
+        return time.perf_counter() > self.time_limit
+
+
+class _RouteContext:
+    """Estado de una llamada a plan: posición inicial, carga, límite y caché de tiempos"""
+
+    def __init__(self, planner, start, now_seconds, load, capacity, limit):
+        self.matrix = planner.travel_matrix
+        self.time_scale = planner.time_scale
+        self.start = start
+        self.now_seconds = now_seconds
+        self.load = load
+        self.capacity = capacity
+        self.limit = limit
+        self._times = {}
+
+    def travel(self, origin, destination):
+        """Segundos reales de viaje; origin None es la posición inicial"""
+        key = (origin, destination)
+        seconds = self._times.get(key)
+        if seconds is None:
+            if origin is None:
+                seconds = self.matrix.time_from(self.start, destination)
+            else:
+                seconds = self.matrix.time_between(origin, destination)
+            self._times[key] = seconds
+        return seconds
+
+    def evaluate(self, route): # O(n)
+        """(tiempo total, atraso total) de la ruta, o None si viola capacidad u orden de paradas"""
+        elapsed = 0.0
+        lateness = 0.0
+        load = self.load
+        position = None
+        picked = set()
+        needs_pickup = {stop.order.id for stop in route if stop.kind == PICKUP}
+        for stop in route:
+            point = stop.point
+            elapsed += self.travel(position, point)
+            order = stop.order
+            if stop.kind == PICKUP:
+                load += order.weight
+                if load > self.capacity:
+                    return None
+                picked.add(order.id)
+            else:
+                if order.id in needs_pickup and order.id not in picked:
+                    return None
+                load -= order.weight
+                arrival = self.now_seconds + elapsed * self.time_scale
+                lateness += max(0.0, arrival - order.deadline_s)
+            position = point
+        return elapsed * self.time_scale, lateness
+
+    def cost(self, route):
+        self.limit.evaluations += 1
+        result = self.evaluate(route)
+        if result is None:
+            return None
+        total_time, lateness = result
+        return total_time + LATE_PENALTY * lateness
+
+    def best_insertion(self, route, stops): # O(n^3)
+        """Mejor ruta insertando stops (1 parada, o recogida + entrega en ese orden)"""
+        best_cost, best_route = None, None
+        size = len(route)
+        if len(stops) == 1:
+            for i in range(size + 1):
+                candidate = route[:i] + stops + route[i:]
+                cost = self.cost(candidate)
+                if cost is not None and (best_cost is None or cost < best_cost):
+                    best_cost, best_route = cost, candidate
+            return best_cost, best_route
+
+        pickup, dropoff = stops
+        for i in range(size + 1):
+            with_pickup = route[:i] + [pickup] + route[i:]
+            for j in range(i + 1, size + 2):
+                candidate = with_pickup[:j] + [dropoff] + with_pickup[j:]
+                cost = self.cost(candidate)
+                if cost is not None and (best_cost is None or cost < best_cost):
+                    best_cost, best_route = cost, candidate
+        return best_cost, best_route
+
+    def improve(self, route):
+        """2-opt y Or-opt hasta que no mejoren o se acabe el presupuesto"""
+        best_cost = self.cost(route)
+        if best_cost is None:
+            return route
+        improved = True
+        while improved and not self.limit.exhausted():
+            improved = False
+            for candidate in self._neighbors(route):
+                cost = self.cost(candidate)
+                if cost is not None and cost < best_cost - 1e-9:
+                    route, best_cost = candidate, cost
+                    improved = True
+                    break
+                if self.limit.exhausted():
+                    break
+        return route
+
+    def _neighbors(self, route):
+        size = len(route)
+        # 2-opt: invertir el tramo i..j
+        for i in range(size - 1):
+            for j in range(i + 1, size):
+                yield route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+        # Or-opt: mover un tramo de 1 a 3 paradas a otra posición
+        for length in (1, 2, 3):
+            for i in range(size - length + 1):
+                segment = route[i:i + length]
+                rest = route[:i] + route[i + length:]
+                for j in range(len(rest) + 1):
+                    if j != i:
+                        yield rest[:j] + segment + rest[j:]
@@ -0,0 +1,63 @@
+class SpatialGrid:
+    """Índice espacial por cubetas (bucket grid) sobre coordenadas de casillas.
+
+    El mapa se divide en celdas de cell_size x cell_size casillas; cada
+    celda guarda los elementos cuyo punto cae en ella. Agregar y quitar es
+    O(1) y una consulta por radio solo revisa las celdas que tocan el
+    cuadrado del radio, sin importar cuántos elementos haya en el resto del
+    mapa.
+    """
+
+    def __init__(self, cell_size=8):
+        self.cell_size = cell_size
+        self._cells = {}  # (celda_x, celda_y) -> {clave: (punto, elemento)}
+        self._locations = {}  # clave -> celda donde está
+
+    def __len__(self):
+        return len(self._locations)
+
+    def __contains__(self, key):
+        return key in self._locations
+
+    def _cell_of(self, x, y):
+        return (x // self.cell_size, y // self.cell_size)
+
+    def add(self, key, point, item):
+        """Agrega (o mueve) un elemento en el punto dado - O(1)"""
+        if key in self._locations:
+            self.remove(key)
+        point = (point[0], point[1])
+        cell = self._cell_of(*point)
+        self._cells.setdefault(cell, {})[key] = (point, item)
+        self._locations[key] = cell
+
+    def remove(self, key):
+        """Quita un elemento por su clave; retorna False si no estaba - O(1)"""
+        cell = self._locations.pop(key, None)
+        if cell is None:
+            return False
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+        return True
+
+    def query(self, x, y, radius):
+        """Elementos a distancia de Chebyshev <= radius del punto (x, y) - O(celdas del radio + k)"""
+        min_cx, min_cy = self._cell_of(x - radius, y - radius)
+        max_cx, max_cy = self._cell_of(x + radius, y + radius)
+        found = []
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for (px, py), item in bucket.values():
+                    if abs(px - x) <= radius and abs(py - y) <= radius:
+                        found.append(item)
+        return found
+
+    def clear(self):
+        self._cells.clear()
+        self._locations.clear()
@@ -1,5 +1,15 @@
 class Speed_Movement:
-    """Sistema que gestiona la velocidad y movimiento del jugador"""
+    """Sistema que gestiona la velocidad y movimiento del jugador.
+
+    Las velocidades se memoizan en una tabla indexada por el estado discreto
+    (superficie, peso, reputación ≥ 90, estado de resistencia). La tabla se
+    vacía con configurar_limite, configurar_peso_superficie o invalidar_tabla;
+    si se modifican a mano velocidad_base o los diccionarios de multiplicadores
+    hay que llamar a invalidar_tabla.
+    """
+
+    # Límite de entradas de la tabla (pesos no enteros podrían hacerla crecer sin fin)
+    MAX_TABLA_VELOCIDADES = 4096
     
     def __init__(self, velocidad_base: float = 3.0):
         self.velocidad_base = velocidad_base
@@ -18,10 +28,23 @@ class Speed_Movement:
             "tired": 0.8,
             "exhausted": 0.0
         }
+
+        # (superficie, peso, reputación alta, estado) -> velocidad final
+        self._tabla_velocidades = {}
     
     def configurar_limite(self, multiplicador: float):
         """Configura el multiplicador de límite (Melima)"""
         self.multiplicador_limite = max(0.0, multiplicador)
+        self.invalidar_tabla()
+
+    def configurar_peso_superficie(self, tipo_superficie: str, peso: float):
+        """Cambia el surface_weight de un tipo de superficie"""
+        self.pesos_superficie[tipo_superficie] = peso
+        self.invalidar_tabla()
+
+    def invalidar_tabla(self):
+        """Descarta las velocidades memoizadas"""
+        self._tabla_velocidades.clear()
     
     def actualizar_reputacion(self, reputacion: float):
         """Actualiza la reputación del jugador"""
@@ -56,11 +79,41 @@ class Speed_Movement:
         return self.pesos_superficie.get(tipo_superficie, 1.0)
     
     def calcular_velocidad_final(self, tipo_superficie: str) -> float:
+        """Velocidad final para el estado actual del jugador - O(1) con la tabla"""
+        clave = (tipo_superficie, self.peso_total, self.reputacion_actual >= 90, self.estado_resistencia)
+        velocidad = self._tabla_velocidades.get(clave)
+        if velocidad is None:
+            velocidad = self._guardar_velocidad(clave)
+        return velocidad
+
+    def consultar_velocidad(self, tipo_superficie: str, peso_total: float = None,
+                            reputacion: float = None, estado: str = None) -> float:
+        """Velocidad para un estado hipotético sin cambiar el actual (rutas y bots).
+
+        Los argumentos omitidos toman el valor actual del jugador.
+        """
+        peso_total = self.peso_total if peso_total is None else max(0.0, peso_total)
+        reputacion = self.reputacion_actual if reputacion is None else reputacion
+        estado = self.estado_resistencia if estado is None else estado
+        clave = (tipo_superficie, peso_total, reputacion >= 90, estado)
+        velocidad = self._tabla_velocidades.get(clave)
+        if velocidad is None:
+            velocidad = self._guardar_velocidad(clave)
+        return velocidad
+
+    def _guardar_velocidad(self, clave) -> float:
+        if len(self._tabla_velocidades) >= self.MAX_TABLA_VELOCIDADES:
+            self._tabla_velocidades.clear()
+        velocidad = self._calcular_velocidad(*clave)
+        self._tabla_velocidades[clave] = velocidad
+        return velocidad
+
+    def _calcular_velocidad(self, tipo_superficie, peso_total, reputacion_alta, estado) -> float:
         """Calcula la velocidad final usando la fórmula completa"""
         try:
-            m_peso = self.calcular_multiplicador_peso()
-            m_rep = self.calcular_multiplicador_reputacion()
-            m_resistencia = self.obtener_multiplicador_resistencia()
+            m_peso = max(0.8, 1 - 0.03 * peso_total)
+            m_rep = 1.03 if reputacion_alta else 1.0
+            m_resistencia = self.multiplicadores_resistencia[estado]
             peso_superficie = self.obtener_peso_superficie(tipo_superficie)
             
             # FORMULA COMPLETA
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+from api.api_manager import APIManager
+
+
+class TravelMatrix:
+    """Tiempos de viaje precalculados entre los puntos de recogida y entrega.
+
+    Por cada punto se corre un Dijkstra multi-origen (PathFinder) desde sus
+    casillas de interacción y se guarda una fila con los segundos desde
+    cada casilla del mapa hasta ese punto (fields, float32). La matriz entre
+    puntos sale de esas filas: matrix[i, j] es el tiempo desde el punto i
+    hasta el punto j. Agregar puntos nuevos solo agrega filas y columnas.
+
+    Las filas se guardan en api_cache (un .npz por hash de los costos del
+    mapa y el radio), así que una partida con el mismo mapa no las recalcula.
+    El archivo guarda solo los puntos de la partida actual, y add_points solo
+    marca la matriz como modificada: save se llama al cargar y al terminar
+    el turno, nunca dentro de un frame.
+    """
+
+    def __init__(self, pathfinder, radius=0, cache_dir=APIManager.CACHE_DIR):
+        self.pathfinder = pathfinder
+        self.radius = radius
+        self.cache_dir = cache_dir
+        self._reset()
+
+    def _reset(self):
+        # Los costos (y su hash) tienen que ser los del mapa actual antes de leer el caché
+        self.pathfinder.check_map()
+        self.points = []  # (x, y) de cada fila/columna
+        self.index = {}  # punto -> posición en points
+        self.anchors = []  # casilla de salida (índice plano) de cada punto, -1 si no hay
+        self.fields = np.empty((0, self._cell_count()), dtype=np.float32)
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self._tiles_version = self.pathfinder.game_map.tiles_version
+        self.map_hash = self._map_hash()
+        self._stored = self._load()  # punto -> fila leída del caché en disco
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.points)
+
+    def __contains__(self, point):
+        return (point[0], point[1]) in self.index
+
+    def _cell_count(self):
+        return self.pathfinder.rows * self.pathfinder.cols
+
+    def _cell_index(self, x, y):
+        return y * self.pathfinder.cols + x
+
+    def _map_hash(self):
+        """Hash de los costos efectivos del mapa (casillas, leyenda y velocidades) y el radio"""
+        data = json.dumps({"costs": self.pathfinder.costs, "radius": self.radius})
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.cache_dir, f"travel_{self.map_hash}.npz")
+
+    def _load(self):
+        try:
+            if not os.path.exists(self.cache_path):
+                return {}
+            with np.load(self.cache_path) as data:
+                points, fields = data["points"], data["fields"]
+            if fields.shape[1] != self._cell_count():
+                return {}
+            return {(int(x), int(y)): fields[i] for i, (x, y) in enumerate(points)}
+        except Exception as e:
+            print(f"Error al cargar tiempos de viaje del caché: {e}")
+            return {}
+
+    def save(self): # O(puntos * casillas)
+        """Guarda en disco las filas de los puntos actuales (solo si hay nuevas)"""
+        if not self._dirty:
+            return False
+        try:
+            rows = {point: self.fields[i] for i, point in enumerate(self.points)}
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Archivo temporal propio de este escritor (los procesos del simulador
+            # guardan a la vez) y reemplazo atómico del archivo final
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix="travel_", suffix=".tmp.npz")
+            try:
+                with os.fdopen(fd, "wb") as temp_file:
+                    np.savez(temp_file,
+                             points=np.array(list(rows), dtype=np.int32).reshape(-1, 2),
+                             fields=np.array(list(rows.values()), dtype=np.float32).reshape(-1, self._cell_count()))
+                os.replace(temp_path, self.cache_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._stored.update(rows)
+            self._dirty = False
+            return True
+        except Exception as e:
+            print(f"Error al guardar tiempos de viaje: {e}")
+            return False
+
+    def _compute_field(self, point): # O(V log V)
+        """Segundos desde cada casilla hasta el punto (inf si no se llega)"""
+        field = np.full(self._cell_count(), np.inf, dtype=np.float32)
+        distances = self.pathfinder.distance_field(point, self.radius)
+        if distances:
+            cells = np.fromiter((self._cell_index(x, y) for x, y in distances), dtype=np.intp,
+                                count=len(distances))
+            field[cells] = np.fromiter(distances.values(), dtype=np.float32, count=len(distances))
+        return field
+
+    def _anchor(self, point):
+        """Casilla desde donde se sale de un punto (la vecina transitable si es un edificio)"""
+        cells = self.pathfinder.goal_cells(point, 0)
+        return self._cell_index(*cells[0]) if cells else -1
+
+    def add_points(self, points):
+        """Agrega puntos nuevos; retorna cuántos se agregaron - O(k * V log V)"""
+        if self.pathfinder.game_map.tiles_version != self._tiles_version:
+            self._reset()
+
+        new_points = []
+        for point in points:
+            point = (int(point[0]), int(point[1]))
+            if point not in self.index:
+                self.index[point] = len(self.points) + len(new_points)
+                new_points.append(point)
+        if not new_points:
+            return 0
+
+        new_fields = []
+        for point in new_points:
+            field = self._stored.get(point)
+            if field is None:
+                field = self._compute_field(point)
+                self._dirty = True
+            new_fields.append(field)
+        old_count = len(self.points)
+        self.points.extend(new_points)
+        self.anchors.extend(self._anchor(point) for point in new_points)
+        self.fields = np.vstack([self.fields, np.array(new_fields, dtype=np.float32)])
+        self._grow_matrix(old_count)
+        return len(new_points)
+
+    def _grow_matrix(self, old_count):
+        """Agrega a la matriz las filas y columnas de los puntos nuevos"""
+        count = len(self.points)
+        anchors = np.array(self.anchors, dtype=np.intp)
+        padded = np.column_stack([self.fields, np.full(count, np.inf, dtype=np.float32)])  # índice -1 = sin salida
+
+        matrix = np.empty((count, count), dtype=np.float32)
+        matrix[:old_count, :old_count] = self.matrix
+        matrix[:, old_count:] = padded[old_count:, anchors].T
+        matrix[old_count:, :old_count] = padded[:old_count, anchors[old_count:]].T
+        self.matrix = matrix
+
+    def add_order(self, order):
+        return self.add_points((order.pickup, order.dropoff))
+
+    def add_orders(self, orders):
+        return self.add_points(point for order in orders for point in (order.pickup, order.dropoff))
+
+    def time_between(self, origin, destination):
+        """Segundos desde un punto registrado hasta otro - O(1)"""
+        return float(self.matrix[self.index[(origin[0], origin[1])],
+                                 self.index[(destination[0], destination[1])]])
+
+    def times_from(self, position):
+        """Segundos desde una casilla cualquiera (el repartidor) hasta cada punto, en el orden de points"""
+        x, y = position
+        if not (0 <= x < self.pathfinder.cols and 0 <= y < self.pathfinder.rows):
+            return np.full(len(self.points), np.inf, dtype=np.float32)
+        return self.fields[:, self._cell_index(x, y)]
+
+    def time_from(self, position, point):
+        """Segundos desde una casilla hasta un punto registrado - O(1)"""
+        x, y = position
+        if not (0 <= x < self.pathfinder.cols and 0 <= y < self.pathfinder.rows):
+            return float('inf')
+        return float(self.fields[self.index[(point[0], point[1])], self._cell_index(x, y)])
@@ -2,6 +2,24 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import List
 
+
+def to_game_seconds(value) -> float:
+    """Convierte una hora del juego a segundos desde la medianoche del día del juego.
+
+    Acepta un datetime (se usa solo su hora, igual que la antigua normalización
+    de fechas) o un número que ya esté en segundos del juego.
+    """
+    if isinstance(value, datetime):
+        return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1_000_000
+    return float(value)
+
+
+def format_game_seconds(seconds: float) -> str:
+    """Formatea segundos del día del juego como HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
 @dataclass
 class Order:
     id: str
@@ -19,12 +37,16 @@ class Order:
     is_completed: bool = field(default=False, init=False)
     is_in_inventory: bool = field(default=False, init=False)
     accepted_time: datetime = field(default=None, init=False)
+    
+    # Deadline en segundos del día del juego, calculado una sola vez
+    deadline_s: float = field(default=0.0, init=False, repr=False)
 
+    def __post_init__(self):
+        self.deadline_s = to_game_seconds(self.deadline)
 
-    @classmethod
-    def from_dict(cls, data: dict):
-        deadline_str = data['deadline']
-        
+    @staticmethod
+    def parse_deadline(deadline_str: str) -> datetime:
+        """Convierte el deadline del JSON de la API a datetime"""
         if deadline_str.endswith('Z'):
             deadline_str = deadline_str[:-1] 
         
@@ -33,71 +55,46 @@ class Order:
             deadline_str += ":00"     # "2025-09-01T12:10:00"
         
         try:
-            deadline = datetime.fromisoformat(deadline_str)
+            return datetime.fromisoformat(deadline_str)
         except Exception as e:
             print(f"❌ ERROR PARSING DEADLINE: {e}")
-            deadline = datetime.now() + timedelta(minutes=15)
-        
+            return datetime.now() + timedelta(minutes=15)
+
+    @classmethod
+    def from_dict(cls, data: dict):
         return cls(
             id=data['id'],
             pickup=data['pickup'],
             dropoff=data['dropoff'],
             payout=data['payout'],
-            deadline=deadline,
+            deadline=cls.parse_deadline(data['deadline']),
             weight=data['weight'],
             priority=data['priority'],
             release_time=data['release_time']
         )
-    def _normalize_times_for_comparison(self, current_time):
-        """CORREGIDO: Normaliza fechas para comparación consistente usando solo la fecha del juego"""
-        if not isinstance(current_time, datetime) or not isinstance(self.deadline, datetime):
-            return current_time, self.deadline
-        
-        # Usar SOLO la fecha del current_time (que viene del juego)
-        game_date = current_time.date()
-        
-        # Normalizar deadline para usar la misma fecha pero mantener su hora original
-        normalized_deadline = self.deadline.replace(
-            year=game_date.year,
-            month=game_date.month,
-            day=game_date.day
-        )
-        return current_time, normalized_deadline
-    
-    
-    
-    def check_expiration(self, current_time: datetime) -> bool:
-        """Verifica si el pedido ha expirado - VERSIÓN CORREGIDA"""
+    def check_expiration(self, current_time) -> bool:
+        """Verifica si el pedido ha expirado (current_time: segundos del juego o datetime) - O(1)"""
         if self.is_completed or self.is_expired:
             return self.is_expired
         
-        # Normalizar fechas para comparación
-        normalized_current, normalized_deadline = self._normalize_times_for_comparison(current_time)
+        current_seconds = to_game_seconds(current_time)
         
         # Expirar EXACTAMENTE en el deadline
-        if normalized_current >= normalized_deadline:
+        if current_seconds >= self.deadline_s:
             self.is_expired = True
             print(f"Pedido {self.id} EXPIRÓ")
-            print(f"   Deadline: {normalized_deadline.strftime('%H:%M:%S')}")
-            print(f"   Hora actual: {normalized_current.strftime('%H:%M:%S')}")
+            print(f"   Deadline: {format_game_seconds(self.deadline_s)}")
+            print(f"   Hora actual: {format_game_seconds(current_seconds)}")
             return True
         
         return False
     
-    def get_time_remaining(self, current_time: datetime) -> float:
-        """Retorna el tiempo restante en segundos - VERSIÓN CORREGIDA"""
+    def get_time_remaining(self, current_time) -> float:
+        """Retorna el tiempo restante en segundos (current_time: segundos del juego o datetime) - O(1)"""
         if self.is_expired or self.is_completed:
             return 0
         
-        # Normalizar fechas para usar misma fecha
-        normalized_current, normalized_deadline = self._normalize_times_for_comparison(current_time)
-        
-        # Calcular diferencia
-        delta = normalized_deadline - normalized_current
-        remaining_seconds = delta.total_seconds()
-    
-        
-        return max(0, remaining_seconds)
+        return max(0, self.deadline_s - to_game_seconds(current_time))
     
     def get_delivery_timeliness(self, current_time: datetime) -> str:
         """Determina la puntualidad de la entrega - VERSIÓN MEJORADA"""
@@ -110,17 +107,7 @@ class Order:
         
         # Calcular porcentaje de tiempo usado basado en tiempo total disponible
         if self.accepted_time:
-            normalized_current, _ = self._normalize_times_for_comparison(current_time)
-            normalized_accepted = self.accepted_time.replace(
-                year=normalized_current.year,
-                month=normalized_current.month,
-                day=normalized_current.day
-            )
-            total_available_time = (self.deadline.replace(
-                year=normalized_current.year,
-                month=normalized_current.month,
-                day=normalized_current.day
-            ) - normalized_accepted).total_seconds()
+            total_available_time = self.deadline_s - to_game_seconds(self.accepted_time)
             
             if total_available_time > 0:
                 time_used = total_available_time - time_remaining
@@ -1,43 +1,142 @@
 from collections.abc import Iterator
 from entities.order import Order
-from collections import deque
-from typing import List, Optional
+from collections import OrderedDict
+from bisect import bisect_left, insort
+import itertools
+from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from api.api_manager import APIManager
+from core.spatial_grid import SpatialGrid
 import requests
 
 
+# Claves de las vistas ordenadas: la menor clave va al frente de la cola
+SORT_KEYS = {
+    "priority": lambda order: -order.priority,
+    "payout": lambda order: -order.payout,
+    "deadline": lambda order: order.deadline_s,
+}
+
+# Generaciones únicas entre todas las listas: una lista nueva nunca repite la de otra
+_generations = itertools.count(1)
+
+
 @dataclass
 class OrderList:
-    """Cola (Queue) especializada para manejar objetos Order - FIFO (First In, First Out)"""
-    _orders: deque = field(default_factory=deque, init=False)
+    """Cola (Queue) especializada para manejar objetos Order - FIFO (First In, First Out)
+
+    Las órdenes se guardan en un OrderedDict id -> Order: conserva el orden de
+    llegada y permite buscar, remover y verificar pertenencia por ID en O(1).
+    Los IDs son únicos dentro de la cola; encolar un ID que ya está lo mueve al
+    final (o al frente con enqueue_priority).
+
+    Para prioridad, payout y deadline se mantienen índices secundarios
+    ordenados (listas de (clave, secuencia, id) con bisect). Se construyen la
+    primera vez que se usan y desde ahí se actualizan en cada inserción y
+    remoción - O(log n) para buscar la posición. Reorganizar la cola solo cambia la
+    vista activa; los empates conservan el orden de llegada.
+
+    Igual de perezosos son los índices espaciales (SpatialGrid) de los puntos
+    de recogida y entrega, que usa find_near para las búsquedas por radio.
+    Cada cambio asigna una nueva generación (generation), para que los cachés
+    de otras capas sepan cuándo su resultado quedó viejo.
+    """
+    _orders: OrderedDict = field(default_factory=OrderedDict, init=False)
+    _sequence: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _next_sequence: int = field(default=0, init=False, repr=False, compare=False)
+    _front_sequence: int = field(default=0, init=False, repr=False, compare=False)
+    _indexes: Dict[str, list] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _grids: Dict[str, SpatialGrid] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _view: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _snapshot: Optional[List[Order]] = field(default=None, init=False, repr=False, compare=False)
+    _generation: int = field(default_factory=lambda: next(_generations), init=False, repr=False, compare=False)
+    
+    def _changed(self) -> None:
+        """Invalida la copia en lista usada para el acceso por posición y avanza la generación"""
+        self._snapshot = None
+        self._generation = next(_generations)
+    
+    @property
+    def generation(self) -> int:
+        """Cambia con cada inserción, remoción o cambio de vista"""
+        return self._generation
+    
+    def _as_list(self) -> List[Order]:
+        """Lista de órdenes en orden de cola; se reconstruye solo después de un cambio"""
+        if self._snapshot is None:
+            self._snapshot = list(self)
+        return self._snapshot
+    
+    def _get_index(self, name: str) -> list: # O(n log n) la primera vez, luego O(1)
+        """Índice ordenado por la clave 'name'; se construye la primera vez que se pide"""
+        index = self._indexes.get(name)
+        if index is None:
+            key = SORT_KEYS[name]
+            index = sorted((key(order), self._sequence[order_id], order_id)
+                           for order_id, order in self._orders.items())
+            self._indexes[name] = index
+        return index
+    
+    def _index_entry(self, name: str, order: Order) -> tuple:
+        return (SORT_KEYS[name](order), self._sequence[order.id], order.id)
+    
+    def _insert(self, order: Order, sequence: int, last: bool) -> None: # O(log n) + O(n) del insort
+        if order.id in self._orders:
+            self._discard(order.id)
+        self._orders[order.id] = order
+        self._orders.move_to_end(order.id, last=last)
+        self._sequence[order.id] = sequence
+        for name, index in self._indexes.items():
+            insort(index, self._index_entry(name, order))
+        for location, grid in self._grids.items():
+            grid.add(order.id, getattr(order, location), order)
+        self._changed()
     
-    def enqueue(self, order: Order) -> None:
+    def _discard(self, order_id: str) -> Optional[Order]: # O(log n) + O(n) del del
+        order = self._orders.get(order_id)
+        if order is None:
+            return None
+        for name, index in self._indexes.items():
+            del index[bisect_left(index, self._index_entry(name, order))]
+        for grid in self._grids.values():
+            grid.remove(order_id)
+        del self._orders[order_id]
+        del self._sequence[order_id]
+        self._changed()
+        return order
+    
+    def enqueue(self, order: Order) -> None: # O(1) sin índices
         """Añade una orden al final de la cola"""
-        self._orders.append(order)
+        self._next_sequence += 1
+        self._insert(order, self._next_sequence, last=True)
     
-    def enqueue_priority(self, order: Order) -> None:
+    def enqueue_priority(self, order: Order) -> None: # O(1) sin índices
         """Añade una orden al inicio de la cola (para casos de alta prioridad)"""
-        self._orders.appendleft(order)
+        self._front_sequence -= 1
+        self._insert(order, self._front_sequence, last=False)
     
-    def dequeue(self) -> Order:
-        """Remueve y retorna la primera orden de la cola (FIFO)"""
+    def dequeue(self) -> Order: # O(1) en FIFO
+        """Remueve y retorna la primera orden de la cola (según la vista activa)"""
         if self.is_empty():
             raise IndexError("Dequeue from empty OrderList")
-        return self._orders.popleft()
+        return self._discard(self.front().id)
     
-    def front(self) -> Order:
+    def front(self) -> Order: # O(1)
         """Retorna la primera orden de la cola sin removerla"""
         if self.is_empty():
             raise IndexError("Front from empty OrderList")
-        return self._orders[0]
+        if self._view is not None:
+            return self._orders[self._get_index(self._view)[0][2]]
+        return next(iter(self._orders.values()))
     
-    def rear(self) -> Order:
+    def rear(self) -> Order: # O(1)
         """Retorna la última orden de la cola sin removerla"""
         if self.is_empty():
             raise IndexError("Rear from empty OrderList")
-        return self._orders[-1]
+        if self._view is not None:
+            return self._orders[self._get_index(self._view)[-1][2]]
+        return next(reversed(self._orders.values()))
     
     def is_empty(self) -> bool:
         """Verifica si la cola está vacía"""
@@ -50,39 +149,36 @@ class OrderList:
     def clear(self) -> None:
         """Limpia toda la cola"""
         self._orders.clear()
+        self._sequence.clear()
+        for index in self._indexes.values():
+            index.clear()
+        for grid in self._grids.values():
+            grid.clear()
+        self._changed()
     
-    def find_by_id(self, order_id: str) -> Optional[Order]: # O(n)
+    def find_by_id(self, order_id: str) -> Optional[Order]: # O(1)
         """Busca una orden por su ID"""
-        for order in self._orders:
-            if order.id == order_id:
-                return order
-        return None
+        return self._orders.get(order_id)
     
 
-    def remove_by_id(self, order_id: str) -> bool: # O(n)
+    def remove_by_id(self, order_id: str) -> bool: # O(1) sin índices
         """Remueve una orden por su ID manteniendo la estructura de cola"""
-        new_orders = deque()
-        removed = False
-        for order in self._orders:
-            if order.id == order_id and not removed:
-                removed = True
-                continue
-            new_orders.append(order)
-        
-        self._orders = new_orders
-        return removed
+        return self._discard(order_id) is not None
 
-    def get_highest_priority(self) -> int: # O(n)
+    def get_highest_priority(self) -> int: # O(1)
         """Obtiene la prioridad más alta de todas las órdenes"""
         if self.is_empty():
             return -1
-        return max(order.priority for order in self._orders)
+        return -self._get_index("priority")[0][0]
 
-    def filter_by_priority(self, priority: int) -> List[Order]: # O(n)
-        """Filtra órdenes por nivel de prioridad"""
-        return [order for order in self._orders if order.priority == priority]
+    def filter_by_priority(self, priority: int) -> List[Order]: # O(log n + k)
+        """Filtra órdenes por nivel de prioridad (en orden de llegada)"""
+        index = self._get_index("priority")
+        start = bisect_left(index, (-priority,))
+        end = bisect_left(index, (-priority, float('inf')))
+        return [self._orders[entry[2]] for entry in index[start:end]]
     
-    def get_high_priority_orders(self) -> List[Order]:
+    def get_high_priority_orders(self) -> List[Order]: # O(log n + k)
         """Obtiene todas las órdenes con la prioridad más alta"""
         if self.is_empty():
             return []
@@ -95,76 +191,61 @@ class OrderList:
     
     def to_list(self) -> List[Order]:
         """Convierte la OrderList a una lista Python"""
-        return list(self._orders)
-    
-    def _insertion_sort_by_priority(self, arr: List[Order]) -> List[Order]: # O(n^2)
-        """Ordena una lista de órdenes por prioridad usando Insertion Sort (mayor prioridad primero)"""
-        for i in range(1, len(arr)):
-            key = arr[i]
-            j = i - 1
-            
-            while j >= 0 and arr[j].priority < key.priority:
-                arr[j + 1] = arr[j]
-                j -= 1
-            arr[j + 1] = key
-            
-        return arr
-    
-    def _insertion_sort_by_payout(self, arr: List[Order]) -> List[Order]: # O(n^2)
-        """Ordena una lista de órdenes por payout usando Insertion Sort (mayor payout primero)"""
-        for i in range(1, len(arr)):
-            key = arr[i]
-            j = i - 1
-            
-            while j >= 0 and arr[j].payout < key.payout:
-                arr[j + 1] = arr[j]
-                j -= 1
-            arr[j + 1] = key
-            
-        return arr
-    
-    def _insertion_sort_by_deadline(self, arr: List[Order]) -> List[Order]: # O(n^2)
-        """Ordena una lista de órdenes por deadline usando Insertion Sort (fechas más cercanas primero)"""
-        for i in range(1, len(arr)):
-            key = arr[i]
-            j = i - 1
-            
-            while j >= 0 and arr[j].deadline > key.deadline:
-                arr[j + 1] = arr[j]
-                j -= 1
-            arr[j + 1] = key
-            
-        return arr
-    
-    def reorganize_by_priority(self) -> None: # O(n^2)
-        """Reorganiza la cola poniendo las órdenes de mayor prioridad al frente usando Insertion Sort"""
-        if self.is_empty():
-            return
-        orders_list = list(self._orders)
-        sorted_orders = self._insertion_sort_by_priority(orders_list)
-        self._orders = deque(sorted_orders)
+        return list(self)
     
-    def reorganize_by_payout(self) -> None: # O(n^2)
-        """Reorganiza la cola poniendo las órdenes de mayor payout al frente usando Insertion Sort"""
-        if self.is_empty():
-            return
-        orders_list = list(self._orders)
-        sorted_orders = self._insertion_sort_by_payout(orders_list)
-        self._orders = deque(sorted_orders)
+    def _get_grid(self, location: str) -> SpatialGrid: # O(n) la primera vez, luego O(1)
+        """Índice espacial del punto 'pickup' o 'dropoff'; se construye la primera vez que se pide"""
+        grid = self._grids.get(location)
+        if grid is None:
+            grid = SpatialGrid()
+            for order_id, order in self._orders.items():
+                grid.add(order_id, getattr(order, location), order)
+            self._grids[location] = grid
+        return grid
     
-    def reorganize_by_deadline(self) -> None: # O(n^2)
-        """Reorganiza la cola poniendo las órdenes más urgentes (deadline cercano) al frente usando Insertion Sort"""
-        if self.is_empty():
-            return
-        orders_list = list(self._orders)
-        sorted_orders = self._insertion_sort_by_deadline(orders_list)
-        self._orders = deque(sorted_orders)
+    def _queue_key(self, order: Order):
+        """Posición relativa de una orden en la vista activa"""
+        if self._view is None:
+            return self._sequence[order.id]
+        return self._index_entry(self._view, order)
+    
+    def find_near(self, location, position, radius: int) -> List[Order]: # O(celdas del radio + k log k)
+        """Órdenes cuyo punto location ('pickup', 'dropoff' o una tupla de ambos) está
+        a distancia de Chebyshev <= radius de position, en el orden de la cola"""
+        locations = (location,) if isinstance(location, str) else location
+        found = {}
+        for name in locations:
+            for order in self._get_grid(name).query(position[0], position[1], radius):
+                found[order.id] = order
+        return sorted(found.values(), key=self._queue_key)
+    
+    def _set_view(self, name: Optional[str]) -> None:
+        self._view = name
+        if name is not None:
+            self._get_index(name)
+        self._changed()
+    
+    def reorganize_by_priority(self) -> None: # O(1) con el índice ya construido
+        """Reorganiza la cola poniendo las órdenes de mayor prioridad al frente"""
+        self._set_view("priority")
+    
+    def reorganize_by_payout(self) -> None: # O(1) con el índice ya construido
+        """Reorganiza la cola poniendo las órdenes de mayor payout al frente"""
+        self._set_view("payout")
+    
+    def reorganize_by_deadline(self) -> None: # O(1) con el índice ya construido
+        """Reorganiza la cola poniendo las órdenes más urgentes (deadline cercano) al frente"""
+        self._set_view("deadline")
+    
+    def reorganize_by_arrival(self) -> None: # O(1)
+        """Vuelve al orden de llegada (FIFO)"""
+        self._set_view(None)
     
     def get_next_orders(self, count: int) -> List[Order]:
         """Obtiene los próximos 'count' órdenes sin removerlas de la cola"""
         if count <= 0:
             return []
-        return [self._orders[i] for i in range(min(count, len(self._orders)))]
+        return self._as_list()[:count]
     
     def process_batch(self, count: int) -> List[Order]:
         """Remueve y retorna un lote de órdenes de la cola"""
@@ -175,8 +256,12 @@ class OrderList:
         return batch
     
     @classmethod
-    def from_api_response(cls, api_response: dict) -> 'OrderList': # O(n)
-        """Crea una OrderList directamente desde la respuesta de la API - CORREGIDO"""
+    def from_api_response(cls, api_response: dict, compact: bool = False) -> 'OrderList': # O(n)
+        """Crea una OrderList directamente desde la respuesta de la API - CORREGIDO
+        
+        Con compact=True los pedidos se guardan en un OrderTable columnar y la
+        lista contiene vistas OrderView (feeds con miles de pedidos).
+        """
         order_list = cls()
         
         job_colors = [
@@ -184,6 +269,11 @@ class OrderList:
             (255, 100, 255), (100, 255, 255)
         ]
         
+        if compact:
+            from entities.order_table import OrderTable
+            for order in OrderTable.from_api_response(api_response, colors=job_colors):
+                order_list.enqueue(order)
+            return order_list
 
         for i, order_data in enumerate(api_response['data']):
             order = Order.from_dict(order_data)
@@ -216,8 +306,11 @@ class OrderList:
         return not self.is_empty()
     
     def __iter__(self) -> Iterator[Order]:
-        """Iterador sobre las órdenes (desde el frente hasta atrás)"""
-        return iter(self._orders)
+        """Iterador sobre las órdenes (desde el frente hasta atrás, según la vista activa)"""
+        if self._view is None:
+            return iter(self._orders.values())
+        orders = self._orders
+        return (orders[entry[2]] for entry in self._get_index(self._view))
     
     def __len__(self) -> int:
         """Permite usar len(order_list)"""
@@ -225,18 +318,20 @@ class OrderList:
     
     def __contains__(self, order_id: str) -> bool:
         """Permite usar 'in' operator: 'REQ-001' in order_list"""
-        return self.find_by_id(order_id) is not None
+        return order_id in self._orders
     
     def __getitem__(self, index: int) -> Order:
-        """Permite indexación: order_list[0] (orden al frente de la cola)"""
-        return list(self._orders)[index]
+        """Permite indexación: order_list[0] (orden al frente de la cola) - O(1) amortizado"""
+        if index == 0 and self._orders:
+            return self.front()
+        return self._as_list()[index]
     
     def __str__(self) -> str:
         """Representación string de la cola"""
-        order_ids = [order.id for order in self._orders]
+        order_ids = [order.id for order in self]
         return f"OrderQueue({len(self._orders)} orders: {order_ids})"
     
     def __repr__(self) -> str:
         """Representación para debugging"""
-        return f"OrderQueue(orders={list(self._orders)})"
+        return f"OrderQueue(orders={self.to_list()})"
 
@@ -0,0 +1,258 @@
+from array import array
+from datetime import datetime, timedelta
+from entities.order import Order, to_game_seconds
+
+
+# Origen para guardar los deadlines como microsegundos enteros
+_EPOCH = datetime(1970, 1, 1)
+_NO_TIME = -(2 ** 63)
+
+# Bits de estado de cada pedido
+_EXPIRED = 1
+_COMPLETED = 2
+_IN_INVENTORY = 4
+
+DEFAULT_COLOR = (100, 100, 255)
+
+
+def _to_micros(value: datetime) -> int:
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+class OrderTable:
+    """Almacén columnar de pedidos para feeds muy grandes (simulaciones largas).
+
+    Cada campo vive en su propio array tipado (coordenadas, pago, peso,
+    prioridad, liberación, deadline, estado), así que un pedido ocupa unas
+    decenas de bytes en lugar de un objeto con diccionario, listas y datetime.
+    El juego trabaja con OrderView, vistas livianas que se comportan como
+    Order y leen/escriben directamente en las columnas.
+    Los deadlines se asumen sin zona horaria (como los que entrega la API).
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.pickup_x = array('i')
+        self.pickup_y = array('i')
+        self.dropoff_x = array('i')
+        self.dropoff_y = array('i')
+        self.payout = array('d')
+        self.weight = array('i')
+        self.priority = array('i')
+        self.release_time = array('d')
+        self.deadline = array('q')  # microsegundos desde 1970
+        self.deadline_s = array('d')  # segundos del día del juego
+        self.accepted = array('q')  # microsegundos desde 1970 o _NO_TIME
+        self.flags = array('B')
+        self.color_index = array('B')
+        self.palette = [DEFAULT_COLOR]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for row in range(len(self.ids)):
+            yield self.view(row)
+
+    def __getitem__(self, row):
+        return self.view(row)
+
+    def add(self, order_id, pickup, dropoff, payout, deadline, weight, priority, release_time,
+            color=DEFAULT_COLOR):
+        """Agrega un pedido al final de la tabla y retorna su fila - O(1) amortizado"""
+        row = len(self.ids)
+        self.ids.append(order_id)
+        self.pickup_x.append(pickup[0])
+        self.pickup_y.append(pickup[1])
+        self.dropoff_x.append(dropoff[0])
+        self.dropoff_y.append(dropoff[1])
+        self.payout.append(payout)
+        self.weight.append(weight)
+        self.priority.append(priority)
+        self.release_time.append(release_time)
+        self.deadline.append(_to_micros(deadline))
+        self.deadline_s.append(to_game_seconds(deadline))
+        self.accepted.append(_NO_TIME)
+        self.flags.append(0)
+        self.color_index.append(self.get_color_index(color))
+        return row
+
+    def add_dict(self, data, color=DEFAULT_COLOR):
+        """Agrega un pedido en el formato de la API (mismo parseo que Order.from_dict)"""
+        return self.add(data['id'], data['pickup'], data['dropoff'], data['payout'],
+                        Order.parse_deadline(data['deadline']), data['weight'],
+                        data['priority'], data['release_time'], color)
+
+    def get_color_index(self, color):
+        color = tuple(color)
+        try:
+            return self.palette.index(color)
+        except ValueError:
+            self.palette.append(color)
+            return len(self.palette) - 1
+
+    def view(self, row):
+        """Vista Order de una fila. Todas las vistas de una fila comparten su estado
+        (y son iguales con ==); la búsqueda por ID la hace OrderList"""
+        return OrderView(self, row)
+
+    @classmethod
+    def from_api_response(cls, api_response, colors=None):
+        """Crea la tabla desde la respuesta de /city/jobs, con colores rotativos opcionales"""
+        table = cls()
+        for i, order_data in enumerate(api_response['data']):
+            color = colors[i % len(colors)] if colors else DEFAULT_COLOR
+            table.add_dict(order_data, color)
+        return table
+
+
+def _flag_property(bit):
+    def getter(self):
+        return bool(self._table.flags[self._row] & bit)
+
+    def setter(self, value):
+        flags = self._table.flags
+        if value:
+            flags[self._row] |= bit
+        else:
+            flags[self._row] &= ~bit & 0xFF
+
+    return property(getter, setter)
+
+
+class OrderView:
+    """Pedido guardado en una fila de OrderTable, con la misma interfaz que Order"""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self):
+        return self._table.ids[self._row]
+
+    @property
+    def pickup(self):
+        return [self._table.pickup_x[self._row], self._table.pickup_y[self._row]]
+
+    @property
+    def dropoff(self):
+        return [self._table.dropoff_x[self._row], self._table.dropoff_y[self._row]]
+
+    @property
+    def payout(self):
+        return self._table.payout[self._row]
+
+    @property
+    def weight(self):
+        return self._table.weight[self._row]
+
+    @property
+    def priority(self):
+        return self._table.priority[self._row]
+
+    @property
+    def release_time(self):
+        return self._table.release_time[self._row]
+
+    @release_time.setter
+    def release_time(self, value):
+        self._table.release_time[self._row] = value
+
+    @property
+    def deadline(self):
+        return _from_micros(self._table.deadline[self._row])
+
+    @property
+    def deadline_s(self):
+        return self._table.deadline_s[self._row]
+
+    @property
+    def color(self):
+        return self._table.palette[self._table.color_index[self._row]]
+
+    @color.setter
+    def color(self, value):
+        self._table.color_index[self._row] = self._table.get_color_index(value)
+
+    @property
+    def accepted_time(self):
+        micros = self._table.accepted[self._row]
+        return None if micros == _NO_TIME else _from_micros(micros)
+
+    @accepted_time.setter
+    def accepted_time(self, value):
+        self._table.accepted[self._row] = _NO_TIME if value is None else _to_micros(value)
+
+    is_expired = _flag_property(_EXPIRED)
+    is_completed = _flag_property(_COMPLETED)
+    is_in_inventory = _flag_property(_IN_INVENTORY)
+
+    # Misma lógica de juego que Order
+    check_expiration = Order.check_expiration
+    get_time_remaining = Order.get_time_remaining
+    get_delivery_timeliness = Order.get_delivery_timeliness
+    calculate_reputation_change = Order.calculate_reputation_change
+    calculate_payout_modifier = Order.calculate_payout_modifier
+    mark_as_accepted = Order.mark_as_accepted
+    mark_as_completed = Order.mark_as_completed
+    mark_as_picked_up = Order.mark_as_picked_up
+
+    def __eq__(self, other):
+        if isinstance(other, OrderView):
+            return self._table is other._table and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._table), self._row))
+
+    def __repr__(self):
+        return (f"OrderView(id={self.id!r}, pickup={self.pickup}, dropoff={self.dropoff}, "
+                f"payout={self.payout}, deadline={self.deadline!r}, weight={self.weight}, "
+                f"priority={self.priority}, release_time={self.release_time})")
+
+
+def measure_memory(count=100_000):
+    """Compara la memoria de count pedidos como Order vs OrderTable (tracemalloc)"""
+    import tracemalloc
+
+    feed = [{
+        "id": f"PED-{i:06d}",
+        "pickup": [i % 30, (i * 7) % 25],
+        "dropoff": [(i * 3) % 30, (i * 11) % 25],
+        "payout": 100.0 + i % 400,
+        "deadline": f"2025-09-01T{12 + i % 3:02d}:{i % 60:02d}:00",
+        "weight": 1 + i % 5,
+        "priority": i % 3,
+        "release_time": i % 600
+    } for i in range(count)]
+
+    results = {}
+    def build_table_with_views():
+        table = OrderTable.from_api_response({"data": feed})
+        return table, list(table)
+
+    for name, build in (("Order", lambda: [Order.from_dict(data) for data in feed]),
+                        ("OrderTable", lambda: OrderTable.from_api_response({"data": feed})),
+                        ("OrderTable+vistas", build_table_with_views)):
+        tracemalloc.start()
+        orders = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = current
+        del orders
+
+    for name, size in results.items():
+        print(f"{name:18s} {size / 1024 / 1024:8.1f} MB  ({size / count:.0f} bytes por pedido)")
+    return results
+
+
+if __name__ == "__main__":
+    measure_memory()
@@ -0,0 +1,188 @@
+import pygame
+import numpy as np
+
+
+class ParticlePool:
+    """Almacén de partículas de un solo tipo en forma de estructura de arreglos.
+
+    Cada campo (posición, velocidad, vida, tamaño, alpha) vive en su propio
+    arreglo de NumPy de capacidad fija. Las partículas vivas ocupan las
+    posiciones [0, count); las muertas se rellenan con las últimas vivas
+    (swap-remove), así que no se crean ni se destruyen objetos por partícula.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.alpha = np.zeros(capacity, dtype=np.uint8)
+        self.fields = (self.x, self.y, self.vx, self.vy, self.life, self.size, self.alpha)
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vx, vy, life, size, alpha=255):
+        """Agrega una partícula; retorna False si el almacén está lleno - O(1)"""
+        i = self.count
+        if i >= self.capacity:
+            return False
+
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.life[i] = life
+        self.size[i] = size
+        self.alpha[i] = alpha
+        self.count = i + 1
+        return True
+
+    def update(self, dt, min_x, max_x, min_y, max_y):
+        """Integra posiciones, descuenta vida y elimina las partículas fuera de límites - O(n) vectorizado"""
+        n = self.count
+        if n == 0:
+            return
+
+        x = self.x[:n]
+        y = self.y[:n]
+        life = self.life[:n]
+        x += self.vx[:n] * dt
+        y += self.vy[:n] * dt
+        life -= dt
+
+        alive = (life > 0) & (x > min_x) & (x < max_x) & (y > min_y) & (y < max_y)
+        self.compact(alive)
+
+    def compact(self, alive):
+        """Swap-remove vectorizado: las vivas del final ocupan los huecos de las muertas"""
+        n = self.count
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == n:
+            return
+
+        holes = np.flatnonzero(~alive[:alive_count])
+        fillers = np.flatnonzero(alive[alive_count:]) + alive_count
+        for field in self.fields:
+            field[holes] = field[fillers]
+        self.count = alive_count
+
+    def visible(self, min_x, max_x, min_y, max_y):
+        """Índices de las partículas dentro de los límites dados"""
+        x = self.x[:self.count]
+        y = self.y[:self.count]
+        return np.flatnonzero((x > min_x) & (x < max_x) & (y > min_y) & (y < max_y))
+
+    def clear(self):
+        self.count = 0
+
+
+class ParticleSystem:
+    """Partículas del clima agrupadas por tipo, un ParticlePool por tipo"""
+
+    CAPACITIES = {
+        "rain": 4096,
+        "snow": 2048,
+        "fog": 1024,
+        "wind": 1024
+    }
+
+    # Límites del mundo fuera de los cuales una partícula se descarta
+    BOUNDS = (-200, 2120, -200, 1280)
+
+    def __init__(self, capacities=None):
+        capacities = capacities or self.CAPACITIES
+        self.pools = {particle_type: ParticlePool(capacity)
+                      for particle_type, capacity in capacities.items()}
+
+    def __len__(self):
+        return sum(pool.count for pool in self.pools.values())
+
+    def __bool__(self):
+        return any(pool.count for pool in self.pools.values())
+
+    def spawn(self, particle_type, x, y, vx, vy, life, size, alpha=255):
+        return self.pools[particle_type].spawn(x, y, vx, vy, life, size, alpha)
+
+    def update(self, dt):
+        min_x, max_x, min_y, max_y = self.BOUNDS
+        for pool in self.pools.values():
+            if pool.count:
+                pool.update(dt, min_x, max_x, min_y, max_y)
+
+    def clear(self):
+        for pool in self.pools.values():
+            pool.clear()
+
+
+class ParticleSpriteAtlas:
+    """Sprites pre-renderizados de las partículas del clima.
+
+    Cada forma (gota de lluvia, copo, nube de niebla, línea de viento) se
+    dibuja una sola vez por tamaño y nivel de transparencia; al dibujar un
+    frame solo se copian con Surface.blits(). Los sprites se pre-generan al
+    comenzar cada condición climática y se crean bajo demanda si falta alguno.
+    """
+
+    # La niebla se agrupa en niveles de tamaño y transparencia para acotar el atlas
+    FOG_SIZE_STEP = 4
+    FOG_ALPHA_STEP = 5
+
+    def __init__(self):
+        self.sprites = {}  # (tipo, clave) -> (Surface, desplazamiento x, desplazamiento y)
+
+    def _new_surface(self, width, height):
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def get(self, kind, key):
+        """Retorna el sprite (Surface, offset_x, offset_y), construyéndolo si no existe"""
+        sprite = self.sprites.get((kind, key))
+        if sprite is None:
+            sprite = getattr(self, f"_build_{kind}")(*key)
+            self.sprites[(kind, key)] = sprite
+        return sprite
+
+    def _build_rain(self, length, dx, color):
+        # Línea de (0, 0) a (dx, length) con margen para el grosor de 2px
+        left = min(0, dx) - 1
+        surface = self._new_surface(abs(dx) + 3, length + 3)
+        pygame.draw.line(surface, color, (-left, 1), (dx - left, length + 1), 2)
+        return surface, left, -1
+
+    def _build_snow(self, radius):
+        surface = self._new_surface(radius * 2 + 1, radius * 2 + 1)
+        pygame.draw.circle(surface, (255, 255, 255), (radius, radius), radius)
+        return surface, -radius, -radius
+
+    def _build_fog(self, size, alpha):
+        surface = self._new_surface(size * 2, size * 2)
+        pygame.draw.circle(surface, (200, 200, 220, alpha), (size, size), size)
+        return surface, -size, -size
+
+    def _build_wind(self, length, color):
+        surface = self._new_surface(length + 3, 4)
+        pygame.draw.line(surface, color, (1, 1), (length + 1, 1), 2)
+        return surface, -1, -1
+
+    def fog_bucket(self, sizes, alphas):
+        """Agrupa tamaños y transparencias de niebla en los niveles del atlas"""
+        size_step = self.FOG_SIZE_STEP
+        alpha_step = self.FOG_ALPHA_STEP
+        sizes = ((sizes + size_step // 2) // size_step) * size_step
+        alphas = ((alphas + alpha_step // 2) // alpha_step) * alpha_step
+        return sizes, alphas
+
+    def prebake(self, kind, keys):
+        """Pre-renderiza los sprites indicados (al comenzar una condición climática)"""
+        for key in keys:
+            self.get(kind, key)
+
+    def clear(self):
+        self.sprites.clear()
@@ -7,7 +7,7 @@ import pygame
 import os
 
 class Player:
-    def __init__(self, x, y, tile_size, legend, scale_factor=1):
+    def __init__(self, x, y, tile_size, legend, scale_factor=1, load_sprites=True):
         #COORDENADAS DE MAPA
         self.grid_x = int(x)
         self.grid_y = int(y)
@@ -34,7 +34,8 @@ class Player:
         self.legend = legend
         self.scale_factor = scale_factor
         self.target_size = tile_size 
-        self.sprite_sheet = self.load_sprites()
+        # Sin ventana (simulaciones) no se cargan sprites
+        self.sprite_sheet = self.load_sprites() if load_sprites else None
         self.current_frame = 0
         self.animation_time = 0
         self.animation_speed = 0.2  
@@ -129,7 +130,7 @@ class Player:
         return sprites
     
    
-    def try_move(self, dx, dy, tiles, weather_multiplier, surface_multiplier):
+    def try_move(self, dx, dy, game_map, weather_multiplier, surface_multiplier):
         """Intenta moverse a una nueva casilla con velocidad adecuada"""
         if self.move_cooldown > 0:
             return False
@@ -146,9 +147,7 @@ class Player:
         new_y = self.grid_y + dy
         
         # Verificar límites del mapa y tiles bloqueados
-        if (new_y < 0 or new_y >= len(tiles) or 
-            new_x < 0 or new_x >= len(tiles[0]) or
-            self.legend.get(tiles[new_y][new_x], {}).get("blocked", False)):
+        if game_map.is_blocked(new_x, new_y):
             return False
         
         # ACTUALIZAR SISTEMA DE VELOCIDAD
@@ -156,8 +155,7 @@ class Player:
         self.speed_system.actualizar_reputacion(self.reputation)
         self.speed_system.cambiar_estado_resistencia(self.state)
         
-        tile_char = tiles[new_y][new_x]
-        surface_type = self.legend.get(tile_char, {}).get("name", "calle")
+        surface_type = game_map.surface_name(new_x, new_y)
         velocidad_final = self.speed_system.calcular_velocidad_final(surface_type)
         velocidad_final *= weather_multiplier
         
@@ -349,16 +347,17 @@ class Player:
                 adjacent.append((self.grid_x + dx, self.grid_y + dy))
         return adjacent
     
-    def get_interactable_orders(self, orders, game_map, radius=1, game_time=None): # O(n)
+    def get_interactable_orders(self, orders, game_map, radius=1, game_time=None): # O(celdas del radio + k)
         interactable = []
+        position = (self.grid_x, self.grid_y)
         
         if game_time is None:
             raise ValueError("game_time es requerido para verificar expiraciones")
         else:
-            current_time = game_time.get_current_game_time()
+            current_time = game_time.get_current_game_seconds()
         
-        # Pedidos para RECOGER
-        for order in orders:
+        # Pedidos para RECOGER (solo los que el índice espacial encuentra dentro del radio)
+        for order in orders.find_near("pickup", position, radius):
             if (not order.is_expired and 
                 not order.is_completed and 
                 not order.is_in_inventory and
@@ -367,49 +366,40 @@ class Player:
                 if order.check_expiration(current_time):
                     continue
                 
-                can_pickup = self.is_near_location(order.pickup, include_exact=True, radius=radius)
-                
-                if can_pickup:
-                    distance = max(abs(self.grid_x - order.pickup[0]), 
-                                abs(self.grid_y - order.pickup[1]))
-                    interactable.append({
-                        'order': order,
-                        'action': 'pickup',
-                        'location': order.pickup,
-                        'is_exact': self.is_at_location(order.pickup),
-                        'distance': distance,
-                        'is_building': self.is_building_location(order.pickup, game_map)
-                    })
+                distance = max(abs(self.grid_x - order.pickup[0]), 
+                            abs(self.grid_y - order.pickup[1]))
+                interactable.append({
+                    'order': order,
+                    'action': 'pickup',
+                    'location': order.pickup,
+                    'is_exact': self.is_at_location(order.pickup),
+                    'distance': distance,
+                    'is_building': self.is_building_location(order.pickup, game_map)
+                })
         
         # Pedidos para ENTREGAR
-        for order in self.inventory:
+        for order in self.inventory.find_near("dropoff", position, radius):
             if not order.is_completed:
                 if order.check_expiration(current_time):
                     continue
                 
-                can_dropoff = self.is_near_location(order.dropoff, include_exact=True, radius=radius)
-                
-                if can_dropoff:
-                    distance = max(abs(self.grid_x - order.dropoff[0]), 
-                                abs(self.grid_y - order.dropoff[1]))
-                    interactable.append({
-                        'order': order,
-                        'action': 'dropoff',
-                        'location': order.dropoff,
-                        'is_exact': self.is_at_location(order.dropoff),
-                        'distance': distance,
-                        'is_building': self.is_building_location(order.dropoff, game_map)
-                    })
+                distance = max(abs(self.grid_x - order.dropoff[0]), 
+                            abs(self.grid_y - order.dropoff[1]))
+                interactable.append({
+                    'order': order,
+                    'action': 'dropoff',
+                    'location': order.dropoff,
+                    'is_exact': self.is_at_location(order.dropoff),
+                    'distance': distance,
+                    'is_building': self.is_building_location(order.dropoff, game_map)
+                })
         
         interactable.sort(key=lambda x: (not x['is_exact'], x['distance']))
         return interactable
 
     def is_building_location(self, location, game_map):
         x, y = location
-        if 0 <= y < len(game_map.tiles) and 0 <= x < len(game_map.tiles[0]):
-            tile_char = game_map.tiles[y][x]
-            return game_map.legend.get(tile_char, {}).get("blocked", False)
-        return False
+        return game_map.in_bounds(x, y) and game_map.is_blocked(x, y)
         
     def get_position(self):
         return (self.grid_x, self.grid_y)
@@ -446,9 +436,12 @@ class Player:
     def can_pickup_order(self, order: Order) -> bool:
         return self.current_weight + order.weight <= self.max_weight
     
-    def get_nearby_orders(self, orders, max_distance=1):  # O(n)
+    def get_nearby_orders(self, orders, max_distance=1):  # O(celdas del radio + k)
+        position = (self.grid_x, self.grid_y)
+        # La distancia Manhattan nunca es menor que la de Chebyshev: el índice
+        # espacial da los candidatos y aquí se filtran por Manhattan
         nearby_orders = []
-        for order in orders:
+        for order in orders.find_near(("pickup", "dropoff"), position, max_distance):
             pickup_dist = abs(self.grid_x - order.pickup[0]) + abs(self.grid_y - order.pickup[1])
             dropoff_dist = abs(self.grid_x - order.dropoff[0]) + abs(self.grid_y - order.dropoff[1])
             
@@ -463,7 +456,7 @@ class Player:
         screen_x = (self.grid_x - camera_x) * self.tile_size
         screen_y = (self.grid_y - camera_y) * self.tile_size
         
-        screen.blit(sprite, (screen_x, screen_y))
+        sprite_rect = screen.blit(sprite, (screen_x, screen_y))
         
         # Barra de stamina con color según estado
         bar_width = 20 * self.scale_factor
@@ -477,8 +470,19 @@ class Player:
         else:
             color = (0, 255, 0)  # Verde
         
-        pygame.draw.rect(screen, (100, 100, 100), 
+        bar_rect = pygame.draw.rect(screen, (100, 100, 100), 
                         (screen_x, screen_y - 10, bar_width, bar_height))
         
         pygame.draw.rect(screen, color, 
-                        (screen_x, screen_y - 10, bar_width * (self.stamina / 100), bar_height))
\ No newline at end of file
+                        (screen_x, screen_y - 10, bar_width * (self.stamina / 100), bar_height))
+        
+        return sprite_rect.union(bar_rect)
+
+    def get_interaction_key(self):
+        """Valores del jugador de los que dependen sus interacciones (casilla e inventario)"""
+        return (self.grid_x, self.grid_y, self.inventory.generation)
+
+    def get_render_key(self):
+        """Valores que determinan cómo se ve el jugador; si no cambian, no hace falta redibujarlo"""
+        sprite = self.sprite_sheet[self.direction][self.current_frame]
+        return (self.grid_x, self.grid_y, id(sprite), int(self.stamina), self.state)
\ No newline at end of file
@@ -7,6 +7,8 @@ import json
 import os
 from enum import Enum
 import math
+from entities.particles import ParticleSystem, ParticleSpriteAtlas
+import numpy as np
 
 class WeatherCondition(Enum):
     CLEAR = "clear"
@@ -45,12 +47,19 @@ class Weather:
         WeatherCondition.COLD: (150, 220, 255)
     }
     
-    def __init__(self, api_manager, transition_duration=3.0):
+    def __init__(self, api_manager, transition_duration=3.0, weather_data=None, particles_enabled=True,
+                 rng=None):
         self.api_manager = api_manager
         self.transition_duration = transition_duration
+        # Generador aleatorio propio (con semilla = clima reproducible). Las partículas
+        # usan uno derivado, para que dibujarlas o no dibujarlas no cambie el clima.
+        self.rng = rng or random.Random()
+        self.particle_rng = random.Random(self.rng.getrandbits(64))
+        # Sin partículas (simulaciones sin ventana) no se generan ni se pre-renderizan sprites
+        self.particles_enabled = particles_enabled
         
-        # Cargar datos del clima DESDE API O CACHÉ
-        self.weather_data = self.load_weather_data()
+        # Cargar datos del clima DESDE API O CACHÉ (salvo que ya vengan cargados)
+        self.weather_data = weather_data if weather_data is not None else self.load_weather_data()
         
         # Estado actual del clima
         initial_data = self.weather_data["data"]["initial"]
@@ -66,7 +75,7 @@ class Weather:
 
         self.burst_timer = 0
         self.transition_timer = 0
-        self.burst_duration = random.randint(45, 60)
+        self.burst_duration = self.rng.randint(45, 60)
         
         self.transition_matrix = self.weather_data["data"]["transition"]
         
@@ -75,8 +84,10 @@ class Weather:
         
         self.weather_history = []
         
-        self.particles = []
+        self.particles = ParticleSystem()
         self.particle_timer = 0
+        self.sprite_atlas = ParticleSpriteAtlas()
+        self.prepare_particle_sprites()
         
     def load_weather_data(self):
         """Carga los datos del clima desde la API o desde caché local"""
@@ -115,8 +126,9 @@ class Weather:
             self.change_weather()
         
         # Actualizar partículas
-        self.update_particles(dt)
-        self.spawn_particles(dt)
+        if self.particles_enabled:
+            self.update_particles(dt)
+            self.spawn_particles(dt)
     
     def complete_transition(self):
         """Completa la transición climática"""
@@ -124,6 +136,7 @@ class Weather:
         self.current_intensity = self.target_intensity
         self.current_multiplier = self.target_multiplier
         self.is_transitioning = False
+        self.prepare_particle_sprites()
         
         self.weather_history.append({
             "condition": self.current_condition.value,
@@ -134,7 +147,7 @@ class Weather:
     def change_weather(self):
         """Cambia el clima usando la cadena de Markov del JSON"""
         self.burst_timer = 0
-        self.burst_duration = random.randint(45, 60)
+        self.burst_duration = self.rng.randint(45, 60)
         
         # Obtener probabilidades de transición para el clima actual DEL JSON
         current_condition_str = self.current_condition.value
@@ -143,7 +156,7 @@ class Weather:
         if not transition_probs:
             self.target_condition = self.current_condition
         else:
-            rand_val = random.random()
+            rand_val = self.rng.random()
             cumulative_prob = 0
             selected_condition = None
             
@@ -159,7 +172,7 @@ class Weather:
             self.target_condition = WeatherCondition(selected_condition)
         
         # Establecer intensidad.
-        self.target_intensity = random.random()
+        self.target_intensity = self.rng.random()
         
 
         self.target_multiplier = self.SPEED_MULTIPLIERS[self.target_condition]
@@ -220,119 +233,163 @@ class Weather:
     
     def create_rain_particle(self):
         """Crea una partícula de lluvia"""
-        x = random.randint(0, 1920)
-        y = random.randint(-50, 0)
+        x = self.particle_rng.randint(0, 1920)
+        y = self.particle_rng.randint(-50, 0)
         
         # Ajustar velocidad según tipo de lluvia
         if self.current_condition == WeatherCondition.STORM:
-            vx = random.uniform(-3, -2)  # Más viento en tormenta
-            vy = random.uniform(500, 700)  # Más rápido en tormenta
-            life = random.uniform(1.5, 3)
-            length = random.randint(10, 18)
+            vx = self.particle_rng.uniform(-3, -2)  # Más viento en tormenta
+            vy = self.particle_rng.uniform(500, 700)  # Más rápido en tormenta
+            life = self.particle_rng.uniform(1.5, 3)
+            length = self.particle_rng.randint(10, 18)
         elif self.current_condition == WeatherCondition.RAIN:
-            vx = random.uniform(-1.5, -0.5)
-            vy = random.uniform(350, 450)
-            life = random.uniform(2, 4)
-            length = random.randint(6, 12)
+            vx = self.particle_rng.uniform(-1.5, -0.5)
+            vy = self.particle_rng.uniform(350, 450)
+            life = self.particle_rng.uniform(2, 4)
+            length = self.particle_rng.randint(6, 12)
         else:  # RAIN_LIGHT
-            vx = random.uniform(-1, 0)
-            vy = random.uniform(250, 350)
-            life = random.uniform(3, 5)
-            length = random.randint(4, 8)
+            vx = self.particle_rng.uniform(-1, 0)
+            vy = self.particle_rng.uniform(250, 350)
+            life = self.particle_rng.uniform(3, 5)
+            length = self.particle_rng.randint(4, 8)
         
-        self.particles.append([x, y, vx, vy, life, length, "rain"])
+        self.particles.spawn("rain", x, y, vx, vy, life, length)
     
     def create_snow_particle(self):
         """Crea una partícula de nieve"""
-        x = random.randint(0, 1920)
-        y = random.randint(-50, 0)
-        vx = random.uniform(-25, 25)  
-        vy = random.uniform(20, 40)   
-        life = random.uniform(6, 10)  
-        size = random.uniform(2.0, 4.0)  
-        
-        self.particles.append([x, y, vx, vy, life, size, "snow"])
+        x = self.particle_rng.randint(0, 1920)
+        y = self.particle_rng.randint(-50, 0)
+        vx = self.particle_rng.uniform(-25, 25)  
+        vy = self.particle_rng.uniform(20, 40)   
+        life = self.particle_rng.uniform(6, 10)  
+        size = self.particle_rng.uniform(2.0, 4.0)  
+        
+        self.particles.spawn("snow", x, y, vx, vy, life, size)
     
     def create_fog_particle(self):
         """Crea una partícula de niebla"""
-        x = random.randint(0, 1920)
-        y = random.randint(0, 1080)
-        vx = random.uniform(-10, 10)   
-        vy = random.uniform(-3, 3)     
-        life = random.uniform(4, 8)    
-        size = random.randint(40, 80)  
-        alpha = random.randint(15, 35) 
-        
-        self.particles.append([x, y, vx, vy, life, size, alpha, "fog"])
+        x = self.particle_rng.randint(0, 1920)
+        y = self.particle_rng.randint(0, 1080)
+        vx = self.particle_rng.uniform(-10, 10)   
+        vy = self.particle_rng.uniform(-3, 3)     
+        life = self.particle_rng.uniform(4, 8)    
+        size = self.particle_rng.randint(40, 80)  
+        alpha = self.particle_rng.randint(15, 35) 
+        
+        self.particles.spawn("fog", x, y, vx, vy, life, size, alpha)
     
     def create_wind_particle(self):
         """Crea una partícula de viento (líneas)"""
-        x = random.randint(-100, 0)
-        y = random.randint(0, 1080)
-        vx = random.uniform(250, 400) 
-        vy = random.uniform(-15, 15)   
-        life = random.uniform(0.8, 1.5) 
-        length = random.randint(25, 50) 
-        
-        self.particles.append([x, y, vx, vy, life, length, "wind"])
+        x = self.particle_rng.randint(-100, 0)
+        y = self.particle_rng.randint(0, 1080)
+        vx = self.particle_rng.uniform(250, 400) 
+        vy = self.particle_rng.uniform(-15, 15)   
+        life = self.particle_rng.uniform(0.8, 1.5) 
+        length = self.particle_rng.randint(25, 50) 
+        
+        self.particles.spawn("wind", x, y, vx, vy, life, length)
     
     def update_particles(self, dt):
-        """Actualiza todas las partículas"""
-        particles_to_keep = []
-        
-        for particle in self.particles:
-            # Actualizar posición
-            particle[0] += particle[2] * dt
-            particle[1] += particle[3] * dt
-            particle[4] -= dt  
-            
-            if particle[4] > 0 and -200 < particle[0] < 2120 and -200 < particle[1] < 1280:
-                particles_to_keep.append(particle)
-        
-        self.particles = particles_to_keep
+        """Actualiza todas las partículas (por tipo, sin reconstruir listas)"""
+        self.particles.update(dt)
+    
+    def has_visible_particles(self):
+        """Indica si draw_particles dibujaría algo en este frame"""
+        return bool(self.particles) and self.current_condition != WeatherCondition.CLEAR
+    
+    def get_rain_color(self):
+        if self.current_condition in [WeatherCondition.RAIN, WeatherCondition.STORM]:
+            return (100, 100, 255)
+        return (150, 150, 255)  # RAIN_LIGHT
+    
+    def prepare_particle_sprites(self):
+        """Pre-renderiza los sprites de las partículas que genera el clima actual"""
+        if not self.particles_enabled:
+            return
+        condition = self.current_condition
+        if condition in [WeatherCondition.RAIN_LIGHT, WeatherCondition.RAIN, WeatherCondition.STORM]:
+            lengths = {WeatherCondition.STORM: range(10, 19),
+                       WeatherCondition.RAIN: range(6, 13),
+                       WeatherCondition.RAIN_LIGHT: range(4, 9)}[condition]
+            color = self.get_rain_color()
+            self.sprite_atlas.prebake("rain", [(length, dx, color) for length in lengths for dx in (-1, 0)])
+        elif condition == WeatherCondition.COLD:
+            self.sprite_atlas.prebake("snow", [(radius,) for radius in range(2, 5)])
+        elif condition == WeatherCondition.FOG:
+            sizes = range(40, 81, self.sprite_atlas.FOG_SIZE_STEP)
+            alphas = range(15, 36, self.sprite_atlas.FOG_ALPHA_STEP)
+            self.sprite_atlas.prebake("fog", [(size, alpha) for size in sizes for alpha in alphas])
+        elif condition == WeatherCondition.WIND:
+            self.sprite_atlas.prebake("wind", [(length, (220, 220, 255)) for length in range(25, 51)])
     
     def draw_particles(self, screen, camera_x, camera_y):
-        """Dibuja todas las partículas - VERSIÓN MEJORADA"""
+        """Dibuja todas las partículas con una sola llamada a blits() y retorna los rectángulos modificados"""
         if self.current_condition == WeatherCondition.CLEAR:
-            return
-        
-        for particle in self.particles:
-            x = particle[0] - camera_x
-            y = particle[1] - camera_y
-            
-            # Solo dibujar si está en pantalla
-            if -100 < x < screen.get_width() + 100 and -100 < y < screen.get_height() + 100:
-                particle_type = particle[-1]  # Último elemento es el tipo
-                
-                if particle_type == "rain":
-                    length = particle[5]
-                    if self.current_condition == WeatherCondition.STORM:
-                        color = (100, 100, 255)   
-                    elif self.current_condition == WeatherCondition.RAIN:
-                        color = (100, 100, 255) 
-                    else:  # RAIN_LIGHT
-                        color = (150, 150, 255) 
-                    
-                    pygame.draw.line(screen, color, (int(x), int(y)), 
-                                   (int(x + particle[2]*0.1), int(y + length)), 2)
-                
-                elif particle_type == "snow":
-                    size = int(particle[5])
-                    if size > 0:
-                        pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), size)
-                
-                elif particle_type == "fog":
-                    if len(particle) >= 8:
-                        size = particle[5]
-                        alpha = particle[6]
-                        fog_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-                        pygame.draw.circle(fog_surface, (200, 200, 220, alpha), (size, size), size)
-                        screen.blit(fog_surface, (int(x - size), int(y - size)))
-                
-                elif particle_type == "wind":
-                    length = particle[5]
-                    pygame.draw.line(screen, (220, 220, 255), (int(x), int(y)), 
-                                   (int(x + length), int(y)), 2)
+            return []
+        
+        # Solo se dibujan las partículas dentro de la pantalla (con margen)
+        bounds = (camera_x - 100, camera_x + screen.get_width() + 100,
+                  camera_y - 100, camera_y + screen.get_height() + 100)
+        pools = self.particles.pools
+        blit_sequence = []
+        
+        pool = pools["rain"]
+        if pool.count:
+            visible = pool.visible(*bounds)
+            screen_x = pool.x[visible] - camera_x
+            screen_y = pool.y[visible] - camera_y
+            x = screen_x.astype(int)
+            y = screen_y.astype(int)
+            # Desplazamiento del extremo de la gota, truncado igual que las coordenadas
+            dx = (screen_x + pool.vx[visible] * 0.1).astype(int) - x
+            lengths = (screen_y + pool.size[visible]).astype(int) - y
+            codes = lengths * 8 + dx + 4
+            color = self.get_rain_color()
+            self.add_sprite_blits(blit_sequence, "rain", x, y, codes,
+                                  lambda code: (code // 8, code % 8 - 4, color))
+        
+        pool = pools["snow"]
+        if pool.count:
+            visible = pool.visible(*bounds)
+            radii = pool.size[visible].astype(int)
+            visible = visible[radii > 0]
+            x = (pool.x[visible] - camera_x).astype(int)
+            y = (pool.y[visible] - camera_y).astype(int)
+            self.add_sprite_blits(blit_sequence, "snow", x, y, radii[radii > 0],
+                                  lambda code: (code,))
+        
+        pool = pools["fog"]
+        if pool.count:
+            visible = pool.visible(*bounds)
+            sizes, alphas = self.sprite_atlas.fog_bucket(pool.size[visible].astype(int),
+                                                         pool.alpha[visible].astype(int))
+            x = (pool.x[visible] - camera_x).astype(int)
+            y = (pool.y[visible] - camera_y).astype(int)
+            self.add_sprite_blits(blit_sequence, "fog", x, y, sizes * 256 + alphas,
+                                  lambda code: (code // 256, code % 256))
+        
+        pool = pools["wind"]
+        if pool.count:
+            visible = pool.visible(*bounds)
+            screen_x = pool.x[visible] - camera_x
+            x = screen_x.astype(int)
+            y = (pool.y[visible] - camera_y).astype(int)
+            lengths = (screen_x + pool.size[visible]).astype(int) - x
+            self.add_sprite_blits(blit_sequence, "wind", x, y, lengths,
+                                  lambda code: (code, (220, 220, 255)))
+        
+        if not blit_sequence:
+            return []
+        return screen.blits(blit_sequence)
+    
+    def add_sprite_blits(self, blit_sequence, kind, x, y, codes, key_for_code):
+        """Agrega a la secuencia de blits el sprite de cada partícula según su código"""
+        sprites = {code: self.sprite_atlas.get(kind, key_for_code(code))
+                   for code in np.unique(codes).tolist()}
+        append = blit_sequence.append
+        for sprite_x, sprite_y, code in zip(x.tolist(), y.tolist(), codes.tolist()):
+            surface, offset_x, offset_y = sprites[code]
+            append((surface, (sprite_x + offset_x, sprite_y + offset_y)))
     
     def draw(self, screen, x, y):
         """Dibuja un indicador del clima actual"""
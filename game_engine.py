@@ -2,11 +2,13 @@ import pygame
 from datetime import datetime
 from entities.player import Player
 from ui.map import Map
-from api.api_manager import APIManager
+from ui.map_renderer import create_map_renderer
+from ui.dirty_rects import DirtyRectTracker
+from api.api_manager import APIManager, LoadCancelled
 from entities.weather import Weather
 from core.game_time import GameTime
 from entities.order_list import OrderList
-from entities.order import Order
+from entities.order import Order, format_game_seconds
 from ui.ui_manager import UIManager
 from utils.interaction_manager import InteractionManager
 from core.game_state import GameState
@@ -19,26 +21,74 @@ from utils.save_load_manager import SaveLoadManager
 from datetime import timedelta
 from ui.order_popup_manager import OrderPopupManager
 from utils.score_manager import score_manager
+from ui.headless_ui import HeadlessUI
+from ui.loading_screen import LoadingScreen
+from core.input_controller import KeyboardInput, ScriptedInput
+from core.clock import RealTimeClock, VirtualClock
+from core.order_scheduler import ExpirationScheduler, ReleaseScheduler
+from core.pathfinding import PathFinder
+from core.travel_matrix import TravelMatrix
+from core.route_planner import RoutePlanner
+import contextlib
+import random
     
 class GameEngine:
     """Motor principal del juego que coordina todos los sistemas"""
     
-    def __init__(self, load_slot=None):
+    # Tamaño máximo del área visible del mapa; ciudades más grandes usan la cámara
+    MAX_VIEWPORT_WIDTH = 1280
+    MAX_VIEWPORT_HEIGHT = 900
+    
+    # Paso fijo (segundos) de la simulación sin ventana
+    HEADLESS_TIME_STEP = 0.1
+
+    # Rutas evaluadas como máximo por planificación (determinista: bots y repeticiones)
+    ROUTE_MAX_ITERATIONS = 2000
+    # Segundos reales para la sugerencia interactiva de ruta (tecla R)
+    ROUTE_SUGGESTION_BUDGET = 0.005
+    
+    def __init__(self, load_slot=None, dirty_rects=False, headless=False, game_data=None,
+                 input_controller=None, time_step=None, clock=None, seed=None, compact_orders=False):
+        # Modo sin ventana: sin pantalla, sprites ni fuentes; el tiempo avanza a paso fijo
+        self.headless = headless
+        self.record_scores = not headless
+        self.time_step = time_step or self.HEADLESS_TIME_STEP
+        if clock is None:
+            clock = VirtualClock(self.time_step) if headless else RealTimeClock()
+        self.game_clock = clock
+        
+        # Misma semilla + mismo registro de entrada = misma partida
+        self.seed = seed
+        self.rng = random.Random(seed)
+        
+        # Pedidos en un OrderTable columnar (feeds muy grandes)
+        self.compact_orders = compact_orders
+        if input_controller is None:
+            input_controller = ScriptedInput() if headless else KeyboardInput()
+        self.input_controller = input_controller
+        
         pygame.init()
-        try:
-            pygame.font.init()
-            test_font = pygame.font.Font(None, 16)
-        except:
-            print("Error inicializando fuentes de Pygame")
+        if not headless:
+            try:
+                pygame.font.init()
+                test_font = pygame.font.Font(None, 16)
+            except:
+                print("Error inicializando fuentes de Pygame")
         from utils.setup_directories import setup_directories
         setup_directories()
         
-        from utils.score_manager import score_manager
-        score_manager.initialize_score_system()
+        if self.record_scores:
+            from utils.score_manager import score_manager
+            score_manager.initialize_score_system()
         
         # Configuración inicial
         self.api = APIManager()
-        self.setup_game_data()
+        if game_data:
+            self.map_data = game_data["map_data"]
+            self.jobs_data = game_data["jobs_data"]
+            self.weather_data = game_data["weather_data"]
+        else:
+            self.setup_game_data()
         
         # Crear sistemas principales
         self.game_state = GameState()
@@ -55,19 +105,41 @@ class GameEngine:
             self.setup_game_objects()
         
         self.setup_managers()
-        from ui.pause_menu import PauseMenu
-        self.pause_menu = PauseMenu(self.screen, self.save_manager)
+        if headless:
+            self.pause_menu = None
+        else:
+            from ui.pause_menu import PauseMenu
+            self.pause_menu = PauseMenu(self.screen, self.save_manager)
+        
+        # Modo opcional de rectángulos sucios: solo se actualizan las regiones que cambiaron
+        self.dirty_rect_mode = dirty_rects
+        self.dirty_tracker = DirtyRectTracker()
+        self._scene_layout_key = None
+        self._scene_actor_key = None
+        self._particles_drawn = False
         
         self.running = True
         self.clock = pygame.time.Clock()
-        self.last_time = pygame.time.get_ticks()
+        self.last_time = self.game_clock.now()
     def setup_game_data(self):
-        """Carga datos iniciales de la API o caché local - VERSIÓN SIMPLIFICADA"""
+        """Carga datos iniciales de la API o caché local.
+
+        Los tres endpoints se descargan en paralelo; si ya hay ventana (menú
+        principal) se muestra una pantalla de carga mientras tanto.
+        """
+        on_progress = None
+        screen = None if self.headless else pygame.display.get_surface()
+        if screen is not None:
+            on_progress = LoadingScreen(screen).draw
         try:
-            self.map_data = self.api.get_map_data()
-            self.jobs_data = self.api.get_jobs()
-            self.weather_data = self.api.get_weather()
+            game_data = self.api.fetch_game_data(on_progress)
+            self.map_data = game_data["map_data"]
+            self.jobs_data = game_data["jobs_data"]
+            self.weather_data = game_data["weather_data"]
             print("Datos cargados correctamente")
+        except LoadCancelled:
+            print("Carga cancelada: se cerró la ventana")
+            raise
         except Exception as e:
             print(f"Error crítico: No se pudieron cargar los datos: {e}")
             raise Exception("No se pueden cargar datos y no hay respaldo disponible")
@@ -101,10 +173,21 @@ class GameEngine:
         """Configura la pantalla y elementos visuales"""
         self.game_map = Map(self.map_data, tile_size=20)
         self.rows, self.cols = self.game_map.height, self.game_map.width
-        self.screen_width = self.cols * self.game_map.tile_size + 300
-        self.screen_height = self.rows * self.game_map.tile_size
+        # Rutas y tiempos de viaje reales (edificios y superficies) sobre el mapa
+        self.pathfinder = PathFinder(self.game_map)
+        self.screen_width = min(self.cols * self.game_map.tile_size, self.MAX_VIEWPORT_WIDTH) + 300
+        self.screen_height = min(self.rows * self.game_map.tile_size, self.MAX_VIEWPORT_HEIGHT)
+        if self.headless:
+            self.screen = None
+            self.map_renderer = None
+            return
+        
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("Courier Quest")
+        
+        # Capa estática del mapa: completa en mapas pequeños, por bloques en ciudades grandes
+        self.map_renderer = create_map_renderer(self.game_map)
+        self.map_renderer.ensure_built()
     
     def setup_game_objects(self, loaded_data=None):
         """Crea los objetos principales del juego"""
@@ -115,12 +198,68 @@ class GameEngine:
         else:
             # Configuración inicial nueva partidal
             self.setup_new_game()
+        self.schedule_order_releases()
+        self.schedule_order_expirations()
+        self.precompute_travel_times()
+    
+    def precompute_travel_times(self):
+        """Tiempos de viaje entre todos los puntos de recogida y entrega del feed (caché en api_cache)"""
+        self.travel_matrix = TravelMatrix(self.pathfinder)
+        self.travel_matrix.add_orders(self.all_orders)
+        self.travel_matrix.add_orders(self.player.inventory)
+        self.travel_matrix.save()
+        self.route_planner = RoutePlanner(self.travel_matrix, time_scale=self.game_time.time_scale)
+    
+    def save_travel_times(self):
+        """Guarda los tiempos de viaje calculados durante el turno (fuera del bucle de frames)"""
+        self.travel_matrix.save()
+    
+    def get_route_candidates(self):
+        """Pedidos aceptados que todavía se pueden ir a recoger"""
+        return [order for order in self.active_orders
+                if not (order.is_expired or order.is_completed or order.is_in_inventory)]
+    
+    def plan_route(self, extra_orders=(), budget=None):
+        """Ruta sugerida para el inventario y los pedidos activos (más extra_orders).
+
+        Sin budget la búsqueda se limita a ROUTE_MAX_ITERATIONS rutas, así el
+        resultado no depende de la velocidad de la máquina (bots, simulador y
+        repeticiones); budget (segundos reales) es solo para la sugerencia interactiva.
+        """
+        player = self.player
+        max_iterations = self.ROUTE_MAX_ITERATIONS if budget is None else None
+        return self.route_planner.plan(
+            (player.grid_x, player.grid_y), self.game_time.get_current_game_seconds(),
+            player.inventory, self.get_route_candidates() + list(extra_orders),
+            load=player.current_weight, capacity=player.max_weight, budget=budget,
+            max_iterations=max_iterations)
+    
+    def show_route_suggestion(self):
+        plan = self.plan_route(budget=self.ROUTE_SUGGESTION_BUDGET)
+        if plan.stops:
+            self.ui_manager.show_message(f"Ruta: {plan.describe()}", 5)
+        else:
+            self.ui_manager.show_message("No hay pedidos para planificar", 2)
+    
+    def schedule_order_releases(self):
+        """Programa en el montículo de liberaciones los pedidos pendientes"""
+        self.release_scheduler = ReleaseScheduler()
+        for order in self.pending_orders:
+            self.release_scheduler.schedule(order)
+    
+    def schedule_order_expirations(self):
+        """Programa en el montículo de deadlines los pedidos activos y los del inventario"""
+        self.expiration_scheduler = ExpirationScheduler()
+        for order in self.active_orders:
+            self.expiration_scheduler.schedule(order)
+        for order in self.player.inventory:
+            self.expiration_scheduler.schedule(order)
     
     def setup_new_game(self):
         """Configura una nueva partida desde cero"""
         game_start_datetime = self.get_game_start_time_from_json()
 
-        self.all_orders = OrderList.from_api_response(self.jobs_data)  # Todos los pedidos
+        self.all_orders = OrderList.from_api_response(self.jobs_data, compact=self.compact_orders)  # Todos los pedidos
         self.active_orders = OrderList.create_empty()  # Pedidos activos (liberados)
         self.pending_orders = OrderList.create_empty()  # Pedidos pendientes de liberar
         self.completed_orders = OrderList.create_empty()
@@ -136,17 +275,20 @@ class GameEngine:
         
         # Crear jugador
         self.player = Player(self.cols // 2, self.rows // 2, 
-                        self.game_map.tile_size, self.game_map.legend)
+                        self.game_map.tile_size, self.game_map.legend,
+                        load_sprites=not self.headless)
 
         # Crear tiempo de juego 
         self.game_time = GameTime(
             total_duration_min=15,
             game_start_time=game_start_datetime,  # Hora del JSON
-            time_scale=1.0  # ← ESCALA TEMPORAL (Modificar el parámetro si quiere correrlo 1s real = xs juego)
+            time_scale=1.0,  # ← ESCALA TEMPORAL (Modificar el parámetro si quiere correrlo 1s real = xs juego)
+            clock=self.game_clock
         )
         self.game_time.start()
 
-        self.weather_system = Weather(self.api)
+        self.weather_system = Weather(self.api, weather_data=self.weather_data,
+                                      particles_enabled=not self.headless, rng=self.rng)
         
         self.income_goal = self.map_data.get("goal", 1500)
         self.game_state.set_income_goal(self.income_goal)
@@ -185,28 +327,35 @@ class GameEngine:
         return order
     
     def update_order_expirations(self):
-        """Actualiza el estado de expiración de todos los pedidos activos - CORREGIDO"""
-        current_game_time = self.game_time.get_current_game_time()
+        """Expira los pedidos vencidos; solo se revisan los que saca el montículo de deadlines - O(k log n)"""
+        current_seconds = self.game_time.get_current_game_seconds()
         
         expired_orders = []
         
-        # 1. Pedidos activos
-        for order in list(self.active_orders): 
-            if not order.is_in_inventory and not order.is_completed:
-                if order.check_expiration(current_game_time):
-                    expired_orders.append(order)
-                    print(f"Pedido {order.id} EXPIRADO (no recogido) a las {current_game_time.strftime('%H:%M:%S')}")
-        
-        # 2. Pedidos en inventario
-        for order in list(self.player.inventory):
-            if order.is_in_inventory and not order.is_completed:
-                if order.check_expiration(current_game_time):
-                    expired_orders.append(order)
-                    print(f"Pedido {order.id} EXPIRADO (no entregado) a las {current_game_time.strftime('%H:%M:%S')}")
+        for order in self.expiration_scheduler.pop_expired(current_seconds):
+            # Borrado perezoso: los entregados o cancelados ya no están en ninguna lista
+            if order.is_completed:
+                continue
+            if order.is_in_inventory:
+                if order.id not in self.player.inventory:
+                    continue
+                state = "no entregado"
+            else:
+                if order.id not in self.active_orders:
+                    continue
+                state = "no recogido"
+            
+            if order.check_expiration(current_seconds):
+                expired_orders.append(order)
+                print(f"Pedido {order.id} EXPIRADO ({state}) a las {format_game_seconds(current_seconds)}")
+            else:
+                self.expiration_scheduler.schedule(order)
         
         # Procesar pedidos expirados
-        for expired_order in expired_orders:
-            self.handle_expired_order(expired_order, current_game_time)
+        if expired_orders:
+            current_game_time = self.game_time.get_current_game_time()
+            for expired_order in expired_orders:
+                self.handle_expired_order(expired_order, current_game_time)
 
     def handle_expired_order(self, order, current_time):
         """Maneja las consecuencias de un pedido expirado"""
@@ -314,7 +463,7 @@ class GameEngine:
                         pass
                 print(f"{len(self.all_orders)} pedidos base cargados")
             else:
-                self.all_orders = OrderList.from_api_response(self.jobs_data)
+                self.all_orders = OrderList.from_api_response(self.jobs_data, compact=self.compact_orders)
                 print(f"No hay all_orders en guardado, recreando desde API: {len(self.all_orders)} pedidos")
             
             
@@ -361,7 +510,8 @@ class GameEngine:
                 player_data["grid_x"],
                 player_data["grid_y"], 
                 self.game_map.tile_size, 
-                self.game_map.legend
+                self.game_map.legend,
+                load_sprites=not self.headless
             )
             
             # Restaurar propiedades del jugador
@@ -432,12 +582,11 @@ class GameEngine:
             self.game_time = GameTime(
                 total_duration_min=total_duration/60,
                 game_start_time=game_start_time,
-                time_scale=time_scale
+                time_scale=time_scale,
+                clock=self.game_clock
             )
             
-            
-            import pygame
-            current_pygame_time = pygame.time.get_ticks() / 1000.0
+            current_pygame_time = self.game_clock.now()
             
             
             if "pygame_start_time" in game_time_data and "start_real_time" in game_time_data:
@@ -456,7 +605,8 @@ class GameEngine:
             print(f"Tiempo restaurado: {elapsed_time:.1f}s transcurridos de {total_duration}s totales")
             
             weather_data = save_data["weather_state"]
-            self.weather_system = Weather(self.api)
+            self.weather_system = Weather(self.api, weather_data=self.weather_data,
+                                          particles_enabled=not self.headless, rng=self.rng)
             
             # Configurar clima actual
             try:
@@ -614,35 +764,34 @@ class GameEngine:
             return False
     
     def update_release_times(self, dt):
-        """Libera pedidos según su release_time"""
+        """Libera pedidos según su release_time (montículo + cola de espera del popup)"""
         current_game_time_elapsed = self.game_time.get_elapsed_game_time()  
+        scheduler = self.release_scheduler
         
-        orders_to_release = []
-        remaining_orders = OrderList.create_empty()
-        
-        while not self.pending_orders.is_empty():
-            order = self.pending_orders.dequeue()
-            
-            if current_game_time_elapsed  >= order.release_time:
-                orders_to_release.append(order)
-                self.ui_manager.show_message(f"Nuevo pedido: {order.id}", 3)
-            else:
-                remaining_orders.enqueue(order)
+        # Nada que liberar ni esperando: no se hace ningún trabajo en este frame
+        time_to_release = scheduler.next_release_in(current_game_time_elapsed)
+        if time_to_release is None or time_to_release > 0:
+            return
         
-        self.pending_orders = remaining_orders
-
-        for order in orders_to_release:
-            if not self.popup_manager.is_popup_active():  # Solo si no hay popup activo
-                self.popup_manager.show_new_order_popup(order)
-                break  
-            else:
-                order.release_time = current_game_time_elapsed  + 5
-                self.pending_orders.enqueue(order)
+        for order in scheduler.release_due(current_game_time_elapsed):
+            self.ui_manager.show_message(f"Nuevo pedido: {order.id}", 3)
+            # Pedidos que no venían en el feed solo agregan sus filas y columnas;
+            # se guardan en disco al terminar el turno (save_travel_times)
+            self.travel_matrix.add_order(order)
+        
+        # Los pedidos liberados siguen en pending_orders hasta que se muestra su popup
+        if scheduler.waiting and not self.popup_manager.is_popup_active():
+            order = scheduler.pop_waiting()
+            self.pending_orders.remove_by_id(order.id)
+            self.popup_manager.show_new_order_popup(order)
           
     
     def setup_managers(self):
         """Configura los managers del juego"""
-        self.ui_manager = UIManager(self.screen, self.game_map, self.screen_width, self.screen_height)
+        if self.headless:
+            self.ui_manager = HeadlessUI()
+        else:
+            self.ui_manager = UIManager(self.screen, self.game_map, self.screen_width, self.screen_height)
         self.interaction_manager = InteractionManager(self.player, self.active_orders, self.completed_orders, self.game_time)
         
         self.ui_manager.interaction_manager = self.interaction_manager
@@ -677,20 +826,7 @@ class GameEngine:
                 continue
             
             popup_result = self.popup_manager.handle_event(event, self, self.player, self.active_orders)
-            if popup_result:
-                message = popup_result.get("message", "")
-                if message:
-                    self.ui_manager.show_message(message, 3)
-
-                penalty = popup_result.get("penalty")
-                if penalty:
-                    old_reputation = self.player.reputation
-                    self.player.reputation = max(0, self.player.reputation - penalty)
-                    
-
-                    if (popup_result.get("type") == "cancel_order" and 
-                        popup_result.get("result") == "confirmed"):
-                        print(f"Cancelación confirmada - Total cancelaciones: {self.game_state.orders_cancelled}")        
+            self.apply_popup_result(popup_result)
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:  # Click derecho
                 mouse_x, mouse_y = pygame.mouse.get_pos()
@@ -733,6 +869,9 @@ class GameEngine:
                 elif event.key == pygame.K_o:  # Tecla O para deadline
                     self.player.reorganize_inventory_by_deadline()
                     self.ui_manager.show_message("Inventario ordenado por URGENCIA", 2)                
+                
+                elif event.key == pygame.K_r:  # Tecla R para sugerir ruta
+                    self.show_route_suggestion()
             
             # Delegar eventos a los managers apropiados
             self.ui_manager.handle_event(event, self.active_orders, self.player)
@@ -744,6 +883,48 @@ class GameEngine:
             if not self.game_state.game_over and not self.pause_menu.active:
                 self.undo_manager.save_game_state(self)   
 
+    def apply_popup_result(self, popup_result):
+        """Aplica el mensaje y la penalización que retorna un popup"""
+        if not popup_result:
+            return
+        
+        message = popup_result.get("message", "")
+        if message:
+            self.ui_manager.show_message(message, 3)
+
+        if popup_result.get("type") == "accept_order" and popup_result.get("result") == "accepted":
+            self.expiration_scheduler.schedule(popup_result["order"])
+
+        penalty = popup_result.get("penalty")
+        if penalty:
+            old_reputation = self.player.reputation
+            self.player.reputation = max(0, self.player.reputation - penalty)
+            
+
+            if (popup_result.get("type") == "cancel_order" and 
+                popup_result.get("result") == "confirmed"):
+                print(f"Cancelación confirmada - Total cancelaciones: {self.game_state.orders_cancelled}")        
+
+    def apply_action(self, action):
+        """Ejecuta una acción de juego sin eventos de pygame (entrada programada)"""
+        if action == "interact":
+            if self.interaction_manager.interaction_cooldown <= 0:
+                self.interaction_manager.handle_interaction(self.game_state, self.game_map)
+        elif action == "accept":
+            if self.popup_manager.popup_active:
+                self.apply_popup_result(self.popup_manager.accept_order(self.game_state, self.player, self.active_orders))
+        elif action == "reject":
+            if self.popup_manager.popup_active:
+                self.apply_popup_result(self.popup_manager.reject_order(self))
+        elif action == "sort_priority":
+            self.player.reorganize_inventory_by_priority()
+        elif action == "sort_deadline":
+            self.player.reorganize_inventory_by_deadline()
+        elif action == "suggest_route":
+            self.show_route_suggestion()
+        else:
+            print(f"Acción desconocida: {action}")
+
     def handle_pause_result(self, result):
         """Maneja las acciones del menú de pausa"""
         action = result.get("action")
@@ -760,8 +941,7 @@ class GameEngine:
 
     def handle_inventory_right_click(self, mouse_x, mouse_y):
         """Maneja cancelación de pedidos desde el inventario con click derecho"""
-        cols = self.game_map.width
-        x_offset = cols * self.game_map.tile_size
+        x_offset = self.ui_manager.sidebar_x
         
         if mouse_x > x_offset:  # Está en el sidebar
             # Calcular qué pedido del inventario fue clickeado
@@ -807,27 +987,11 @@ class GameEngine:
         self.player.update_movement(dt, weather_stamina_consumption)
         
         if not self.player.is_moving:
-            keys = pygame.key.get_pressed()
-            dx, dy = 0, 0
-            
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                dx = -1
-            elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                dx = 1
-            elif keys[pygame.K_UP] or keys[pygame.K_w]:
-                dy = -1
-            elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
-                dy = 1
+            dx, dy = self.input_controller.get_movement(self)
             
             if dx != 0 or dy != 0:
-                tile_x, tile_y = self.player.grid_x, self.player.grid_y
-                if 0 <= tile_y < len(self.game_map.tiles) and 0 <= tile_x < len(self.game_map.tiles[0]):
-                    tile_char = self.game_map.tiles[tile_y][tile_x]
-                    surface_multiplier = self.game_map.legend[tile_char].get("surface_weight", 1.0)
-                else:
-                    surface_multiplier = 1.0
-
-                self.player.try_move(dx, dy, self.game_map.tiles, weather_multiplier, surface_multiplier)
+                surface_multiplier = self.game_map.surface_weight(self.player.grid_x, self.player.grid_y)
+                self.player.try_move(dx, dy, self.game_map, weather_multiplier, surface_multiplier)
     
     def update_camera(self):
         """Actualiza la posición de la cámara - USAR POSICIÓN VISUAL"""
@@ -921,11 +1085,6 @@ class GameEngine:
             if not self.game_state.game_over:
                 print("El juego no ha terminado, no se puede guardar puntuación")
                 return
-                
-            from utils.score_manager import score_manager
-            
-            if not score_manager.initialized:
-                score_manager.initialize_score_system()
             
             # USAR TIEMPO DE JUEGO REAL
             game_duration = self.game_time.get_elapsed_game_time()
@@ -956,7 +1115,14 @@ class GameEngine:
             else:
                 print(f"Sin cancelaciones - Sin penalización")
 
-
+            # Las simulaciones sin ventana no escriben en la tabla de puntuaciones
+            if not self.record_scores:
+                return
+            
+            from utils.score_manager import score_manager
+            
+            if not score_manager.initialized:
+                score_manager.initialize_score_system()
             
             success = score_manager.add_score(
                 self.game_state, 
@@ -977,20 +1143,23 @@ class GameEngine:
 
     def render(self):
         """Renderiza todos los elementos del juego"""
+        if self.dirty_rect_mode and self.can_render_dirty():
+            self.render_dirty()
+            return
+        
         self.screen.fill((255, 255, 255))
         
         # Dibujar juego normal
         self.render_map()
-        self.weather_system.draw_particles(self.screen, self.camera_x, self.camera_y)
-        self.ui_manager.draw_order_markers(self.active_orders, self.player, self.camera_x, self.camera_y)
-        self.player.draw(self.screen, self.camera_x, self.camera_y)
+        dynamic_rects = self.render_world_objects()
         
         pending_count = len(self.pending_orders)
-        self.ui_manager.draw_sidebar(self.player, self.active_orders, self.weather_system, 
+        self.ui_manager.draw_sidebar_panel(self.player, self.active_orders, self.weather_system, 
                                 self.game_time, self.game_state, pending_count)
+        dynamic_rects.append(self.ui_manager.draw_controls_overlay())
         
-        self.ui_manager.draw_messages()
-        self.ui_manager.draw_interaction_hints(self.player, self.active_orders, self.camera_x, self.camera_y, self.game_map)
+        dynamic_rects.append(self.ui_manager.draw_messages())
+        dynamic_rects.append(self.ui_manager.draw_interaction_hints(self.camera_x, self.camera_y, self.game_map))
         
         if self.game_state.game_over:
             self.ui_manager.draw_game_over_screen(self.game_state)
@@ -1003,31 +1172,159 @@ class GameEngine:
         
         pygame.display.flip()
         
+        if self.dirty_rect_mode:
+            self.dirty_tracker.full_frame_drawn(dynamic_rects, overlays_active=self.has_active_overlay())
+            self.ui_manager.request_sidebar_redraw()
+            self._scene_layout_key = self.get_scene_layout_key()
+            self._scene_actor_key = self.get_scene_actor_key()
+            self._particles_drawn = self.weather_system.has_visible_particles()
+    
+    def render_world_objects(self):
+        """Dibuja partículas, marcadores y jugador; retorna las regiones que cambian cada frame"""
+        dynamic_rects = self.weather_system.draw_particles(self.screen, self.camera_x, self.camera_y)
+        self.ui_manager.draw_order_markers(self.active_orders, self.player, self.camera_x, self.camera_y)
+        dynamic_rects.append(self.player.draw(self.screen, self.camera_x, self.camera_y))
+        return dynamic_rects
+    
+    def has_active_overlay(self):
+        """Indica si hay algo dibujado encima de todo (popups, pausa, fin de juego)"""
+        return (self.game_state.game_over or 
+                self.pause_menu.active or 
+                self.popup_manager.is_popup_active())
+    
+    def can_render_dirty(self):
+        """El modo parcial solo aplica sin overlays y con un frame completo de base"""
+        return not self.has_active_overlay() and not self.dirty_tracker.needs_full_redraw
+    
+    def get_scene_layout_key(self):
+        """Valores que, si cambian, obligan a redibujar toda el área del mapa"""
+        return (
+            self.camera_x,
+            self.camera_y,
+            tuple(order.id for order in self.active_orders),
+            tuple(order.id for order in self.player.inventory)
+        )
+    
+    def get_scene_actor_key(self):
+        """Valores de los elementos móviles dibujados sobre el mapa"""
+        return (
+            self.player.get_render_key(),
+            self.ui_manager.message,
+            self.ui_manager.show_inventory_controls
+        )
+    
+    def render_dirty(self):
+        """Renderizado por rectángulos sucios: actualiza solo las regiones que cambiaron"""
+        tracker = self.dirty_tracker
+        viewport = pygame.Rect(0, 0, self.screen_width - 300, self.screen_height)
+        
+        layout_key = self.get_scene_layout_key()
+        actor_key = self.get_scene_actor_key()
+        particles_visible = self.weather_system.has_visible_particles()
+        
+        layout_changed = layout_key != self._scene_layout_key
+        scene_changed = (layout_changed or 
+                         actor_key != self._scene_actor_key or 
+                         particles_visible or 
+                         self._particles_drawn)
+        
+        if scene_changed:
+            previous_clip = self.screen.get_clip()
+            self.screen.set_clip(viewport)
+            
+            if layout_changed:
+                self.render_map()
+                tracker.add_static(viewport)
+            else:
+                # Restaurar el mapa solo debajo de lo que se dibujó en el frame anterior
+                for rect in tracker.previous_dynamic_rects:
+                    self.screen.set_clip(rect.clip(viewport))
+                    self.render_map()
+                self.screen.set_clip(viewport)
+            
+            tracker.extend_dynamic(self.render_world_objects())
+            tracker.add_dynamic(self.ui_manager.draw_controls_overlay())
+            tracker.add_dynamic(self.ui_manager.draw_messages())
+            tracker.add_dynamic(self.ui_manager.draw_interaction_hints(
+                self.camera_x, self.camera_y, self.game_map))
+            
+            self.screen.set_clip(previous_clip)
+            
+            self._scene_layout_key = layout_key
+            self._scene_actor_key = actor_key
+            self._particles_drawn = particles_visible
+        else:
+            # Nada cambió en el mapa: las regiones del frame anterior siguen siendo válidas
+            tracker.carry_over()
+        
+        pending_count = len(self.pending_orders)
+        tracker.extend_static(self.ui_manager.draw_sidebar_if_changed(
+            self.player, self.active_orders, self.weather_system, 
+            self.game_time, self.game_state, pending_count))
+        
+        tracker.flush()
+        
     def render_map(self):
-        """Renderiza el mapa del juego"""
-        for y, row in enumerate(self.game_map.tiles):
-            for x, char in enumerate(row):
-                color = self.game_map.COLORS.get(char, (100, 100, 255))
-                rect = pygame.Rect(x * self.game_map.tile_size - self.camera_x, 
-                                 y * self.game_map.tile_size - self.camera_y, 
-                                 self.game_map.tile_size, self.game_map.tile_size)
-                pygame.draw.rect(self.screen, color, rect)
-                pygame.draw.rect(self.screen, (0, 0, 0), rect, 1)
+        """Renderiza el mapa del juego copiando solo la región visible de la capa cacheada"""
+        viewport_width = self.screen_width - 300  # El sidebar ocupa los últimos 300px
+        self.map_renderer.draw(self.screen, self.camera_x, self.camera_y,
+                            viewport_width, self.screen_height)
     
     def run(self):
         """Bucle principal del juego"""
         while self.running:
-            current_time = pygame.time.get_ticks()
-            dt = (current_time - self.last_time) / 1000.0
+            current_time = self.game_clock.now()
+            dt = current_time - self.last_time
             self.last_time = current_time
             
             self.handle_events()
+            # Un bot (ScriptedInput con política) también puede jugar con ventana
+            for action in self.input_controller.get_actions(self):
+                self.apply_action(action)
             self.update(dt)
             self.render()
             
             self.clock.tick(60)
         
+        self.save_travel_times()
         pygame.quit()
+    
+    def run_headless(self, max_steps=None, quiet=True):
+        """Simula la partida sin ventana, a paso fijo y tan rápido como sea posible.
+        
+        La entrada viene del input_controller (acciones programadas o una política)
+        y el tiempo del reloj virtual, así que con la misma semilla y el registro
+        de entrada (ScriptedInput.log) la partida se repite exactamente.
+        Con un reloj sin advance (RealTimeClock, ScaledClock) cada paso usa el
+        tiempo transcurrido según now(), como run().
+        Retorna las estadísticas finales de GameState.get_game_stats().
+        """
+        advance = getattr(self.game_clock, "advance", None)
+        with contextlib.ExitStack() as stack:
+            if quiet:
+                devnull = stack.enter_context(open(os.devnull, "w"))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+            
+            steps = 0
+            while self.running and not self.game_state.game_over:
+                if max_steps is not None and steps >= max_steps:
+                    break
+                
+                for action in self.input_controller.get_actions(self):
+                    self.apply_action(action)
+                
+                if advance is not None:
+                    dt = advance()
+                else:
+                    current_time = self.game_clock.now()
+                    dt = current_time - self.last_time
+                    self.last_time = current_time
+                self.update(dt)
+                steps += 1
+            
+            self.save_travel_times()
+            game_duration = self.game_time.get_elapsed_game_time()
+            return self.game_state.get_game_stats(game_duration)
         
     def verify_order_consistency(self):
         """Verifica la consistencia de las órdenes después de cargar"""
@@ -1,10 +1,19 @@
+import argparse
 import pygame
 import sys
+from api.api_manager import LoadCancelled
 from ui.main_menu import MainMenu
 from utils.setup_directories import setup_directories
 from utils.score_manager import initialize_score_system
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Courier Quest")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="actualizar solo las regiones de pantalla que cambiaron (equipos lentos)")
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
     pygame.init()
     
     setup_directories()
@@ -40,9 +49,12 @@ def main():
                 clock.tick(60)
             
             from game_engine import GameEngine
-            game = GameEngine(load_slot=load_slot)
+            game = GameEngine(load_slot=load_slot, dirty_rects=args.dirty_rects)
             game.run()
             
+        except LoadCancelled:
+            # El jugador cerró la ventana durante la pantalla de carga
+            break
         except pygame.error as e:
             if "display Surface quit" in str(e):
                 continue
@@ -0,0 +1,174 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from api.api_manager import APIManager
+from core.input_controller import ScriptedInput
+from core.policies import POLICIES, create_policy
+
+
+# Columnas por turno simulado (CSV) y métricas que se resumen en percentiles
+RESULT_FIELDS = [
+    "seed", "policy", "victory", "final_score", "earnings", "progress",
+    "orders_completed", "orders_cancelled", "perfect_deliveries", "late_deliveries",
+    "best_streak", "final_reputation", "game_duration", "game_over_reason",
+    "decisions", "decision_p50_us", "decision_p95_us", "decision_max_us"
+]
+SUMMARY_METRICS = [
+    "final_score", "earnings", "orders_completed", "orders_cancelled",
+    "late_deliveries", "final_reputation", "game_duration", "decision_p95_us"
+]
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Datos del juego cargados una sola vez por proceso trabajador
+_worker_game_data = None
+
+
+def init_worker(game_data=None):
+    """Inicializador de cada proceso: carga mapa, pedidos y clima del caché una vez"""
+    global _worker_game_data
+    _worker_game_data = game_data or APIManager().get_cached_game_data()
+
+
+def run_shift(seed, policy_name, time_step=None, compact_orders=False):
+    """Simula un turno completo sin ventana y retorna su fila de resultados"""
+    from game_engine import GameEngine
+
+    if _worker_game_data is None:
+        init_worker()
+
+    # La política tiene su propio generador para no alterar la secuencia del clima
+    policy = create_policy(policy_name, rng=random.Random(f"{policy_name}-{seed}"))
+    input_controller = ScriptedInput(policy=policy)
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = GameEngine(headless=True, game_data=_worker_game_data,
+                            input_controller=input_controller,
+                            time_step=time_step, seed=seed, compact_orders=compact_orders)
+    stats = engine.run_headless()
+    game_duration = engine.game_time.get_elapsed_game_time()
+
+    row = {field: stats.get(field) for field in RESULT_FIELDS}
+    row.update({
+        "seed": seed,
+        "policy": policy_name,
+        "game_duration": round(game_duration, 3)
+    })
+    # Latencia por decisión de la política (varía entre corridas; el resto es determinista)
+    latency = input_controller.get_latency_stats()
+    row.update({field: round(latency[field], 2) for field in
+                ("decision_p50_us", "decision_p95_us", "decision_max_us")})
+    row["decisions"] = latency["decisions"]
+    return row
+
+
+def summarize(rows):
+    """Tasa de victoria y percentiles de cada métrica, por política"""
+    summary = {}
+    for policy_name in sorted({row["policy"] for row in rows}):
+        policy_rows = [row for row in rows if row["policy"] == policy_name]
+        policy_summary = {
+            "shifts": len(policy_rows),
+            "win_rate": sum(1 for row in policy_rows if row["victory"]) / len(policy_rows)
+        }
+        for metric in SUMMARY_METRICS:
+            values = np.array([row[metric] for row in policy_rows], dtype=float)
+            policy_summary[metric] = {
+                "mean": float(values.mean()),
+                **{f"p{p}": float(value)
+                   for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+            }
+        summary[policy_name] = policy_summary
+    return summary
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(path, report):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def run_batch(shifts, policies, base_seed=0, workers=None, time_step=None, chunksize=None,
+              compact_orders=False):
+    """Simula shifts turnos por política en paralelo (ProcessPoolExecutor).
+
+    Cada turno usa la semilla base_seed + i, así que una misma semilla repite
+    el mismo clima para todas las políticas. Retorna (filas, reporte).
+    """
+    game_data = APIManager().get_cached_game_data()
+    workers = workers or os.cpu_count() or 1
+    jobs = [(base_seed + i, policy_name) for policy_name in policies for i in range(shifts)]
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+
+    start = time.perf_counter()
+    if workers == 1:
+        init_worker(game_data)
+        rows = [run_shift(seed, policy_name, time_step, compact_orders) for seed, policy_name in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(game_data,)) as executor:
+            rows = list(executor.map(run_shift,
+                                     [seed for seed, _ in jobs],
+                                     [policy_name for _, policy_name in jobs],
+                                     [time_step] * len(jobs),
+                                     [compact_orders] * len(jobs),
+                                     chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "shifts": len(rows),
+        "workers": workers,
+        "base_seed": base_seed,
+        "elapsed_seconds": elapsed,
+        "shifts_per_second": len(rows) / elapsed if elapsed > 0 else 0.0,
+        "policies": summarize(rows)
+    }
+    return rows, report
+
+
+def print_report(report):
+    print(f"{report['shifts']} turnos en {report['elapsed_seconds']:.2f}s "
+          f"({report['shifts_per_second']:.1f} turnos/s, {report['workers']} procesos)")
+    for policy_name, policy_summary in report["policies"].items():
+        score = policy_summary["final_score"]
+        print(f"  {policy_name:11s} victorias {policy_summary['win_rate']:6.1%}  "
+              f"puntaje p5/p50/p95 {score['p5']:.0f}/{score['p50']:.0f}/{score['p95']:.0f}  "
+              f"decisión p95 {policy_summary['decision_p95_us']['p50']:.0f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación Monte Carlo de turnos de Courier Quest (sin ventana)")
+    parser.add_argument("--shifts", type=int, default=100, help="turnos por política")
+    parser.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                        help="política del repartidor (se puede repetir; por defecto greedy)")
+    parser.add_argument("--seed", type=int, default=0, help="semilla del primer turno")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por CPU)")
+    parser.add_argument("--time-step", type=float, default=None, help="paso fijo de la simulación en segundos")
+    parser.add_argument("--compact-orders", action="store_true",
+                        help="guardar los pedidos en un OrderTable columnar (feeds grandes)")
+    parser.add_argument("--csv", default="data/simulacion.csv", help="resultados por turno")
+    parser.add_argument("--json", default="data/simulacion.json", help="resumen con percentiles")
+    args = parser.parse_args()
+
+    rows, report = run_batch(args.shifts, args.policy or ["greedy"], args.seed,
+                             args.workers, args.time_step, compact_orders=args.compact_orders)
+    write_csv(args.csv, rows)
+    write_json(args.json, report)
+    print_report(report)
+    print(f"Resultados guardados en {args.csv} y {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from api.api_manager import APIManager
+from core.clock import ScaledClock, VirtualClock
+from game_engine import GameEngine
+
+
+def test_run_headless_accepts_clock_without_advance():
+    base = VirtualClock(step=0.1)
+    clock = ScaledClock(scale=2.0, base_clock=base)
+    engine = GameEngine(headless=True, game_data=APIManager().get_cached_game_data(), seed=1, clock=clock)
+
+    start = clock.now()
+    base.advance(5.0)
+    stats = engine.run_headless(max_steps=1)
+    assert engine.last_time == clock.now() == start + 10.0
+    assert "final_score" in stats
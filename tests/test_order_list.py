@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from entities.order import Order
+from entities.order_list import OrderList
+
+
+START = datetime(2025, 9, 1, 12, 0, 0)
+
+
+def make_order(order_id, priority=0, payout=100, minutes=10):
+    return Order(id=order_id, pickup=[0, 0], dropoff=[1, 1], payout=payout,
+                 deadline=START + timedelta(minutes=minutes), weight=1,
+                 priority=priority, release_time=0)
+
+
+def ids(orders):
+    return [order.id for order in orders]
+
+
+def test_ties_keep_arrival_order():
+    orders = OrderList.from_list([
+        make_order("A", priority=0, payout=100, minutes=10),
+        make_order("B", priority=1, payout=200, minutes=5),
+        make_order("C", priority=0, payout=100, minutes=10),
+        make_order("D", priority=1, payout=200, minutes=5),
+    ])
+
+    orders.reorganize_by_priority()
+    assert ids(orders) == ["B", "D", "A", "C"]
+    orders.reorganize_by_payout()
+    assert ids(orders) == ["B", "D", "A", "C"]
+    orders.reorganize_by_deadline()
+    assert ids(orders) == ["B", "D", "A", "C"]
+    orders.reorganize_by_arrival()
+    assert ids(orders) == ["A", "B", "C", "D"]
+
+
+def test_remove_by_id_under_active_view():
+    orders = OrderList.from_list([make_order("A", payout=50), make_order("B", payout=300),
+                                  make_order("C", payout=150)])
+    orders.reorganize_by_payout()
+    assert orders.remove_by_id("B")
+    assert not orders.remove_by_id("B")
+    assert ids(orders) == ["C", "A"]
+    assert orders.front().id == "C"
+
+    orders.reorganize_by_arrival()
+    assert ids(orders) == ["A", "C"]
+
+
+def test_dequeue_front_and_getitem_follow_view():
+    orders = OrderList.from_list([make_order("A", minutes=30), make_order("B", minutes=10),
+                                  make_order("C", minutes=20)])
+    orders.reorganize_by_deadline()
+    assert orders.front().id == "B"
+    assert orders.rear().id == "A"
+    assert orders[0].id == "B"
+    assert orders[1].id == "C"
+    assert orders[-1].id == "A"
+
+    assert orders.dequeue().id == "B"
+    assert orders[0].id == "C"
+    assert ids(orders.process_batch(2)) == ["C", "A"]
+    with pytest.raises(IndexError):
+        orders.dequeue()
+
+
+def test_new_orders_enter_active_view():
+    orders = OrderList.from_list([make_order("A", priority=0), make_order("B", priority=2)])
+    orders.reorganize_by_priority()
+    orders.enqueue(make_order("C", priority=1))
+    orders.enqueue(make_order("D", priority=2))
+    assert ids(orders) == ["B", "D", "C", "A"]
+    assert orders.get_highest_priority() == 2
+    assert ids(orders.get_high_priority_orders()) == ["B", "D"]
+
+
+def test_reenqueue_existing_id_replaces_entry():
+    orders = OrderList.from_list([make_order("A", priority=0), make_order("B", priority=0)])
+    orders.reorganize_by_priority()
+
+    orders.enqueue(make_order("A", priority=3))
+    assert len(orders) == 2
+    assert ids(orders) == ["A", "B"]
+    assert ids(orders.filter_by_priority(0)) == ["B"]
+
+    orders.reorganize_by_arrival()
+    assert ids(orders) == ["B", "A"]
+
+    orders.enqueue_priority(orders.find_by_id("A"))
+    assert ids(orders) == ["A", "B"]
+    orders.reorganize_by_priority()
+    assert ids(orders) == ["A", "B"]
+    assert ids(orders.filter_by_priority(3)) == ["A"]
+
+
+def test_generation_changes_on_mutation_and_view():
+    orders = OrderList.from_list([make_order("A")])
+    generation = orders.generation
+    orders.reorganize_by_payout()
+    assert orders.generation != generation
+    generation = orders.generation
+    orders.remove_by_id("A")
+    assert orders.generation != generation
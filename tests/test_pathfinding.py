@@ -0,0 +1,86 @@
+import heapq
+import random
+
+import pytest
+
+from core.pathfinding import DIRECTIONS, PathFinder
+from ui.map import Map
+
+
+LEGEND = {
+    "C": {"name": "calle", "surface_weight": 1.0},
+    "P": {"name": "parque", "surface_weight": 0.95},
+    "B": {"name": "edificio", "blocked": True}
+}
+
+
+def random_map(rng, width, height):
+    tiles = [[rng.choices("CPB", weights=(6, 2, 2))[0] for _ in range(width)] for _ in range(height)]
+    return Map({"data": {"city_name": "Prueba", "width": width, "height": height,
+                         "tiles": tiles, "legend": LEGEND}})
+
+
+def reference_distance(pathfinder, start, goals):
+    """Dijkstra simple casilla por casilla (entrar a una casilla cuesta su costo)"""
+    if pathfinder.cost(*start) is None:
+        return None
+    best = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        distance, (x, y) = heapq.heappop(heap)
+        if (x, y) in goals:
+            return distance
+        if distance > best[(x, y)]:
+            continue
+        for dx, dy in DIRECTIONS:
+            neighbor = (x + dx, y + dy)
+            cost = pathfinder.cost(*neighbor)
+            if cost is not None and distance + cost < best.get(neighbor, float('inf')):
+                best[neighbor] = distance + cost
+                heapq.heappush(heap, (distance + cost, neighbor))
+    return None
+
+
+def assert_valid_path(pathfinder, path, start, goals):
+    assert path[0] == start
+    assert path[-1] in goals
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        assert abs(nx - x) + abs(ny - y) == 1
+        assert pathfinder.cost(nx, ny) is not None
+
+
+@pytest.mark.parametrize("seed", range(12))
+@pytest.mark.parametrize("radius", [0, 1])
+def test_paths_match_plain_dijkstra(seed, radius):
+    rng = random.Random(seed)
+    game_map = random_map(rng, rng.randint(8, 24), rng.randint(8, 24))
+    pathfinder = PathFinder(game_map)
+
+    for _ in range(40):
+        start = (rng.randrange(game_map.cols), rng.randrange(game_map.rows))
+        target = (rng.randrange(game_map.cols), rng.randrange(game_map.rows))
+        goals = set(pathfinder.goal_cells(target, radius))
+        expected = reference_distance(pathfinder, start, goals)
+
+        for jump in (True, False):
+            path = pathfinder.find_path(start, target, radius, jump=jump)
+            if expected is None:
+                assert path is None
+                continue
+            assert path is not None
+            assert_valid_path(pathfinder, path, start, goals)
+            assert pathfinder.path_cost(path) == pytest.approx(expected)
+
+        if pathfinder.cost(*start) is not None:
+            travel = pathfinder.travel_time(start, target, radius)
+            assert travel == pytest.approx(expected if expected is not None else float('inf'))
+
+
+def test_set_tile_refreshes_costs():
+    game_map = Map({"data": {"city_name": "Prueba", "width": 3, "height": 1,
+                             "tiles": [["C", "C", "C"]], "legend": LEGEND}})
+    pathfinder = PathFinder(game_map)
+    assert pathfinder.find_path((0, 0), (2, 0)) == [(0, 0), (1, 0), (2, 0)]
+
+    game_map.set_tile(1, 0, "B")
+    assert pathfinder.find_path((0, 0), (2, 0)) is None
@@ -0,0 +1,108 @@
+import random
+from dataclasses import dataclass
+
+from core.route_planner import DROPOFF, PICKUP, RoutePlanner, Stop, _RouteContext, _SearchLimit
+
+
+@dataclass(eq=False)
+class FakeOrder:
+    id: str
+    pickup: tuple
+    dropoff: tuple
+    weight: int = 1
+    payout: float = 100
+    deadline_s: float = 10_000
+
+
+class ManhattanMatrix:
+    """Matriz de viaje falsa: un segundo por casilla en distancia Manhattan"""
+
+    def add_orders(self, orders):
+        return 0
+
+    def time_between(self, origin, destination):
+        return abs(origin[0] - destination[0]) + abs(origin[1] - destination[1])
+
+    def time_from(self, position, point):
+        return self.time_between(position, point)
+
+
+def make_context(capacity=5, load=0):
+    planner = RoutePlanner(ManhattanMatrix())
+    return _RouteContext(planner, (0, 0), 0, load, capacity, _SearchLimit(max_evaluations=10_000))
+
+
+def test_evaluate_rejects_capacity_overflow():
+    context = make_context(capacity=5)
+    first = FakeOrder("A", (1, 0), (5, 0), weight=3)
+    second = FakeOrder("B", (2, 0), (6, 0), weight=3)
+    route = [Stop(PICKUP, first), Stop(PICKUP, second), Stop(DROPOFF, first), Stop(DROPOFF, second)]
+    assert context.evaluate(route) is None
+
+    sequential = [Stop(PICKUP, first), Stop(DROPOFF, first), Stop(PICKUP, second), Stop(DROPOFF, second)]
+    assert context.evaluate(sequential) is not None
+
+
+def test_evaluate_rejects_dropoff_before_pickup():
+    context = make_context()
+    order = FakeOrder("A", (1, 0), (5, 0))
+    assert context.evaluate([Stop(DROPOFF, order), Stop(PICKUP, order)]) is None
+    assert context.evaluate([Stop(PICKUP, order), Stop(DROPOFF, order)]) == (5.0, 0.0)
+
+
+def test_evaluate_counts_current_load():
+    context = make_context(capacity=5, load=4)
+    order = FakeOrder("A", (1, 0), (5, 0), weight=2)
+    assert context.evaluate([Stop(PICKUP, order), Stop(DROPOFF, order)]) is None
+
+
+def assert_valid_plan(plan, inventory, capacity, load):
+    picked = set()
+    inventory_ids = {order.id for order in inventory}
+    new_ids = {order.id for order in plan.new_orders}
+    current = load
+    for stop in plan.stops:
+        if stop.kind == PICKUP:
+            assert stop.order.id in new_ids
+            picked.add(stop.order.id)
+            current += stop.order.weight
+            assert current <= capacity
+        else:
+            assert stop.order.id in inventory_ids or stop.order.id in picked
+            current -= stop.order.weight
+
+    dropoffs = [stop.order.id for stop in plan.stops if stop.kind == DROPOFF]
+    assert sorted(dropoffs) == sorted(inventory_ids | new_ids)
+    assert picked == new_ids
+
+
+def test_plan_never_returns_invalid_routes():
+    rng = random.Random(7)
+    planner = RoutePlanner(ManhattanMatrix(), max_iterations=500)
+
+    def point():
+        return (rng.randint(0, 20), rng.randint(0, 20))
+
+    for instance in range(40):
+        inventory = [FakeOrder(f"I{instance}-{i}", point(), point(), weight=1,
+                               deadline_s=rng.randint(10, 80)) for i in range(rng.randint(0, 2))]
+        candidates = [FakeOrder(f"C{instance}-{i}", point(), point(), weight=rng.randint(1, 3),
+                                payout=rng.randint(50, 300), deadline_s=rng.randint(20, 120))
+                      for i in range(rng.randint(1, 5))]
+        load = len(inventory)
+        capacity = rng.randint(load + 1, 6)
+
+        plan = planner.plan(point(), 0, inventory, candidates, load=load, capacity=capacity)
+        assert_valid_plan(plan, inventory, capacity, load)
+
+
+def test_plan_with_max_iterations_is_deterministic():
+    rng = random.Random(3)
+    candidates = [FakeOrder(f"C{i}", (rng.randint(0, 30), rng.randint(0, 30)),
+                            (rng.randint(0, 30), rng.randint(0, 30)), payout=rng.randint(50, 300))
+                  for i in range(6)]
+    planner = RoutePlanner(ManhattanMatrix(), max_iterations=50)
+    first = planner.plan((0, 0), 0, [], candidates, capacity=10)
+    second = planner.plan((0, 0), 0, [], candidates, capacity=10)
+    assert [(stop.kind, stop.order.id) for stop in first.stops] == \
+           [(stop.kind, stop.order.id) for stop in second.stops]
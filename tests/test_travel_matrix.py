@@ -0,0 +1,72 @@
+import pytest
+
+from core.pathfinding import PathFinder
+from core.travel_matrix import TravelMatrix
+from ui.map import Map
+
+
+LEGEND = {
+    "C": {"name": "calle", "surface_weight": 1.0},
+    "B": {"name": "edificio", "blocked": True}
+}
+
+
+def open_map(size=5):
+    tiles = [["C"] * size for _ in range(size)]
+    return Map({"data": {"city_name": "Prueba", "width": size, "height": size,
+                         "tiles": tiles, "legend": LEGEND}})
+
+
+def test_times_follow_map_changes_after_save(tmp_path):
+    game_map = open_map()
+    pathfinder = PathFinder(game_map)
+    matrix = TravelMatrix(pathfinder, cache_dir=str(tmp_path))
+    matrix.add_points([(0, 0), (4, 0)])
+    before = matrix.time_between((0, 0), (4, 0))
+    assert before == pytest.approx(pathfinder.travel_time((0, 0), (4, 0)))
+    assert matrix.save()
+
+    # Muro en la columna 2 con un solo paso abierto abajo: la ruta se alarga
+    for y in range(4):
+        game_map.set_tile(2, y, "B")
+    matrix.add_points([(0, 0), (4, 0)])
+
+    after = matrix.time_between((0, 0), (4, 0))
+    assert after == pytest.approx(pathfinder.travel_time((0, 0), (4, 0)))
+    assert after > before
+
+
+def test_cached_rows_are_reused(tmp_path):
+    pathfinder = PathFinder(open_map())
+    first = TravelMatrix(pathfinder, cache_dir=str(tmp_path))
+    first.add_points([(0, 0), (4, 4)])
+    assert first.save()
+
+    second = TravelMatrix(pathfinder, cache_dir=str(tmp_path))
+    second.add_points([(0, 0), (4, 4)])
+    assert not second.save()  # Nada nuevo que guardar: las filas salieron del disco
+    assert second.time_between((0, 0), (4, 4)) == pytest.approx(first.time_between((0, 0), (4, 4)))
+
+
+def _save_from_process(cache_dir):
+    matrix = TravelMatrix(PathFinder(open_map(40)), cache_dir=cache_dir)
+    matrix.add_points([(0, 0), (39, 39), (3, 4)])
+    results = []
+    for _ in range(20):
+        matrix._dirty = True  # Cada vuelta vuelve a escribir el archivo compartido
+        results.append(matrix.save())
+    return results
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_save_from_process, [str(tmp_path)] * 8))
+    assert all(all(result) for result in results)
+
+    files = [path.name for path in tmp_path.iterdir()]
+    assert len(files) == 1 and not files[0].endswith(".tmp.npz")
+    matrix = TravelMatrix(PathFinder(open_map(40)), cache_dir=str(tmp_path))
+    matrix.add_points([(0, 0), (39, 39), (3, 4)])
+    assert not matrix.save()
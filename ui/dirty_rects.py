@@ -0,0 +1,70 @@
+import pygame
+
+
+class DirtyRectTracker:
+    """Acumula las regiones de pantalla modificadas en un frame.
+
+    Los rectángulos dinámicos (jugador, partículas, mensajes) se recuerdan para
+    restaurar el fondo debajo de ellos en el siguiente frame. Los estáticos
+    (secciones del sidebar) solo se actualizan en el frame en que cambiaron.
+    """
+
+    MAX_RECTS = 64  # Con más regiones conviene una sola actualización unida
+
+    def __init__(self):
+        self.dynamic_rects = []
+        self.static_rects = []
+        self.previous_dynamic_rects = []
+        self.needs_full_redraw = True
+        self._carry_over = False
+
+    def add_dynamic(self, rect):
+        """Registra una región que debe limpiarse en el siguiente frame"""
+        if rect:
+            self.dynamic_rects.append(pygame.Rect(rect))
+
+    def extend_dynamic(self, rects):
+        for rect in rects:
+            self.add_dynamic(rect)
+
+    def add_static(self, rect):
+        """Registra una región que solo cambió en este frame"""
+        if rect:
+            self.static_rects.append(pygame.Rect(rect))
+
+    def extend_static(self, rects):
+        for rect in rects:
+            self.add_static(rect)
+
+    def carry_over(self):
+        """El área dinámica no cambió: se conservan las regiones anteriores sin actualizarlas"""
+        self._carry_over = True
+
+    def mark_full_redraw(self):
+        """Obliga a que el siguiente frame se dibuje completo"""
+        self.needs_full_redraw = True
+
+    def full_frame_drawn(self, dynamic_rects, overlays_active=False):
+        """Registra un frame completo (flip) como base para los siguientes frames parciales"""
+        self.previous_dynamic_rects = [pygame.Rect(rect) for rect in dynamic_rects if rect]
+        self.dynamic_rects = []
+        self.static_rects = []
+        self.needs_full_redraw = overlays_active
+
+    def flush(self):
+        """Actualiza en pantalla solo las regiones sucias y retorna las actualizadas"""
+        if self._carry_over:
+            to_update = self.static_rects
+        else:
+            to_update = self.previous_dynamic_rects + self.dynamic_rects + self.static_rects
+            self.previous_dynamic_rects = self.dynamic_rects
+        self.dynamic_rects = []
+        self.static_rects = []
+        self._carry_over = False
+
+        if len(to_update) > self.MAX_RECTS:
+            to_update = [to_update[0].unionall(to_update[1:])]
+
+        if to_update:
+            pygame.display.update(to_update)
+        return to_update
@@ -0,0 +1,30 @@
+from collections import deque
+
+
+class HeadlessUI:
+    """Sustituto de UIManager para simulaciones sin ventana.
+
+    No carga fuentes ni dibuja nada: solo guarda los últimos mensajes que el
+    juego mostraría, para poder revisarlos al terminar la simulación.
+    """
+
+    def __init__(self, max_messages=50):
+        self.message = ""
+        self.message_timer = 0
+        self.messages = deque(maxlen=max_messages)
+        self.show_inventory_controls = False
+        self.interaction_manager = None
+
+    def show_message(self, message, duration):
+        self.message = message
+        self.message_timer = duration
+        self.messages.append(message)
+
+    def update_messages(self, dt):
+        if self.message_timer > 0:
+            self.message_timer -= dt
+            if self.message_timer <= 0:
+                self.message = ""
+
+    def handle_event(self, event, active_orders, player):
+        pass
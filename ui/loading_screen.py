@@ -0,0 +1,44 @@
+import pygame
+from ui.text_renderer import text_renderer
+
+
+class LoadingScreen:
+    """Pantalla de carga mientras se descargan los datos iniciales de la API"""
+
+    BACKGROUND_COLOR = (30, 30, 60)
+    BAR_COLOR = (0, 200, 0)
+    TEXT_COLOR = (255, 255, 255)
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        self.font_large = text_renderer.get_font(48)
+        self.font_small = text_renderer.get_font(24)
+        self.frame = 0
+
+    def draw(self, done, total):
+        """Dibuja el progreso (terminados / total); retorna False si el jugador cerró la ventana"""
+        # Procesar los eventos mantiene la ventana respondiendo mientras los hilos descargan
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        self.frame += 1
+
+        self.screen.fill(self.BACKGROUND_COLOR)
+        title = self.font_large.render("Courier Quest", True, self.TEXT_COLOR)
+        self.screen.blit(title, title.get_rect(center=(self.width // 2, self.height // 2 - 60)))
+
+        dots = "." * (self.frame // 10 % 4)
+        status = self.font_small.render(f"Cargando datos de la ciudad{dots} ({done}/{total})",
+                                        True, self.TEXT_COLOR)
+        self.screen.blit(status, status.get_rect(center=(self.width // 2, self.height // 2)))
+
+        bar_width, bar_height = self.width // 2, 16
+        bar_x = (self.width - bar_width) // 2
+        bar_y = self.height // 2 + 30
+        progress_width = int(bar_width * done / total) if total else bar_width
+        pygame.draw.rect(self.screen, (80, 80, 80), (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(self.screen, self.BAR_COLOR, (bar_x, bar_y, progress_width, bar_height))
+        pygame.draw.rect(self.screen, self.TEXT_COLOR, (bar_x, bar_y, bar_width, bar_height), 1)
+        pygame.display.flip()
+        return True
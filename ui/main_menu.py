@@ -1,6 +1,7 @@
 import pygame
 import sys
 from utils.save_load_manager import SaveLoadManager
+from ui.text_renderer import text_renderer
 
 class MainMenu:
     def __init__(self, screen):
@@ -10,15 +11,10 @@ class MainMenu:
         self.show_controls = False  # NUEVO
         self.high_scores = self.load_high_scores()
         
-        # Configurar fuentes
-        try:
-            self.font_large = pygame.font.Font(None, 48)
-            self.font_medium = pygame.font.Font(None, 32)
-            self.font_small = pygame.font.Font(None, 24)
-        except:
-            self.font_large = pygame.font.SysFont("Arial", 48)
-            self.font_medium = pygame.font.SysFont("Arial", 32)
-            self.font_small = pygame.font.SysFont("Arial", 24)
+        # Configurar fuentes (compartidas con el resto de la UI)
+        self.font_large = text_renderer.get_font(48)
+        self.font_medium = text_renderer.get_font(32)
+        self.font_small = text_renderer.get_font(24)
         
         # Opciones del menú
         self.options = [
@@ -1,4 +1,5 @@
 import pygame
+from array import array
 from api.api_manager import APIManager   
 
 class Map:
@@ -16,13 +17,83 @@ class Map:
         self.tiles = map_data["data"]["tiles"]
         self.legend = map_data["data"]["legend"]
         self.tile_size = tile_size
+        self.tiles_version = 0
+        self._compile()
 
-        # Inicializar pygame y ventana
-        pygame.init()
-        self.screen = pygame.display.set_mode(
-            (self.width * tile_size, self.height * tile_size)
-        )
-        pygame.display.set_caption(f"Mapa de {self.city_name}")
+        # La ventana solo se crea al visualizar el mapa por separado (run);
+        # el GameEngine maneja su propia pantalla con cámara
+        self.screen = None
+
+    def _compile(self): # O(filas * columnas)
+        """Precompila las celdas en cuadrículas planas (índice y * cols + x).
+
+        - surface_ids: id de superficie de cada celda (posición en surface_chars)
+        - blocked: 1 si la celda no se puede pisar
+        - surface_weights: surface_weight de la leyenda
+        Así el movimiento, las rutas y el dibujo no recorren la leyenda en cada consulta.
+        """
+        self.rows = len(self.tiles)
+        self.cols = len(self.tiles[0]) if self.rows else 0
+        self.surface_chars = []  # id -> carácter de la celda
+        self.surface_names = []  # id -> nombre de la superficie
+        self.surface_blocked = []  # id -> bloqueada
+        self.surface_weight_by_id = []  # id -> surface_weight
+        self._surface_index = {}  # carácter -> id
+        for char in self.legend:
+            self._surface_id(char)
+
+        self.surface_ids = bytearray(self.rows * self.cols)
+        self.blocked = bytearray(self.rows * self.cols)
+        self.surface_weights = array("d", bytes(8 * self.rows * self.cols))
+        for y, row in enumerate(self.tiles):
+            for x, char in enumerate(row):
+                self._store_cell(x, y, char)
+
+    def _surface_id(self, char):
+        """Id de superficie de un carácter; los que no están en la leyenda cuentan como calle"""
+        surface_id = self._surface_index.get(char)
+        if surface_id is None:
+            info = self.legend.get(char, {})
+            surface_id = len(self.surface_chars)
+            self._surface_index[char] = surface_id
+            self.surface_chars.append(char)
+            self.surface_names.append(info.get("name", "calle"))
+            self.surface_blocked.append(bool(info.get("blocked", False)))
+            self.surface_weight_by_id.append(info.get("surface_weight", 1.0))
+        return surface_id
+
+    def _store_cell(self, x, y, char):
+        surface_id = self._surface_id(char)
+        index = y * self.cols + x
+        self.surface_ids[index] = surface_id
+        self.blocked[index] = self.surface_blocked[surface_id]
+        self.surface_weights[index] = self.surface_weight_by_id[surface_id]
+
+    def set_tile(self, x, y, char):
+        """Cambia una celda del mapa e invalida las capas pre-renderizadas"""
+        self.tiles[y][x] = char
+        self._store_cell(x, y, char)
+        self.tiles_version += 1
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def is_blocked(self, x, y):
+        """True si la celda está bloqueada o fuera del mapa - O(1)"""
+        return not (0 <= x < self.cols and 0 <= y < self.rows) or self.blocked[y * self.cols + x] == 1
+
+    def surface_id(self, x, y):
+        return self.surface_ids[y * self.cols + x]
+
+    def surface_name(self, x, y):
+        """Nombre de la superficie de una celda dentro del mapa - O(1)"""
+        return self.surface_names[self.surface_ids[y * self.cols + x]]
+
+    def surface_weight(self, x, y):
+        """surface_weight de la celda (1.0 fuera del mapa) - O(1)"""
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return self.surface_weights[y * self.cols + x]
+        return 1.0
 
     def draw(self):
         """Dibuja el mapa con colores"""
@@ -38,6 +109,12 @@ class Map:
 
     def run(self):
         """Loop principal para mostrar el mapa"""
+        pygame.init()
+        self.screen = pygame.display.set_mode(
+            (self.width * self.tile_size, self.height * self.tile_size)
+        )
+        pygame.display.set_caption(f"Mapa de {self.city_name}")
+
         running = True
         clock = pygame.time.Clock()
 
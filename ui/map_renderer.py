@@ -0,0 +1,186 @@
+import pygame
+from collections import OrderedDict
+
+
+def surface_colors(game_map, default_color):
+    """Color de cada id de superficie del mapa (tabla indexada por surface_ids)"""
+    return [game_map.COLORS.get(char, default_color) for char in game_map.surface_chars]
+
+
+class MapLayerCache:
+    """Capa estática del mapa pre-renderizada en una Surface fuera de pantalla.
+
+    Las celdas y las líneas de la cuadrícula se dibujan una sola vez; en cada
+    frame solo se copia (blit) la porción visible según la cámara.
+    """
+
+    DEFAULT_COLOR = (100, 100, 255)
+    GRID_COLOR = (0, 0, 0)
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.surface = None
+        self._signature = None
+
+    def _current_signature(self):
+        """Datos que, si cambian, obligan a reconstruir la capa"""
+        return (
+            id(self.game_map.tiles),
+            self.game_map.tiles_version,
+            self.game_map.tile_size,
+            self.game_map.width,
+            self.game_map.height
+        )
+
+    def invalidate(self):
+        """Fuerza la reconstrucción de la capa en el próximo dibujo"""
+        self._signature = None
+
+    def rebuild(self):
+        """Dibuja todas las celdas del mapa en la Surface fuera de pantalla - O(n)"""
+        tile_size = self.game_map.tile_size
+        width = self.game_map.width * tile_size
+        height = self.game_map.height * tile_size
+
+        surface = pygame.Surface((max(1, width), max(1, height)))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
+        colors = surface_colors(self.game_map, self.DEFAULT_COLOR)
+        ids = self.game_map.surface_ids
+        cols = self.game_map.cols
+        for y in range(self.game_map.rows):
+            for x in range(cols):
+                color = colors[ids[y * cols + x]]
+                rect = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+                pygame.draw.rect(surface, color, rect)
+                pygame.draw.rect(surface, self.GRID_COLOR, rect, 1)
+
+        self.surface = surface
+        self._signature = self._current_signature()
+
+    def ensure_built(self):
+        """Reconstruye la capa si cambiaron las celdas o el tamaño de celda"""
+        if self.surface is None or self._signature != self._current_signature():
+            self.rebuild()
+
+    def draw(self, screen, camera_x, camera_y, viewport_width, viewport_height):
+        """Copia a la pantalla solo la región visible de la capa - O(1) llamadas de dibujo"""
+        self.ensure_built()
+        area = pygame.Rect(int(camera_x), int(camera_y), viewport_width, viewport_height)
+        return screen.blit(self.surface, (0, 0), area)
+
+
+class ChunkedMapRenderer:
+    """Renderizador del mapa por bloques (chunks) para ciudades grandes.
+
+    El mapa se divide en bloques de chunk_tiles x chunk_tiles celdas. Cada bloque
+    se dibuja en su propia Surface solo cuando entra en la cámara, y se descartan
+    los menos usados recientemente (LRU) al superar max_chunks.
+    """
+
+    DEFAULT_COLOR = MapLayerCache.DEFAULT_COLOR
+    GRID_COLOR = MapLayerCache.GRID_COLOR
+
+    def __init__(self, game_map, chunk_tiles=16, max_chunks=64):
+        self.game_map = game_map
+        self.chunk_tiles = chunk_tiles
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # (chunk_x, chunk_y) -> Surface, en orden LRU
+        self._signature = None
+
+    def _current_signature(self):
+        """Datos que, si cambian, invalidan todos los bloques"""
+        return (
+            id(self.game_map.tiles),
+            self.game_map.tiles_version,
+            self.game_map.tile_size,
+            self.game_map.width,
+            self.game_map.height
+        )
+
+    def invalidate(self):
+        """Descarta todos los bloques; se reconstruyen bajo demanda"""
+        self.chunks.clear()
+        self._signature = self._current_signature()
+
+    def _build_chunk(self, chunk_x, chunk_y):
+        """Dibuja las celdas de un bloque en una Surface propia - O(chunk_tiles²)"""
+        tile_size = self.game_map.tile_size
+        first_x = chunk_x * self.chunk_tiles
+        first_y = chunk_y * self.chunk_tiles
+        last_x = min(first_x + self.chunk_tiles, self.game_map.width)
+        last_y = min(first_y + self.chunk_tiles, self.game_map.height)
+
+        surface = pygame.Surface(((last_x - first_x) * tile_size, (last_y - first_y) * tile_size))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
+        colors = surface_colors(self.game_map, self.DEFAULT_COLOR)
+        ids = self.game_map.surface_ids
+        cols = self.game_map.cols
+        for y in range(first_y, last_y):
+            for x in range(first_x, last_x):
+                color = colors[ids[y * cols + x]]
+                rect = pygame.Rect((x - first_x) * tile_size, (y - first_y) * tile_size,
+                                   tile_size, tile_size)
+                pygame.draw.rect(surface, color, rect)
+                pygame.draw.rect(surface, self.GRID_COLOR, rect, 1)
+
+        return surface
+
+    def get_chunk(self, chunk_x, chunk_y):
+        """Obtiene un bloque del caché LRU, construyéndolo si no existe - O(1) amortizado"""
+        key = (chunk_x, chunk_y)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            return surface
+
+        surface = self._build_chunk(chunk_x, chunk_y)
+        self.chunks[key] = surface
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def visible_chunks(self, camera_x, camera_y, viewport_width, viewport_height):
+        """Retorna las coordenadas de los bloques que intersectan la cámara"""
+        chunk_px = self.chunk_tiles * self.game_map.tile_size
+        max_chunk_x = (self.game_map.width - 1) // self.chunk_tiles
+        max_chunk_y = (self.game_map.height - 1) // self.chunk_tiles
+
+        first_x = max(0, int(camera_x) // chunk_px)
+        first_y = max(0, int(camera_y) // chunk_px)
+        last_x = min(max_chunk_x, (int(camera_x) + viewport_width - 1) // chunk_px)
+        last_y = min(max_chunk_y, (int(camera_y) + viewport_height - 1) // chunk_px)
+
+        return [(cx, cy) for cy in range(first_y, last_y + 1) for cx in range(first_x, last_x + 1)]
+
+    def ensure_built(self):
+        """Descarta los bloques si cambiaron las celdas o el tamaño de celda"""
+        if self._signature != self._current_signature():
+            self.invalidate()
+
+    def draw(self, screen, camera_x, camera_y, viewport_width, viewport_height):
+        """Dibuja solo los bloques visibles, recortados al área del mapa"""
+        self.ensure_built()
+
+        chunk_px = self.chunk_tiles * self.game_map.tile_size
+        viewport = pygame.Rect(0, 0, viewport_width, viewport_height)
+        previous_clip = screen.get_clip()
+        screen.set_clip(viewport.clip(previous_clip))
+
+        for chunk_x, chunk_y in self.visible_chunks(camera_x, camera_y, viewport_width, viewport_height):
+            surface = self.get_chunk(chunk_x, chunk_y)
+            screen.blit(surface, (chunk_x * chunk_px - int(camera_x), chunk_y * chunk_px - int(camera_y)))
+
+        screen.set_clip(previous_clip)
+        return viewport
+
+
+def create_map_renderer(game_map, max_layer_bytes=32 * 1024 * 1024):
+    """Elige la capa completa para mapas pequeños y el renderizador por bloques para mapas grandes"""
+    layer_bytes = game_map.width * game_map.height * game_map.tile_size ** 2 * 4
+    if layer_bytes <= max_layer_bytes:
+        return MapLayerCache(game_map)
+    return ChunkedMapRenderer(game_map)
@@ -1,5 +1,6 @@
 import pygame
 from datetime import datetime
+from ui.text_renderer import text_renderer
 
 class OrderPopupManager:
     """Gestor de popups para aceptar/rechazar pedidos y cancelar pedidos del inventario"""
@@ -23,14 +24,9 @@ class OrderPopupManager:
         
     def setup_fonts(self):
         """Configura las fuentes del sistema"""
-        try:
-            self.font_small = pygame.font.Font(None, 14)
-            self.font_medium = pygame.font.Font(None, 16)
-            self.font_large = pygame.font.Font(None, 20)
-        except:
-            self.font_small = pygame.font.SysFont("Arial", 14)
-            self.font_medium = pygame.font.SysFont("Arial", 16)
-            self.font_large = pygame.font.SysFont("Arial", 20, bold=True)
+        self.font_small = text_renderer.get_font(14)
+        self.font_medium = text_renderer.get_font(16)
+        self.font_large = text_renderer.get_font(20, bold=True)
     
     def show_new_order_popup(self, order):
         """Muestra popup para aceptar/rechazar un nuevo pedido"""
@@ -1,5 +1,6 @@
 
 import pygame
+from ui.text_renderer import text_renderer
 
 class PauseMenu:
     def __init__(self, screen, save_manager):
@@ -11,15 +12,10 @@ class PauseMenu:
         self.selected_slot = 0
         self.show_save_slots = False
         
-        # Configurar fuentes
-        try:
-            self.font_large = pygame.font.Font(None, 48)
-            self.font_medium = pygame.font.Font(None, 32)
-            self.font_small = pygame.font.Font(None, 24)
-        except:
-            self.font_large = pygame.font.SysFont("Arial", 48)
-            self.font_medium = pygame.font.SysFont("Arial", 32)
-            self.font_small = pygame.font.SysFont("Arial", 24)
+        # Configurar fuentes (compartidas con el resto de la UI)
+        self.font_large = text_renderer.get_font(48)
+        self.font_medium = text_renderer.get_font(32)
+        self.font_small = text_renderer.get_font(24)
         
         # Opciones del menú de pausa
         self.options = [
@@ -0,0 +1,113 @@
+import pygame
+from collections import OrderedDict
+
+
+class CachedFont:
+    """Fuente compartida cuyo render() pasa por el caché de texto.
+
+    Se comporta como pygame.font.Font (los demás métodos se delegan), así que
+    los gestores de UI pueden seguir llamando a font.render(...) sin cambios.
+    La fuente real se carga la primera vez que se usa.
+    Las Surfaces retornadas se comparten: solo deben copiarse (blit), no modificarse.
+    """
+
+    def __init__(self, renderer, size, bold=False):
+        self._renderer = renderer
+        self._font = None
+        self.size_key = (size, bold)
+
+    @property
+    def font(self):
+        if self._font is None:
+            size, bold = self.size_key
+            try:
+                self._font = pygame.font.Font(None, size)
+            except:
+                self._font = pygame.font.SysFont("Arial", size, bold=bold)
+        return self._font
+
+    def render(self, text, antialias, color, background=None):
+        return self._renderer.render(self, text, antialias, color, background)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.font, name)
+
+
+class TextRenderer:
+    """Registro de fuentes compartidas y caché LRU de textos ya renderizados.
+
+    La clave de cada texto es (fuente, tamaño, texto, color, antialias); al
+    superar max_bytes se descartan los textos usados hace más tiempo.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.fonts = {}  # (tamaño, negrita) -> CachedFont
+        self.surfaces = OrderedDict()  # clave -> Surface, en orden LRU
+        self.cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, bold=False):
+        """Retorna la fuente compartida del tamaño pedido; se carga una sola vez, al primer uso"""
+        key = (size, bold)
+        cached_font = self.fonts.get(key)
+        if cached_font is None:
+            cached_font = CachedFont(self, size, bold)
+            self.fonts[key] = cached_font
+        return cached_font
+
+    def render(self, font, text, antialias, color, background=None):
+        """Renderiza un texto o lo toma del caché - O(1) si ya se había dibujado"""
+        if isinstance(font, CachedFont):
+            font_key = font.size_key
+            raw_font = font.font
+        else:
+            font_key = id(font)
+            raw_font = font
+
+        key = (font_key, text, tuple(color), bool(antialias),
+               tuple(background) if background is not None else None)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = raw_font.render(text, antialias, color)
+        else:
+            surface = raw_font.render(text, antialias, color, background)
+
+        self.surfaces[key] = surface
+        self.cached_bytes += self._surface_bytes(surface)
+        while self.cached_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.cached_bytes -= self._surface_bytes(evicted)
+        return surface
+
+    def _surface_bytes(self, surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def clear(self):
+        """Vacía el caché de textos (las fuentes se conservan)"""
+        self.surfaces.clear()
+        self.cached_bytes = 0
+
+    def get_stats(self):
+        """Estadísticas del caché para diagnóstico"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.surfaces),
+            "bytes": self.cached_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+# Instancia global compartida por todos los módulos de UI
+text_renderer = TextRenderer()
@@ -1,14 +1,18 @@
 import pygame
 from datetime import datetime
+from ui.text_renderer import text_renderer
 
 class UIManager:
     """Gestor de la interfaz de usuario del juego"""
     
+    SIDEBAR_BG_COLOR = (240, 240, 240)
+    
     def __init__(self, screen, game_map, screen_width, screen_height):
         self.screen = screen
         self.game_map = game_map
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.sidebar_x = screen_width - 300  # El sidebar ocupa los últimos 300px de la ventana
         
         # Configurar fuentes
         self.setup_fonts()
@@ -27,19 +31,18 @@ class UIManager:
         self.show_inventory_controls = False
         self.controls_timer = 0
         self.controls_duration = 5.0  # Segundos que se muestran los controles
+        
+        # Último contenido dibujado del sidebar (modo de rectángulos sucios)
+        self._sidebar_key = None
+        # Secciones del sidebar ya dibujadas: nombre -> (clave, Surface)
+        self._section_cache = {}
     
     def setup_fonts(self):
         """Configura las fuentes del juego"""
-        try:
-            self.font_small = pygame.font.Font(None, 12)
-            self.font_medium = pygame.font.Font(None, 14)
-            self.font_large = pygame.font.Font(None, 18)
-            self.font_xlarge = pygame.font.Font(None, 24)
-        except:
-            self.font_small = pygame.font.SysFont("Arial", 12)
-            self.font_medium = pygame.font.SysFont("Arial", 14)
-            self.font_large = pygame.font.SysFont("Arial", 18, bold=True)
-            self.font_xlarge = pygame.font.SysFont("Arial", 24, bold=True)
+        self.font_small = text_renderer.get_font(12)
+        self.font_medium = text_renderer.get_font(14)
+        self.font_large = text_renderer.get_font(18, bold=True)
+        self.font_xlarge = text_renderer.get_font(24, bold=True)
     
     def handle_event(self, event, active_orders, player):
         """Maneja eventos relacionados con la UI"""
@@ -47,7 +50,7 @@ class UIManager:
             mouse_x, mouse_y = pygame.mouse.get_pos()
             
             # Verificar clic en el panel lateral
-            if mouse_x > self.game_map.width * self.game_map.tile_size:
+            if mouse_x > self.sidebar_x:
                 self.handle_sidebar_click(mouse_x, mouse_y, active_orders, player)
         
         if event.type == pygame.KEYDOWN:
@@ -58,8 +61,7 @@ class UIManager:
     def handle_sidebar_click(self, mouse_x, mouse_y, active_orders, player):
         """Maneja clics en el panel lateral"""
         # Calcular posición de la lista de trabajos
-        weather_y_pos = 300 if not player.inventory else 235 + len(player.inventory) * 40 + 10
-        jobs_y_pos = weather_y_pos + 85
+        jobs_y_pos = self.get_weather_y(player) + 85
         order_index = (mouse_y - jobs_y_pos - 25) // 70
         
         if 0 <= order_index < len(active_orders):
@@ -86,26 +88,130 @@ class UIManager:
     
     def draw_sidebar(self, player, active_orders, weather_system, game_time, game_state, pending_count=0):
         """Dibuja el panel lateral completo """
-        cols = self.game_map.width
-        sidebar_rect = pygame.Rect(cols * self.game_map.tile_size, 0, 300, self.screen_height)
-        pygame.draw.rect(self.screen, (240, 240, 240), sidebar_rect)
-        pygame.draw.line(self.screen, (200, 200, 200), 
-                        (cols * self.game_map.tile_size, 0), 
-                        (cols * self.game_map.tile_size, self.screen_height), 2)
-        
-        x_offset = cols * self.game_map.tile_size
-        
-        self.draw_header(cols, game_time, game_state)
-        self.draw_player_status(cols, player)
-        self.draw_inventory(cols, player, game_time)  
-        self.draw_weather_info(cols, weather_system, player)
-        self.draw_available_jobs(cols, active_orders, weather_system, player, pending_count)
+        self.draw_sidebar_panel(player, active_orders, weather_system, game_time, game_state, pending_count)
         
         # Controles
+        self.draw_controls_overlay()
+
+    def draw_sidebar_if_changed(self, player, active_orders, weather_system, game_time, game_state, pending_count=0):
+        """Redibuja el sidebar solo si cambió algún valor visible; retorna las regiones modificadas"""
+        sidebar_key = self.get_sidebar_key(player, active_orders, weather_system, game_time, game_state, pending_count)
+        if sidebar_key == self._sidebar_key:
+            return []
+        
+        self._sidebar_key = sidebar_key
+        self.draw_sidebar_panel(player, active_orders, weather_system, game_time, game_state, pending_count,
+                                sidebar_key=sidebar_key)
+        return [pygame.Rect(self.sidebar_x, 0, 300, self.screen_height)]
+
+    def get_sidebar_key(self, player, active_orders, weather_system, game_time, game_state, pending_count=0):
+        """Valores que muestra cada sección del sidebar; si no cambian, el panel se ve idéntico"""
+        return (
+            self.get_header_key(game_time, game_state),
+            self.get_player_status_key(player),
+            self.get_inventory_key(player, game_time),
+            self.get_weather_key(weather_system),
+            self.get_jobs_key(active_orders, pending_count)
+        )
+
+    def get_header_key(self, game_time, game_state):
+        return (
+            game_time.get_game_time_formatted(),
+            game_time.get_remaining_time_formatted(),
+            self.get_time_color(game_time),
+            game_state.total_earnings,
+            game_state.income_goal
+        )
+
+    def get_player_status_key(self, player):
+        # La resistencia se agrupa en valores enteros: es lo que muestra el texto
+        return (int(player.stamina), player.reputation, player.current_weight, player.max_weight)
+
+    def get_inventory_key(self, player, game_time=None):
+        current_time = game_time.get_current_game_seconds() if game_time else None
+        return tuple(
+            (order.id, self.get_inventory_time_text(order, current_time),
+             order.priority, order.payout, order.weight, tuple(order.color))
+            for order in player.inventory
+        )
+
+    def get_weather_key(self, weather_system):
+        return (
+            weather_system.current_condition,
+            f"{weather_system.current_intensity:.2f}",
+            f"{weather_system.current_multiplier:.2f}"
+        )
+
+    def get_jobs_key(self, active_orders, pending_count=0): # O(1)
+        """La generación de la OrderList cambia con cada pedido que entra o sale y con cada reorganización"""
+        return (active_orders.generation, pending_count)
+
+    def get_weather_y(self, player):
+        """Posición vertical de la sección del clima (depende del tamaño del inventario)"""
+        return 300 if not player.inventory else 235 + len(player.inventory) * 40 + 10
+
+    def draw_cached_section(self, name, key, top, height, draw_function):
+        """Copia al sidebar la Surface de una sección, redibujándola solo si cambió su clave.
+
+        Las secciones se dibujan sobre el color de fondo del panel, que luego se
+        usa como color transparente para no tapar lo que haya debajo.
+        """
+        cached = self._section_cache.get(name)
+        if cached is None or cached[0] != key or cached[1].get_height() != height:
+            surface = pygame.Surface((300, max(1, height)))
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            surface.fill(self.SIDEBAR_BG_COLOR)
+            draw_function(surface)
+            surface.set_colorkey(self.SIDEBAR_BG_COLOR, pygame.RLEACCEL)
+            cached = (key, surface)
+            self._section_cache[name] = cached
+        
+        return self.screen.blit(cached[1], (self.sidebar_x, top))
+
+    def request_sidebar_redraw(self):
+        """Fuerza a redibujar el sidebar en el próximo frame reutilizando las secciones cacheadas"""
+        self._sidebar_key = None
+
+    def invalidate_sidebar(self):
+        """Descarta las secciones cacheadas del sidebar; se redibujan en el próximo frame"""
+        self._section_cache.clear()
+        self._sidebar_key = None
+
+    def draw_sidebar_panel(self, player, active_orders, weather_system, game_time, game_state, pending_count=0,
+                           sidebar_key=None):
+        """Dibuja el fondo y las secciones del panel lateral"""
+        if sidebar_key is None:
+            sidebar_key = self.get_sidebar_key(player, active_orders, weather_system, game_time, game_state, pending_count)
+        header_key, status_key, inventory_key, weather_key, jobs_key = sidebar_key
+        
+        sidebar_rect = pygame.Rect(self.sidebar_x, 0, 300, self.screen_height)
+        pygame.draw.rect(self.screen, self.SIDEBAR_BG_COLOR, sidebar_rect)
+        pygame.draw.line(self.screen, (200, 200, 200), 
+                        (self.sidebar_x, 0), 
+                        (self.sidebar_x, self.screen_height), 2)
+        
+        weather_y_pos = self.get_weather_y(player)
+        jobs_y_pos = weather_y_pos + 85
+        inventory_height = 25 + max(1, len(player.inventory)) * 45
+        jobs_height = 45 + len(active_orders) * 70
+        
+        self.draw_cached_section("header", header_key, 0, 90,
+                                 lambda surface: self.draw_header(surface, game_time, game_state))
+        self.draw_cached_section("player_status", status_key, 90, 115,
+                                 lambda surface: self.draw_player_status(surface, player))
+        self.draw_cached_section("inventory", inventory_key, 210, inventory_height,
+                                 lambda surface: self.draw_inventory(surface, player, game_time))
+        self.draw_cached_section("weather", weather_key, weather_y_pos, 80,
+                                 lambda surface: self.draw_weather_info(surface, weather_system))
+        self.draw_cached_section("jobs", jobs_key, jobs_y_pos, jobs_height,
+                                 lambda surface: self.draw_available_jobs(surface, active_orders, pending_count))
+
+    def draw_controls_overlay(self):
+        """Dibuja el popup o el recordatorio de controles y retorna la región modificada"""
         if self.show_inventory_controls:
-            self.draw_inventory_controls_popup()
-        else:
-            self.draw_inventory_controls_hint()
+            return self.draw_inventory_controls_popup()
+        return self.draw_inventory_controls_hint()
 
 
     
@@ -113,7 +219,7 @@ class UIManager:
         """Dibuja un popup emergente con los controles de inventario en esquina inferior izquierda"""
         # Posición en esquina inferior izquierda 
         popup_width = 280
-        popup_height = 70
+        popup_height = 85
         popup_x = 10  # Esquina izquierda
         popup_y = self.screen_height - popup_height - 10  # Esquina inferior
         
@@ -125,7 +231,7 @@ class UIManager:
         pygame.draw.rect(popup_surface, (0, 150, 0, 200), 
                         (0, 0, popup_width, popup_height), 2)
         
-        self.screen.blit(popup_surface, (popup_x, popup_y))
+        popup_rect = self.screen.blit(popup_surface, (popup_x, popup_y))
         
         # Título
         title = self.font_medium.render("🎮 CONTROLES INVENTARIO", True, (0, 100, 0))
@@ -133,73 +239,72 @@ class UIManager:
         
         controls = [
             "P: Ordenar por Prioridad",
-            "O: Ordenar por Urgencia (Deadline)"
+            "O: Ordenar por Urgencia (Deadline)",
+            "R: Sugerir ruta"
         ]
         
         for i, control in enumerate(controls):
             text = self.font_small.render(control, True, (0, 0, 0))
             self.screen.blit(text, (popup_x + 20, popup_y + 25 + i * 15))
+        
+        return popup_rect
     
     def draw_inventory_controls_hint(self):
         """Dibuja un pequeño recordatorio de los controles en esquina inferior izquierda"""
         hint_text = self.font_small.render("Presiona P o E para controles de inventario", 
                                          True, (100, 100, 100))
-        self.screen.blit(hint_text, (10, self.screen_height - 20))
+        return self.screen.blit(hint_text, (10, self.screen_height - 20))
     
-    def draw_header(self, cols, game_time, game_state):
-        """Dibuja el encabezado con título, tiempo y ganancias"""
-        x_offset = cols * self.game_map.tile_size
-        
+    def get_time_color(self, game_time):
+        """Color del tiempo restante según urgencia"""
+        remaining_time = game_time.get_remaining_real_time()
+        if remaining_time < 60:
+            return (255, 50, 50)
+        elif remaining_time < 300:
+            return (255, 150, 50)
+        return (0, 100, 0)
+
+    def draw_header(self, surface, game_time, game_state):
+        """Dibuja el encabezado con título, tiempo y ganancias (coordenadas relativas a la sección)"""
         # Título
         title = self.font_large.render("Courier Quest", True, (0, 0, 0))
-        self.screen.blit(title, (x_offset + 10, 10))
+        surface.blit(title, (10, 10))
         
         game_time_text = self.font_medium.render(f"HORA ACTUAL: {game_time.get_game_time_formatted()}", True, (0, 100, 150))
         time_text_width = game_time_text.get_width()
-        self.screen.blit(game_time_text, (x_offset + 280 - time_text_width, 12))
+        surface.blit(game_time_text, (280 - time_text_width, 12))
         
-        # El resto del código EXACTAMENTE IGUAL
-        time_bg = pygame.Rect(x_offset + 10, 35, 280, 25)
-        pygame.draw.rect(self.screen, (220, 220, 220), time_bg, border_radius=5)
-        pygame.draw.rect(self.screen, (100, 100, 100), time_bg, 2, border_radius=5)
-        
-        # Color del tiempo según urgencia
-        remaining_time = game_time.get_remaining_real_time()
-        if remaining_time < 60:
-            time_color = (255, 50, 50)
-        elif remaining_time < 300:
-            time_color = (255, 150, 50)
-        else:
-            time_color = (0, 100, 0)
+        time_bg = pygame.Rect(10, 35, 280, 25)
+        pygame.draw.rect(surface, (220, 220, 220), time_bg, border_radius=5)
+        pygame.draw.rect(surface, (100, 100, 100), time_bg, 2, border_radius=5)
         
+        time_color = self.get_time_color(game_time)
         time_text = self.font_medium.render(f" Tiempo: {game_time.get_remaining_time_formatted()}", True, time_color)
-        self.screen.blit(time_text, (x_offset + 20, 38))
+        surface.blit(time_text, (20, 38))
         
         # Ganancias y meta
         earnings_text = self.font_medium.render(f" Ganancias: ${game_state.total_earnings}", True, (0, 100, 0))
-        self.screen.blit(earnings_text, (x_offset + 10, 65))
+        surface.blit(earnings_text, (10, 65))
         
         goal_text = self.font_small.render(f" Meta: ${game_state.income_goal}", True, (0, 0, 0))
-        self.screen.blit(goal_text, (x_offset + 150, 65))
+        surface.blit(goal_text, (150, 65))
 
-    def draw_player_status(self, cols, player):
-        """Dibuja el estado del jugador"""
-        x_offset = cols * self.game_map.tile_size
-        
+    def draw_player_status(self, surface, player):
+        """Dibuja el estado del jugador (la sección comienza en y=90)"""
         # Título
         player_title = self.font_medium.render("Estado del Repartidor:", True, (0, 0, 0))
-        self.screen.blit(player_title, (x_offset + 10, 90))
+        surface.blit(player_title, (10, 0))
         
         # Barra de resistencia
         stamina_text = self.font_small.render(f"Resistencia: {int(player.stamina)}/100", 
                                             True, (0, 0, 0))
-        self.screen.blit(stamina_text, (x_offset + 10, 115))
-        self.draw_bar(x_offset + 10, 130, 150, 15, player.stamina / 100, (0, 200, 0))
+        surface.blit(stamina_text, (10, 25))
+        self.draw_bar(10, 40, 150, 15, player.stamina / 100, (0, 200, 0), surface)
         
         # Reputación
         reputation_text = self.font_small.render(f"Reputación: {player.reputation}/100", 
                                                True, (0, 0, 0))
-        self.screen.blit(reputation_text, (x_offset + 10, 150))
+        surface.blit(reputation_text, (10, 60))
         
         # Color de la barra de reputación según el nivel
         if player.reputation >= 90:
@@ -211,31 +316,38 @@ class UIManager:
         else:
             rep_color = (255, 50, 50)
         
-        self.draw_bar(x_offset + 10, 165, 150, 15, player.reputation / 100, rep_color)
+        self.draw_bar(10, 75, 150, 15, player.reputation / 100, rep_color, surface)
         
         # Peso actual
         weight_text = self.font_small.render(f"Peso: {player.current_weight}/{player.max_weight}", 
                                            True, (0, 0, 0))
-        self.screen.blit(weight_text, (x_offset + 10, 185))
+        surface.blit(weight_text, (10, 95))
     
-    def draw_bar(self, x, y, width, height, progress, color):
+    def draw_bar(self, x, y, width, height, progress, color, surface=None):
         """Dibuja una barra de progreso"""
-        pygame.draw.rect(self.screen, (200, 200, 200), (x, y, width, height))
-        pygame.draw.rect(self.screen, color, (x, y, width * progress, height))
+        surface = surface or self.screen
+        pygame.draw.rect(surface, (200, 200, 200), (x, y, width, height))
+        pygame.draw.rect(surface, color, (x, y, width * progress, height))
     
+    def get_inventory_time_text(self, order, current_time=None):
+        """Texto del tiempo restante de un pedido (o su hora límite si no hay reloj)"""
+        if current_time is None:
+            return order.deadline.strftime('%H:%M')
+        time_remaining = order.get_time_remaining(current_time)
+        minutes = int(time_remaining // 60)
+        seconds = int(time_remaining % 60)
+        return f"{minutes:02d}:{seconds:02d}"
 
-    def draw_inventory(self, cols, player, game_time=None):
-        """Dibuja el inventario mostrando colores originales y tiempo restante"""
-        x_offset = cols * self.game_map.tile_size
-        
+    def draw_inventory(self, surface, player, game_time=None):
+        """Dibuja el inventario mostrando colores originales y tiempo restante (la sección comienza en y=210)"""
         inventory_title = self.font_medium.render("Inventario (Click derecho sobre el pedido para cancelar):", True, (0, 0, 0))
-        self.screen.blit(inventory_title, (x_offset + 10, 210))
+        surface.blit(inventory_title, (10, 0))
         
         if player.inventory:
+            current_time = game_time.get_current_game_seconds() if game_time else None
             for i, order in enumerate(player.inventory):
-                y_pos = 235 + i * 45
+                y_pos = 25 + i * 45
                 
-
                 bg_color = order.color
                 
                 light_bg_color = (
@@ -244,14 +356,7 @@ class UIManager:
                     min(255, bg_color[2] + 50)
                 )
                 
-                if game_time:
-                    current_time = game_time.get_current_game_time()
-                    time_remaining = order.get_time_remaining(current_time)
-                    minutes = int(time_remaining // 60)
-                    seconds = int(time_remaining % 60)
-                    time_text = f"{minutes:02d}:{seconds:02d}"
-                else:
-                    time_text = order.deadline.strftime('%H:%M')
+                time_text = self.get_inventory_time_text(order, current_time)
                 
                 # Determinar color de borde basado en prioridad
                 if order.priority > 0:
@@ -262,88 +367,81 @@ class UIManager:
                     priority_icon = ""           # Sin icono
                 
                 # Dibujar caja de inventario
-                pygame.draw.rect(self.screen, light_bg_color, (x_offset + 10, y_pos, 280, 40))
-                pygame.draw.rect(self.screen, border_color, (x_offset + 10, y_pos, 280, 40), 2)
+                pygame.draw.rect(surface, light_bg_color, (10, y_pos, 280, 40))
+                pygame.draw.rect(surface, border_color, (10, y_pos, 280, 40), 2)
                 
                 # Información del pedido CON TIEMPO RESTANTE
                 order_text = f"{priority_icon}{order.id} | {time_text}"
                 order_surface = self.font_small.render(order_text, True, (0, 0, 0))
-                self.screen.blit(order_surface, (x_offset + 15, y_pos + 5))
+                surface.blit(order_surface, (15, y_pos + 5))
                 
                 # Información adicional
                 info_text = f"P:{order.priority} | ${order.payout} | {order.weight}kg"
                 info_surface = self.font_small.render(info_text, True, (80, 80, 80))
-                self.screen.blit(info_surface, (x_offset + 15, y_pos + 20))
+                surface.blit(info_surface, (15, y_pos + 20))
         else:
             no_items = self.font_small.render("No hay pedidos en inventario", True, (150, 150, 150))
-            self.screen.blit(no_items, (x_offset + 15, 235))
+            surface.blit(no_items, (15, 25))
 
-    def draw_weather_info(self, cols, weather_system, player):
-        """Dibuja información del clima"""
-        x_offset = cols * self.game_map.tile_size
-        
+    def draw_weather_info(self, surface, weather_system):
+        """Dibuja información del clima (coordenadas relativas a la sección)"""
         weather_title = self.font_medium.render("Condición Climática:", True, (0, 0, 0))
-        weather_y_pos = 300 if not player.inventory else 235 + len(player.inventory) * 40 + 10
-        self.screen.blit(weather_title, (x_offset + 10, weather_y_pos))
+        surface.blit(weather_title, (10, 0))
         
         # Dibujar indicador del clima
-        weather_system.draw(self.screen, x_offset + 40, weather_y_pos + 35)
+        weather_system.draw(surface, 40, 35)
         
         # Información textual del clima
         condition_name = weather_system.current_condition.value.replace("_", " ").title()
         weather_text = self.font_small.render(condition_name, True, (0, 0, 0))
-        self.screen.blit(weather_text, (x_offset + 60, weather_y_pos + 25))
+        surface.blit(weather_text, (60, 25))
         
         intensity_text = self.font_small.render(f"Intensidad: {weather_system.current_intensity:.2f}", 
                                               True, (0, 0, 0))
-        self.screen.blit(intensity_text, (x_offset + 60, weather_y_pos + 40))
+        surface.blit(intensity_text, (60, 40))
         
         speed_text = self.font_small.render(f"Velocidad: x{weather_system.current_multiplier:.2f}", 
                                           True, (0, 0, 0))
-        self.screen.blit(speed_text, (x_offset + 60, weather_y_pos + 55))
+        surface.blit(speed_text, (60, 55))
     
-    def draw_available_jobs(self, cols, active_orders, weather_system, player, pending_count=0):
-        """Dibuja la lista de trabajos disponibles (SOLO los activos)"""
-        x_offset = cols * self.game_map.tile_size
-        
-        weather_y_pos = 300 if not player.inventory else 235 + len(player.inventory) * 40 + 10
+    def draw_available_jobs(self, surface, active_orders, pending_count=0):
+        """Dibuja la lista de trabajos disponibles (SOLO los activos, coordenadas relativas a la sección)"""
         jobs_title = self.font_medium.render("Trabajos Disponibles:", True, (0, 0, 0))
-        jobs_y_pos = weather_y_pos + 85
-        self.screen.blit(jobs_title, (x_offset + 10, jobs_y_pos))
+        surface.blit(jobs_title, (10, 0))
         
         # Mostrar solo pedidos activos (no pendientes)
         for i, order in enumerate(active_orders):
-            y_pos = jobs_y_pos + 25 + i * 70
+            y_pos = 25 + i * 70
             
-            pygame.draw.rect(self.screen, self.job_colors[i % len(self.job_colors)], 
-                        (x_offset + 10, y_pos, 20, 20))
+            pygame.draw.rect(surface, self.job_colors[i % len(self.job_colors)], 
+                        (10, y_pos, 20, 20))
             
             order_id = self.font_small.render(f"ID: {order.id}", True, (0, 0, 0))
-            self.screen.blit(order_id, (x_offset + 35, y_pos))
+            surface.blit(order_id, (35, y_pos))
             
             payout = self.font_small.render(f"Pago: ${order.payout}", True, (0, 0, 0))
-            self.screen.blit(payout, (x_offset + 35, y_pos + 15))
+            surface.blit(payout, (35, y_pos + 15))
             
             deadline = self.font_small.render(f"Entrega: {order.deadline.strftime('%H:%M')}", 
                                             True, (0, 0, 0))
-            self.screen.blit(deadline, (x_offset + 10, y_pos + 35))
+            surface.blit(deadline, (10, y_pos + 35))
             
             weight = self.font_small.render(f"Peso: {order.weight}", True, (0, 0, 0))
-            self.screen.blit(weight, (x_offset + 120, y_pos + 35))
+            surface.blit(weight, (120, y_pos + 35))
             
             priority = self.font_small.render(f"Prioridad: {order.priority}", True, (0, 0, 0))
-            self.screen.blit(priority, (x_offset + 10, y_pos + 50))
+            surface.blit(priority, (10, y_pos + 50))
         
         # Mostrar contador de pedidos pendientes
         if pending_count > 0:
             pending_text = self.font_small.render(f" {pending_count} pedidos pendientes...", 
                                             True, (100, 100, 100))
-            self.screen.blit(pending_text, (x_offset + 10, jobs_y_pos + 25 + len(active_orders) * 70))
+            surface.blit(pending_text, (10, 25 + len(active_orders) * 70))
 
 
     def draw_legend(self, cols):
         """Dibuja la leyenda del mapa"""
-        x_offset = cols * self.game_map.tile_size
+        x_offset = self.sidebar_x
         
         legend_title = self.font_medium.render("Leyenda del Mapa:", True, (0, 0, 0))
         legend_y_pos = self.screen_height - 150
@@ -424,7 +522,8 @@ class UIManager:
         """Dibuja mensajes temporales"""
         if self.message:
             msg_surface = self.font_medium.render(self.message, True, (0, 0, 0))
-            self.screen.blit(msg_surface, (10, 10))
+            return self.screen.blit(msg_surface, (10, 10))
+        return None
     
     def get_interaction_hint(self, game_map):
         """Obtiene pista de interacción"""
@@ -433,15 +532,14 @@ class UIManager:
         return ""
 
     # ui_manager.py - CORREGIR método draw_interaction_hints
-    def draw_interaction_hints(self, player, active_orders, camera_x, camera_y, game_map=None):
+    def draw_interaction_hints(self, camera_x, camera_y, game_map=None):
         """Dibuja pistas de interacción cerca del jugador"""
-        if hasattr(self, 'interaction_manager') and hasattr(self.interaction_manager, 'game_time'):
-            game_time = self.interaction_manager.game_time
-        else:
+        if not (hasattr(self, 'interaction_manager') and hasattr(self.interaction_manager, 'game_time')):
             # Fallback si no hay game_time disponible
-            return
-        
-        interactable_orders = player.get_interactable_orders(active_orders, game_map, radius=20, game_time=game_time)
+            return None
+
+        # Resultado memoizado por el InteractionManager (casilla + generaciones de pedidos)
+        interactable_orders = self.interaction_manager.get_interactable_orders(game_map, radius=20)
         
         if interactable_orders:
             # Mostrar pista para la primera orden interactuable
@@ -489,6 +587,8 @@ class UIManager:
                 (loc_x * self.game_map.tile_size + self.game_map.tile_size // 2 - camera_x - text_width // 2,
                 loc_y * self.game_map.tile_size + self.game_map.tile_size // 2 - camera_y - 30 + padding)
             )
+            return hint_bg
+        return None
     
     def draw_game_over_screen(self, game_state):
         """Dibuja la pantalla de fin de juego"""
@@ -542,16 +642,16 @@ class UIManager:
         scale_y = size / game_map.height
         
         # Dibujar elementos del mapa simplificados
-        for row_idx, row in enumerate(game_map.tiles):
-            for col_idx, tile in enumerate(row):
-                tile_x = x + col_idx * scale_x
-                tile_y = y + row_idx * scale_y
-                
-                if tile == "B":  # Edificios
-                    pygame.draw.rect(self.screen, (100, 100, 100), 
-                                   (tile_x, tile_y, max(1, scale_x), max(1, scale_y)))
-                elif tile == "P":  # Parques
-                    pygame.draw.rect(self.screen, (0, 100, 0), 
+        # Edificios y parques; el resto queda con el fondo
+        minimap_colors = {"B": (100, 100, 100), "P": (0, 100, 0)}
+        colors = [minimap_colors.get(char) for char in game_map.surface_chars]
+        for row_idx in range(game_map.rows):
+            for col_idx in range(game_map.cols):
+                color = colors[game_map.surface_id(col_idx, row_idx)]
+                if color is not None:
+                    tile_x = x + col_idx * scale_x
+                    tile_y = y + row_idx * scale_y
+                    pygame.draw.rect(self.screen, color,
                                    (tile_x, tile_y, max(1, scale_x), max(1, scale_y)))
         
         # Dibujar pedidos activos
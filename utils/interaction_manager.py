@@ -16,6 +16,9 @@ class InteractionManager:
         self.interaction_message = ""
         self.message_timer = 0
         self.interaction_radius = 4
+        
+        # Caché de interacciones por radio: (clave, válido_hasta, resultado)
+        self._interaction_cache = {}
 
     def handle_event(self, event, game_state, game_map=None):
         """Maneja eventos de interacción"""
@@ -25,9 +28,7 @@ class InteractionManager:
     def handle_interaction(self, game_state, game_map):
         """Procesa interacciones con gestión completa de deadlines"""
         
-        interactable_orders = self.player.get_interactable_orders(
-            self.active_orders, game_map, self.interaction_radius, self.game_time
-        )
+        interactable_orders = self.get_interactable_orders(game_map)
         
         if not interactable_orders:
             self.show_message("No hay nada que hacer aquí", 2)
@@ -45,6 +46,27 @@ class InteractionManager:
             self.handle_pickup_interaction(order, interaction, game_state, current_time)
 
 
+    def get_interactable_orders(self, game_map, radius=None):
+        """Interacciones disponibles, reutilizadas mientras no cambien la casilla del
+        jugador, su inventario ni los pedidos activos (generaciones de OrderList).
+        También se recalculan al llegar el deadline más cercano de los resultados."""
+        if radius is None:
+            radius = self.interaction_radius
+        
+        key = (self.player.get_interaction_key(), self.active_orders.generation, id(game_map))
+        current_seconds = self.game_time.get_current_game_seconds()
+        cached = self._interaction_cache.get(radius)
+        if cached is not None and cached[0] == key and current_seconds < cached[1]:
+            return cached[2]
+        
+        interactable_orders = self.player.get_interactable_orders(
+            self.active_orders, game_map, radius, self.game_time
+        )
+        valid_until = min((interaction['order'].deadline_s for interaction in interactable_orders),
+                          default=float('inf'))
+        self._interaction_cache[radius] = (key, valid_until, interactable_orders)
+        return interactable_orders
+
     def handle_dropoff_interaction(self, order, interaction, game_state, current_time):
         """Maneja la entrega de un pedido"""
         if self.player.remove_from_inventory(order.id):
@@ -176,9 +198,7 @@ class InteractionManager:
     
     def get_interaction_hint(self, game_map):
         """Obtiene pista de qué se puede hacer en la posición actual"""
-        interactable_orders = self.player.get_interactable_orders(
-            self.active_orders, game_map, self.interaction_radius, self.game_time
-        )
+        interactable_orders = self.get_interactable_orders(game_map)
         
         if not interactable_orders:
             return ""
@@ -181,21 +181,8 @@ class ScoreManager:
             return False
     
     def sort_scores(self) -> None:
-        """Ordena los puntajes de mayor a menor usando Bubble Sort - Complejidad: O(n²)"""
-        n = len(self.scores)
-        
-        if n <= 1:
-            return
-        
-        for i in range(n - 1):
-            swapped = False
-            for j in range(0, n - i - 1):
-                if self.scores[j].get("score", 0) < self.scores[j + 1].get("score", 0):
-                    self.scores[j], self.scores[j + 1] = self.scores[j + 1], self.scores[j]
-                    swapped = True
-            
-            if not swapped:
-                break
+        """Ordena los puntajes de mayor a menor (Timsort, estable) - Complejidad: O(n log n)"""
+        self.scores.sort(key=lambda entry: entry.get("score", 0), reverse=True)
         
         
     